@@ -1,7 +1,10 @@
 import streamlit as st
-import pandas as pd
-import os
 import utils
+import cache_namespaces
+import asset_bundle
+import board_raster
+import board_render
+import export_cache
 import base64
 
 # Configuração da Página
@@ -137,375 +140,13 @@ if not check_pin():
     st.stop()
 
 # --- Helper Assets (Cached) ---
-@st.cache_data(show_spinner=False)
-def get_base64_encoded(file_path):
-    if not os.path.exists(file_path):
-        return ""
-    with open(file_path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
+# Assets codificados uma vez por processo e compartilhados por referência
+# (pré-aquece o bundle da escala padrão de exportação)
+asset_bundle.get_asset_bundle(asset_bundle.DEFAULT_EXPORT_SCALE)
 
-@st.cache_data(show_spinner=False)
-def get_team_logo_b64(team_name):
-    path = utils.get_team_logo_path(team_name)
-    if path and os.path.exists(path):
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    return ""
-
-@st.cache_data(show_spinner=False)
-def render_custom_css():
-    # Caminhos
-    font_bold_path = os.path.join("assets", "fonts", "Decalotype-ExtraBold.otf")
-    font_real_bold_path = os.path.join("assets", "fonts", "Decalotype-Bold.otf")
-    font_med_path = os.path.join("assets", "fonts", "Decalotype-Medium.otf")
-    bg_path = os.path.join("assets", "logos", "background.jpg")
-    
-    font_bold_b64 = get_base64_encoded(font_bold_path)
-    font_real_bold_b64 = get_base64_encoded(font_real_bold_path)
-    font_med_b64 = get_base64_encoded(font_med_path)
-    bg_b64 = get_base64_encoded(bg_path)
-    
-    css = f"""
-    /* Fonts Global import */
-    @font-face {{
-        font-family: 'Decalotype';
-        src: url(data:font/otf;base64,{font_bold_b64}) format('opentype');
-        font-weight: 800;
-        font-style: normal;
-        font-display: block;
-    }}
-    @font-face {{
-        font-family: 'Decalotype';
-        src: url(data:font/otf;base64,{font_real_bold_b64}) format('opentype');
-        font-weight: 700;
-        font-style: normal;
-        font-display: block;
-    }}
-    @font-face {{
-        font-family: 'Decalotype';
-        src: url(data:font/otf;base64,{font_med_b64}) format('opentype');
-        font-weight: 500;
-        font-style: normal;
-        font-display: block;
-    }}
-    
-    /* REPORT CONTAINER */
-    .report-container {{
-        font-family: 'Decalotype', sans-serif;
-        width: 1200px; /* FIXED WIDTH for consistent export */
-        margin: 0 auto;
-        background-color: #ffffff;
-        background-image: url(data:image/jpeg;base64,{bg_b64});
-        background-size: cover;
-        background-size: cover;
-        background-position: center;
-        background-repeat: no-repeat;
-        padding: 40px; 
-        padding-bottom: 0; /* Footer vai até a borda */
-        box-sizing: border-box;
-        min-height: 1200px;
-        color: white;
-        -webkit-font-smoothing: antialiased;
-        display: flex;
-        flex-direction: column;
-    }}
-    
-    /* HEADER V2 */
-    .tcc-header {{
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin-bottom: 30px;
-        padding: 0 10px;
-    }}
-    
-    .header-logo {{
-        height: 100px; /* Slightly smaller to fit better */
-        width: auto;
-        object-fit: contain;
-    }}
-    
-    .header-title-box {{
-        background-color: #0d3b2a;
-        color: white;
-        padding: 10px 30px; /* Reduced padding */
-        border-radius: 12px;
-        font-size: 38px; /* Reduced font size to fit one line */
-        font-weight: 800;
-        text-transform: uppercase;
-        border: 2px solid white;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-        flex-grow: 1; /* Allow to grow */
-        margin: 0 15px;
-        text-align: center;
-        box-shadow: 0 4px 10px rgba(0,0,0,0.4);
-        white-space: nowrap; /* Force single line */
-        overflow: hidden;
-        text-overflow: ellipsis;
-    }}
-
-    /* GRID LAYOUT */
-    .grid-container {{
-        display: flex;
-        gap: 30px;
-        align-items: flex-start;
-    }}
-    
-    .col-left, .col-right {{
-        flex: 1;
-        display: flex;
-        flex-direction: column;
-        gap: 20px;
-    }}
-    
-    /* POSITION TITLE V2 */
-    .position-group {{
-        width: 100%;
-        margin-bottom: 0;
-        text-align: center; /* Centers the inline-block title */
-    }}
-
-    .pos-title-bar {{
-        background-color: #ffffff;
-        color: #0d3b2a;
-        padding: 6px 30px; /* Wider padding */
-        border-radius: 8px;
-        font-size: 32px;
-        font-weight: 800;
-        text-transform: uppercase;
-        border: 2px solid #0d3b2a;
-        display: inline-block;
-        margin-bottom: 12px;
-        box-shadow: 0 4px 10px rgba(0,0,0,0.15);
-    }}
-    
-    /* PLAYER CARD COMPACT */
-    .player-card {{
-        background-color: #0d3b2a;
-        border: 2px solid #1E7C5C;
-        border-radius: 16px;
-        padding: 12px 18px;
-        margin-bottom: 12px;
-        box-shadow: 0 3px 6px rgba(0,0,0,0.3);
-        color: white;
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        text-align: left; /* Reset text align from parent */
-    }}
-    
-    .card-left {{
-        display: flex;
-        align-items: center;
-        gap: 12px;
-    }}
-    
-    .team-circle {{
-        width: 68px; /* Slightly larger default */
-        height: 68px;
-        background: white;
-        border-radius: 50%;
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        border: 3px solid white;
-        box-shadow: 0 6px 12px rgba(0,0,0,0.6);
-        flex-shrink: 0;
-    }}
-    
-    .team-circle.sm {{
-        width: 60px; /* Smaller for specific teams */
-        height: 60px;
-    }}
-    
-    .team-logo {{
-        width: 96%; /* Increase size to reduce white padding */
-        height: 96%;
-        object-fit: contain;
-        filter: drop-shadow(0px 2px 2px rgba(0,0,0,0.2));
-    }}
-
-    .p-name {{
-        font-size: 24px;
-        font-weight: 800;
-        text-transform: uppercase;
-        /* allow wrapping */
-        display: block; 
-        line-height: 1.1;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.5);
-    }}
-    
-    .name-text {{
-        margin-right: 6px;
-        vertical-align: middle;
-    }}
-    
-    /* ICONS */
-    .icon-badge {{
-        display: inline-flex;
-        align-items: center;
-        justify-content: center;
-        border-radius: 50%;
-        color: white;
-        font-weight: bold;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.4);
-        margin: 2px 3px; 
-        vertical-align: middle;
-        position: relative;
-        top: -1px; /* Visual tweak for alignment */
-    }}
-    
-    .icon-star {{
-        color: #f1c40f; 
-        font-size: 26px; /* Slightly larger */
-        background-color: transparent !important; /* Force Clear */
-        box-shadow: none !important; /* Force Clear */
-        filter: drop-shadow(0px 1px 1px rgba(0,0,0,0.5));
-    }}
-    
-    .icon-c {{
-        width: 24px; 
-        height: 24px;
-        background-color: #2ecc71; 
-        font-size: 16px;
-        border: 2px solid white;
-    }}
-    
-    .icon-rl {{
-        width: 24px; 
-        height: 24px;
-        background-color: #e67e22; 
-        font-size: 12px;
-        border: 2px solid white;
-    }}
-    
-    /* STATS & COLORS */
-    .stats-row {{
-        display: flex;
-        gap: 12px; /* Close gap between stats */
-        align-items: flex-start; /* Align top */
-    }}
-    
-    .stat-box {{
-        text-align: center;
-        min-width: 55px;
-        display: flex;
-        flex-direction: column;
-        justify-content: flex-start; /* Top align */
-        height: 100%;
-    }}
-    
-    .stat-label {{
-        font-size: 14px; /* Default larger */
-        color: #ffffff;
-        font-weight: 800;
-        margin-bottom: 8px;
-        letter-spacing: 0.5px;
-        text-shadow: 0 1px 2px rgba(0,0,0,0.5);
-        align-self: center;
-        text-transform: uppercase;
-    }}
-    
-    .lbl-price {{ font-size: 15px; }} /* Slightly larger for C$ */
-    
-    .stat-value {{
-        font-size: 22px;
-        font-weight: 800;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.5);
-        line-height: 1;
-        margin-top: auto; 
-        padding-top: 8px; /* Pushes value down to align with Conf Circle */
-    }}
-    
-    .conf-circle {{
-        width: 32px;
-        height: 32px;
-        border-radius: 50%;
-        color: #0d3b2a;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-weight: 900;
-        font-size: 18px;
-        margin: 0 auto;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.3);
-        border: 2px solid rgba(255,255,255,0.2);
-    }}
-    
-    /* CONFIDENCE COLORS */
-    .bg-conf-a {{ background-color: #2ecc71; }} /* Strong Green */
-    .bg-conf-b {{ background-color: #cddc39; }} /* Lime/Green Yellow */
-    .bg-conf-c {{ background-color: #f1c40f; }} /* Yellow */
-    .bg-conf-d {{ background-color: #e74c3c; }} /* Red */
-    
-    .val-green {{ color: #2ecc71; }}
-    .val-red {{ color: #ff5252; }}
-    .val-white {{ color: #ffffff; }}
-
-    /* FOOTER V3 - Duas linhas */
-    .tcc-footer {{
-        background-color: #0d3b2a;
-        margin-top: auto; /* EMPURRA pro fundo da arte */
-        margin-left: -40px; /* Compensa o padding do container */
-        margin-right: -40px;
-        padding: 0;
-        display: flex;
-        align-items: center;
-        border-top: 3px solid #a3e635;
-        font-size: 16px;
-        font-weight: 700;
-        color: white;
-        border-radius: 0;
-        box-shadow: 0 -2px 10px rgba(0,0,0,0.2);
-        min-height: 90px;
-    }}
-    
-    .footer-left {{
-        flex: 0 0 auto;
-        display: flex;
-        align-items: center;
-        padding: 10px 20px;
-    }}
-    
-    .footer-center {{
-        flex: 1;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        padding: 10px 0;
-        gap: 6px;
-    }}
-    
-    .footer-right {{
-        flex: 0 0 auto;
-        display: flex;
-        align-items: center;
-        padding: 10px 20px;
-    }}
-    
-    .footer-logo-img {{
-        height: 60px;
-        width: auto;
-    }}
-    
-    .footer-exclusive-text {{
-        font-size: 14px;
-        font-weight: 700;
-        letter-spacing: 1px;
-        color: #ffffff;
-        text-transform: uppercase;
-    }}
-    
-    .legend-box {{
-        display: flex;
-        gap: 25px;
-        font-size: 14px;
-        align-items: center;
-        font-weight: 600;
-    }}
-    """
-    return css
+@cache_namespaces.cached(cache_namespaces.NS_ASSETS, resource=True, show_spinner=False)
+def render_custom_css(escala=None):
+    return board_render.render_css(asset_bundle.get_asset_bundle(escala))
 
 # --- Session State Management ---
 if 'players' not in st.session_state:
@@ -570,55 +211,44 @@ use_api = st.sidebar.toggle("Usar Dados da API", value=True)
 gm_token = st.sidebar.text_input("Token Gato Mestre (Opcional)", help="Para obter o 'Mínimo para Valorizar'")
 
 if st.sidebar.button("🔄 Atualizar Mercado"):
-    # Clear cache to force new data fetch/mapping
-    st.cache_data.clear()
-    
+    # Nada a invalidar: refresh_mercado revalida o mercado na API a cada clique
+    # (GET condicional) e não passa pelo st.cache
     with st.spinner("Buscando dados do Cartola..."):
-        api_data = utils.fetch_mercado_data()
+        # Mercado e Gato Mestre buscados em paralelo
+        refresh = utils.refresh_mercado(gm_token)
+        api_data = refresh['atletas']
+        if refresh['mercado_origem'] == 'offline':
+            st.warning("API do Cartola indisponível: usando o último mercado salvo.")
         
         # Validate GM Token
-        is_valid, msg = utils.validate_gato_mestre_token(gm_token)
+        is_valid, msg = refresh['gm_valido'], refresh['gm_msg']
         if gm_token:
             if is_valid:
                 st.toast(f"Gato Mestre: {msg}", icon="🐱")
             else:
                 st.error(f"Erro Gato Mestre: {msg}")
         
-        gm_data = utils.fetch_gato_mestre_data(gm_token) if is_valid else {}
+        gm_data = refresh['mpv_map']
+        if is_valid:
+            if gm_data:
+                st.toast(f"GM: {len(gm_data)} mínimos carregados ({refresh['gm_formato']})!", icon="💰")
+            else:
+                st.toast("GM: Dados não encontrados ou estrutura desconhecida.", icon="⚠️")
         
         if api_data:
-            # Merge GM Data
-            processed_data = []
-            for atleta in api_data:
-                aid = atleta.get('atleta_id')
-                mpv = 0.0
-                if aid and aid in gm_data:
-                    mpv = gm_data[aid]
-                
-                # Get Team Name
-                club_id = str(atleta.get('clube_id'))
-                team_name = utils.CLUB_MAP.get(club_id, 'Outros')
-                
-                # Get Position Name
-                pos_id = atleta.get('posicao_id')
-                pos_name = utils.map_pos_id_to_name(pos_id)
-                
-                # Create standardized dict
-                processed_data.append({
-                    'id': aid,
-                    'Jogador_Original': atleta.get('apelido', atleta.get('nome', 'N/A')),
-                    'Jogador_Norm': utils.normalize_name(atleta.get('apelido', atleta.get('nome', 'N/A'))),
-                    'Time': team_name,
-                    'Posicao': pos_name, # Normalized name
-                    'Preco': float(atleta.get('preco_num', 0)),
-                    'MinValorizar': float(mpv)
-                })
-            
-            st.session_state['data_api'] = pd.DataFrame(processed_data)
-            st.toast(f"Mercado Atualizado: {len(processed_data)} jogadores!", icon="✅")
+            # Monta o DataFrame do mercado numa passada só, com o MPV do GM por id
+            st.session_state['data_api'] = utils.build_mercado_df(api_data, gm_data)
+            st.toast(f"Mercado Atualizado: {len(st.session_state['data_api'])} jogadores!", icon="✅")
         else:
             st.error("Falha ao buscar dados do Mercado.")
 
+with st.sidebar.expander("📊 Cache"):
+    for ns, stats in cache_namespaces.cache_stats().items():
+        extras = "".join(f", {n} {k}" for k, n in stats.items() if k not in ('hits', 'misses', 'hit_rate'))
+        st.caption(f"{ns}: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%}){extras}")
+    arquivos, tamanho = export_cache.disk_usage()
+    st.caption(f"exportações em disco: {arquivos} arquivos, {tamanho / 1024 / 1024:.1f} MB")
+
 st.sidebar.divider()
 st.sidebar.header("2. Upload Manual (Opcional)")
 uploaded_api = st.sidebar.file_uploader("Planilha API (Excel)", type=["xlsx"])
@@ -772,298 +402,30 @@ with tab_preview:
     
     st.info("⚠️ Otimização: A pré-visualização só é gerada ao clicar no botão abaixo para evitar lentidão durante a edição.")
     
+    escala_max = st.selectbox(
+        "Qualidade máxima de exportação",
+        [e for e, _ in board_render.EXPORT_OPTIONS],
+        format_func=lambda e: f"{e:.1f}x",
+        help="As imagens embutidas são redimensionadas para esta escala: escalas menores geram um HTML bem mais leve."
+    )
+    
     if st.button("🎨 Gerar/Atualizar Visualização", type="primary"):
-        # Render HTML
-        bg_css = render_custom_css()
-        
-        # logo tcc header
-        logo_tcc = os.path.join("assets", "logos", "logo_tcc.png") # Main logo
-        logo_tcc_b64 = ""
-        if os.path.exists(logo_tcc):
-            with open(logo_tcc, "rb") as f: logo_tcc_b64 = base64.b64encode(f.read()).decode()
-
-        # logo tcc footer (White)
-        logo_tcc_white = os.path.join("assets", "logos", "logo_tcc_branco.png") 
-        logo_tcc_white_b64 = ""
-        # Fallback to main logo if white doesn't exist, but try white first
-        if os.path.exists(logo_tcc_white):
-            with open(logo_tcc_white, "rb") as f: logo_tcc_white_b64 = base64.b64encode(f.read()).decode()
-        else:
-            logo_tcc_white_b64 = logo_tcc_b64
+        # A lista do editor passa a exibir a mesma ordem do board
+        for lista in st.session_state['players'].values():
+            lista.sort(key=board_render.player_sort_key)
         
-        # Build HTML Content - Split Columns
-        groups_left = ['Técnicos', 'Laterais', 'Meias']
-        groups_right = ['Goleiros', 'Zagueiros', 'Atacantes']
-        
-        def generate_pos_block(pos_key):
-            players = st.session_state['players'].get(pos_key, [])
-            if not players: return ""
-            
-            # SORTING LOGIC:
-            # 1. Unanimidade (True < False -> Reverse? No, use not)
-            # 2. Capitão
-            # 3. Confiança (A < B < C...)
-            # 4. Nome
-            
-            # We want Unanimidade (True) first. Integer(True)=1, Integer(False)=0.
-            # So if we sort ascending, 0 comes first (False).
-            # We want 1 first. So use 'not' val (False < True).
-            
-            players.sort(key=lambda x: (
-                not x['badges']['unanimidade'],
-                not x['badges']['bom_capitao'],
-                x['conf'],
-                x['name']
-            ))
-
-            block_html = f"""
-            <div class="position-group">
-                <div class="pos-title-bar">{pos_key}</div>
-            """
-            
-            for p in players:
-                t_logo = get_team_logo_b64(p['team'])
-                t_img = f'<img src="data:image/png;base64,{t_logo}" class="team-logo"/>' if t_logo else ''
-                
-                # Logic for Team Circle Size
-                # Standard is large (68px). Exceptions are normal (60px).
-                # Exceptions: São Paulo, Athletico-PR (check actual string), Flamengo
-                # Using 'raw' name from input or mapped? p['team'] matches CLUB_MAP values.
-                # Common names: "São Paulo", "Athletico-PR", "Flamengo"
-                
-                team_circle_class = "team-circle"
-                if p['team'] in ['São Paulo', 'Athletico-PR', 'Flamengo']:
-                    team_circle_class += " sm"
-
-                # ICONS Logic
-                icons_html = ""
-                if p['badges']['unanimidade']: icons_html += '<span class="icon-badge icon-star">★</span>'
-                if p['badges']['reserva_luxo']: icons_html += '<span class="icon-badge icon-rl">RL</span>'
-                if p['badges']['bom_capitao']: icons_html += '<span class="icon-badge icon-c">C</span>'
-                
-                # Confidence Color
-                conf_class = "bg-conf-a"
-                if p['conf'] == 'B': conf_class = "bg-conf-b"
-                if p['conf'] == 'C': conf_class = "bg-conf-c"
-                if p['conf'] == 'D': conf_class = "bg-conf-d"
-                
-                # Valorizar Color Logic (Fixed)
-                mpv = float(p.get('mpv', 0.0))
-                val_class = "val-white"
-                
-                if pos_key == 'Técnicos':
-                    if mpv <= 2.00: val_class = "val-green"
-                    elif mpv > 6.00: val_class = "val-red"
-                else: 
-                    if mpv <= 3.00: val_class = "val-green"
-                    elif mpv > 6.00: val_class = "val-red"
-
-                block_html += f"""
-                <div class="player-card">
-                    <div class="card-left">
-                        <div class="{team_circle_class}">
-                            {t_img}
-                        </div>
-                        <div class="p-name"><span class="name-text">{p['name']}</span>{icons_html}</div>
-                    </div>
-                        
-                    <div class="stats-row">
-                        <div class="stat-box">
-                            <div class="stat-label lbl-price">C$</div>
-                            <div class="stat-value">{p['price']:.1f}</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-label">MPV</div>
-                            <div class="stat-value {val_class}">{mpv:.1f}</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-label">CONF</div>
-                            <div class="conf-circle {conf_class}" style="box-shadow: 0 4px 8px rgba(0,0,0,0.5);">{p['conf']}</div>
-                        </div>
-                    </div>
-                </div>
-                """
-            block_html += "</div>"
-            return block_html
-
-        html_left = ""
-        for pos in groups_left: html_left += generate_pos_block(pos)
-            
-        html_right = ""
-        for pos in groups_right: html_right += generate_pos_block(pos)
-
-        full_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                {render_custom_css()}
-                /* FORÇAR body a ter largura mínima para evitar corte */
-                html, body {{
-                    margin: 0;
-                    padding: 0;
-                    min-width: 1200px;
-                    width: 1200px;
-                    overflow-x: hidden;
-                }}
-            </style>
-        </head>
-        <body>
-    <div id="ui-controls" style="position:fixed; top:10px; right:10px; z-index:9999; display:flex; flex-direction:column; gap:8px; align-items:flex-end;">
-        <div style="background:rgba(13, 59, 42, 0.9); padding:8px 12px; border-radius:8px; border:1px solid #a3e635; display:flex; flex-direction:column; gap:4px; box-shadow:0 4px 6px rgba(0,0,0,0.3);">
-            <div style="display:flex; align-items:center; gap:10px;">
-                <span style="color:white; font-weight:bold; font-family:sans-serif; font-size:14px;">Qualidade:</span>
-                <select id="resSelect" style="padding:5px; border-radius:4px; border:none; font-weight:bold; cursor:pointer;">
-                    <option value="3.0" selected>3.0x (3600px - Padrão)</option>
-                    <option value="4.0">4.0x (4800px - Print A3)</option>
-                    <option value="6.0">6.0x (~7200px - 600 DPI)</option>
-                </select>
-            </div>
-            <div style="color:#a3e635; font-family:sans-serif; font-size:11px; max-width:200px; line-height:1.2;">
-                * 6.0x é a qualidade "600 DPI" antiga. Só use se seu PC aguentar!
-            </div>
-        </div>
-        <button onclick="window.downloadHighRes()" style="padding:12px 24px; background-color:#0d3b2a; color:white; border:2px solid #a3e635; border-radius:8px; cursor:pointer; font-weight:bold; font-size:16px; box-shadow:0 4px 10px rgba(0,0,0,0.3); transition:all 0.2s; display:flex; align-items:center; gap:8px;">
-            ⬇️ BAIXAR PNG
-        </button>
-    </div>
-            <div class="report-container" id="capture">
-                <!-- HEADER V2 -->
-                <div class="tcc-header">
-                    <img src="data:image/png;base64,{logo_tcc_b64}" class="header-logo">
-                    <div class="header-title-box">DICAS POR POSIÇÃO &ndash; TCC &ndash; RODADA {rodada_atual}</div>
-                    <img src="data:image/png;base64,{logo_tcc_b64}" class="header-logo">
-                </div>
-                
-                <!-- BODY -->
-                <div class="grid-container">
-                    <div class="col-left">{html_left}</div>
-                    <div class="col-right">{html_right}</div>
-                </div>
-                
-                <!-- FOOTER V3 -->
-                <div class="tcc-footer">
-                    <div class="footer-left">
-                         <img src="data:image/png;base64,{logo_tcc_white_b64}" class="footer-logo-img">
-                    </div>
-                    <div class="footer-center">
-                        <div class="legend-box">
-                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge icon-rl">RL</span> Luxo</span>
-                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge icon-star" style="background:transparent; color:#f1c40f; box-shadow:none;">★</span> Unanimidade</span>
-                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge icon-c">C</span> Bom Capitão</span>
-                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge bg-conf-a" style="width:15px;height:15px;"></span> Nível de Confiança</span>
-                        </div>
-                        <div class="footer-exclusive-text">MATERIAL EXCLUSIVO &ndash; TREINANDO CAMPEÕES DE CARTOLA</div>
-                    </div>
-                    <div class="footer-right">
-                        <img src="data:image/png;base64,{logo_tcc_white_b64}" class="footer-logo-img">
-                    </div>
-                </div>
-            </div>
-
-            <!-- SCRIPTS LOADED AT END OF BODY -->
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/html-to-image/1.11.11/html-to-image.min.js"></script>
-            <script>
-                window.downloadHighRes = function() {{
-                    var node = document.getElementById('capture');
-                    var uiControls = document.getElementById('ui-controls');
-                    var btn = document.querySelector('button[onclick="window.downloadHighRes()"');
-                    
-                    // 1. ESCONDER CONTROLES durante captura
-                    uiControls.style.display = 'none';
-                    
-                    // 2. Feedback visual
-                    document.body.style.cursor = 'wait';
-                    
-                    // 3. GET USER SELECTION
-                    var sel = document.getElementById('resSelect');
-                    var targetScale = parseFloat(sel.value);
-                    
-                    // 4. FORÇAR largura exata do container
-                    var CONTAINER_WIDTH = 1200;
-                    
-                    // 5. Medir altura REAL do conteúdo (sem min-height)
-                    var originalMinHeight = node.style.minHeight;
-                    node.style.minHeight = '0';
-                    
-                    // Forçar reflow
-                    void node.offsetHeight;
-                    
-                    var realHeight = node.scrollHeight;
-                    
-                    // Restaurar min-height
-                    node.style.minHeight = originalMinHeight;
-                    
-                    console.log('Capture: ' + CONTAINER_WIDTH + 'x' + realHeight + ' at ' + targetScale + 'x');
-                    
-                    // 6. Cap scale para limites do browser
-                    var MAX_PIXELS = 30000;
-                    if (realHeight * targetScale > MAX_PIXELS) {{
-                        var safeScale = MAX_PIXELS / realHeight;
-                        if (safeScale < targetScale) {{
-                            targetScale = safeScale;
-                            alert('⚠️ Escala ajustada para ' + targetScale.toFixed(2) + 'x (limite do navegador).');
-                        }}
-                    }}
-                    
-                    // 7. CAPTURAR com html-to-image
-                    htmlToImage.toBlob(node, {{
-                        backgroundColor: null,
-                        width: CONTAINER_WIDTH,
-                        height: realHeight,
-                        pixelRatio: targetScale,
-                        style: {{
-                            transform: 'none',
-                            visibility: 'visible',
-                            maxHeight: 'none',
-                            maxWidth: 'none',
-                            overflow: 'visible',
-                            width: CONTAINER_WIDTH + 'px',
-                            height: 'auto',
-                            minHeight: '0',
-                            margin: '0',
-                            padding: '40px',
-                            paddingBottom: '0'
-                        }}
-                    }})
-                    .then(function(blob) {{
-                        // RESTAURAR controles
-                        uiControls.style.display = 'flex';
-                        document.body.style.cursor = 'default';
-                        
-                        if (!blob) {{
-                            throw new Error('Blob vazio gerado.');
-                        }}
-                        
-                        var url = URL.createObjectURL(blob);
-                        var link = document.createElement('a');
-                        link.download = 'Dicas_Rodada_TCC_' + targetScale.toFixed(1) + 'x.png';
-                        link.href = url;
-                        link.click();
-                        
-                        setTimeout(function() {{ URL.revokeObjectURL(url); }}, 100);
-                        
-                        // Feedback de sucesso
-                        if (btn) {{
-                            var originalText = btn.innerHTML;
-                            btn.innerHTML = '✅ SUCESSO!';
-                            setTimeout(function() {{ btn.innerHTML = originalText; }}, 2000);
-                        }}
-                    }})
-                    .catch(function(error) {{
-                        // RESTAURAR controles mesmo em erro
-                        uiControls.style.display = 'flex';
-                        document.body.style.cursor = 'default';
-                        
-                        console.error('Capture failed:', error);
-                        alert('❌ ERRO ao gerar imagem ' + targetScale + 'x.\\n\\nTente uma qualidade menor.');
-                    }});
-                }};
-            </script>
-        </body>
-        </html>
-        """
+        # Render HTML (assets redimensionados para a escala escolhida);
+        # o mesmo board já gerado vem do cache de exportação
+        full_html = export_cache.cached_export(
+            st.session_state['players'], rodada_atual, escala_max, "html", "html",
+            lambda: board_render.render_board(
+                st.session_state['players'],
+                rodada_atual,
+                escala=escala_max,
+                bundle=asset_bundle.get_asset_bundle(escala_max),
+                css=render_custom_css(escala_max)
+            )
+        ).decode("utf-8")
         
         st.session_state['preview_html'] = full_html
 
@@ -1087,6 +449,25 @@ with tab_preview:
             st.write("### 📸 Alta Qualidade (Recomendado)")
             st.caption("Use o botão '⬇️ BAIXAR PNG' dentro da visualização acima. Escolha a qualidade no menu ao lado.")
             st.info("💡 **Os controles de qualidade e download ficam no canto superior direito da visualização.**")
+        
+        # Opção 3: PNG desenhado no servidor (Pillow) - sem navegador nem CDN
+        st.write("### 🖼️ PNG direto do servidor")
+        st.caption("Desenho nativo com Pillow: funciona offline e não pesa no navegador.")
+        if st.button(f"Gerar PNG {escala_max:.1f}x (Pillow)"):
+            with st.spinner("Desenhando a arte..."):
+                png = export_cache.cached_export(
+                    st.session_state['players'], rodada_atual, escala_max, "pillow", "png",
+                    lambda: board_raster.render_board_png(st.session_state['players'], rodada_atual, escala_max)
+                )
+            st.session_state['raster_png'] = (escala_max, png)
+        if st.session_state.get('raster_png'):
+            escala_png, png = st.session_state['raster_png']
+            st.download_button(
+                f"⬇️ Baixar PNG {escala_png:.1f}x",
+                png,
+                file_name=f"Dicas_Rodada_{rodada_atual}_TCC_{escala_png:.1f}x.png",
+                mime="image/png"
+            )
                         
     else:
         st.warning("Clique em 'Gerar/Atualizar Visualização' para ver o resultado.")
@@ -0,0 +1,175 @@
+"""
+Gera derivados redimensionados/recomprimidos dos logos e do background para
+cada escala de exportação, com cache em disco pelo hash do arquivo original.
+
+Os logos originais têm 1080px, mas aparecem em círculos de 60-68px; inlinar
+o arquivo cheio em base64 em todo HTML só aumenta o payload.
+
+Também gera subsets WOFF2 das fontes Decalotype restritos aos glifos que o
+board renderiza (requer fontTools + brotli; sem eles, usa o OTF completo).
+
+Uso: python asset_build.py   (pré-gera os derivados de todas as escalas)
+"""
+import hashlib
+import os
+import shutil
+import threading
+
+from PIL import Image
+
+import utils
+
+try:
+    from fontTools import subset as font_subset
+    import brotli  # noqa: F401 - necessário para gravar WOFF2
+except ImportError:
+    font_subset = None
+
+# Escalas oferecidas na exportação (resSelect do preview)
+EXPORT_SCALES = (3.0, 4.0, 6.0)
+
+# Tamanho exibido no board, em px CSS (largura, altura); None = proporcional
+DISPLAY_SIZES = {
+    'team': (68, 68),          # .team-circle
+    'header': (None, 100),     # .header-logo
+    'footer': (None, 60),      # .footer-logo-img
+    'background': (1200, None) # .report-container
+}
+
+JPEG_QUALITY = 85
+
+def _derivados_dir():
+    return os.path.join(utils.CACHE_DIR, "derivados")
+
+def escala_derivada(escala):
+    """
+    Menor escala pré-gerada que ainda é nítida para a escala pedida.
+    """
+    for s in EXPORT_SCALES:
+        if s >= escala:
+            return s
+    return EXPORT_SCALES[-1]
+
+def _tamanho_alvo(tamanho_original, caixa, escala):
+    largura, altura = tamanho_original
+    caixa_w, caixa_h = caixa
+    fatores = []
+    if caixa_w:
+        fatores.append(caixa_w * escala / largura)
+    if caixa_h:
+        fatores.append(caixa_h * escala / altura)
+    # Cobre a caixa inteira; nunca amplia o original
+    fator = min(1.0, max(fatores))
+    return max(1, round(largura * fator)), max(1, round(altura * fator))
+
+def derivative(src_path, tipo, escala):
+    """
+    Caminho do derivado de `src_path` para o `tipo` de asset na escala pedida.
+    Gera e grava no cache se ainda não existir; retorna o original quando
+    o derivado não ficaria menor.
+    """
+    if not os.path.exists(src_path):
+        return src_path
+    with open(src_path, "rb") as f:
+        chave = utils.file_hash(f.read())[:16]
+
+    with Image.open(src_path) as im:
+        alvo = _tamanho_alvo(im.size, DISPLAY_SIZES[tipo], escala)
+        ext = os.path.splitext(src_path)[1].lower()
+        destino = os.path.join(_derivados_dir(), f"{chave}-{alvo[0]}x{alvo[1]}{ext}")
+        if os.path.exists(destino):
+            return destino
+        if os.path.exists(destino + ".orig"):
+            return src_path
+
+        os.makedirs(_derivados_dir(), exist_ok=True)
+        redimensionado = im.size != alvo
+        img = im.resize(alvo, Image.LANCZOS) if redimensionado else im.copy()
+        tmp = f"{destino}.{threading.get_ident()}.tmp"
+        if ext in (".jpg", ".jpeg"):
+            img.convert("RGB").save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        else:
+            img.save(tmp, "PNG", optimize=True)
+
+    if not redimensionado and os.path.getsize(tmp) >= os.path.getsize(src_path):
+        # Recompressão não ajudou: marca para usar o original
+        os.remove(tmp)
+        open(destino + ".orig", "w").close()
+        return src_path
+    os.replace(tmp, destino)
+    return destino
+
+# Glifos do board: ASCII, Latin-1, Latin Extended-A (nomes de jogadores) e símbolos usados
+FONT_UNICODES = (
+    list(range(0x20, 0x7F)) + list(range(0xA0, 0x100)) + list(range(0x100, 0x180)) +
+    [0x2013, 0x2014, 0x2018, 0x2019, 0x201C, 0x201D, 0x2022, 0x2026, 0x2605]
+)
+
+def _fontes_dir():
+    return os.path.join(utils.CACHE_DIR, "fontes")
+
+def subset_font(src_path):
+    """
+    Subset WOFF2 da fonte com os glifos de FONT_UNICODES, em cache pelo hash
+    da fonte original e do conjunto de glifos.
+    Retorna (caminho, formato CSS); sem fontTools/brotli devolve o original.
+    """
+    if font_subset is None or not os.path.exists(src_path):
+        return src_path, "opentype"
+
+    with open(src_path, "rb") as f:
+        chave = utils.file_hash(f.read())[:16]
+    glifos = hashlib.sha256(",".join(map(str, FONT_UNICODES)).encode()).hexdigest()[:8]
+    destino = os.path.join(_fontes_dir(), f"{chave}-{glifos}.woff2")
+    if os.path.exists(destino):
+        return destino, "woff2"
+
+    os.makedirs(_fontes_dir(), exist_ok=True)
+    opcoes = font_subset.Options()
+    opcoes.flavor = "woff2"
+    opcoes.layout_features = ["*"]  # Mantém kerning/ligaduras
+    opcoes.name_IDs = ["*"]
+    fonte = font_subset.load_font(src_path, opcoes)
+    subsetter = font_subset.Subsetter(opcoes)
+    subsetter.populate(unicodes=FONT_UNICODES)
+    subsetter.subset(fonte)
+    tmp = f"{destino}.{threading.get_ident()}.tmp"
+    font_subset.save_font(fonte, tmp, opcoes)
+    fonte.close()
+    os.replace(tmp, destino)
+    return destino, "woff2"
+
+def build_all(escalas=EXPORT_SCALES):
+    """
+    Pré-gera os derivados de todos os assets para as escalas informadas.
+    """
+    import asset_bundle
+
+    fontes = [(os.path.join(asset_bundle.LOGOS_DIR, "background.jpg"), 'background'),
+              (os.path.join(asset_bundle.LOGOS_DIR, "logo_tcc.png"), 'header'),
+              (os.path.join(asset_bundle.LOGOS_DIR, "logo_tcc_branco.png"), 'footer')]
+    for nome in sorted(os.listdir(asset_bundle.TEAMS_DIR)):
+        fontes.append((os.path.join(asset_bundle.TEAMS_DIR, nome), 'team'))
+
+    total_orig = total_sub = 0
+    for nome in asset_bundle.FONT_FILES.values():
+        src = os.path.join(asset_bundle.FONTS_DIR, nome)
+        total_orig += os.path.getsize(src)
+        total_sub += os.path.getsize(subset_font(src)[0])
+    print(f"fontes: {total_orig / 1024:.0f} KB -> {total_sub / 1024:.0f} KB")
+
+    for escala in escalas:
+        total_orig = total_deriv = 0
+        for src, tipo in fontes:
+            if not os.path.exists(src):
+                continue
+            total_orig += os.path.getsize(src)
+            total_deriv += os.path.getsize(derivative(src, tipo, escala))
+        print(f"{escala:.1f}x: {total_orig / 1024 / 1024:.2f} MB -> {total_deriv / 1024 / 1024:.2f} MB")
+
+def clear_derivatives():
+    shutil.rmtree(_derivados_dir(), ignore_errors=True)
+    shutil.rmtree(_fontes_dir(), ignore_errors=True)
+
+if __name__ == "__main__":
+    build_all()
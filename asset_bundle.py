@@ -0,0 +1,115 @@
+"""
+Pacote imutável de assets (fontes, background, logos TCC e logos dos times)
+já codificados em base64, montado uma vez por processo e compartilhado por
+referência via st.cache_resource (st.cache_data copiaria as strings a cada hit).
+Com uma escala de exportação, as imagens vêm dos derivados de asset_build.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import asset_build
+import cache_namespaces
+import utils
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONTS_DIR = os.path.join(BASE_DIR, "assets", "fonts")
+LOGOS_DIR = os.path.join(BASE_DIR, "assets", "logos")
+TEAMS_DIR = os.path.join(BASE_DIR, "assets", "teams")
+
+DEFAULT_EXPORT_SCALE = asset_build.EXPORT_SCALES[0]
+
+# Pesos usados no CSS do board -> arquivo da fonte
+FONT_FILES = {
+    800: "Decalotype-ExtraBold.otf",
+    700: "Decalotype-Bold.otf",
+    500: "Decalotype-Medium.otf",
+}
+
+@dataclass(frozen=True)
+class AssetBundle:
+    fonts: MappingProxyType        # peso -> base64 da fonte (subset WOFF2 ou OTF)
+    font_format: str               # formato para o src do @font-face ('woff2' ou 'opentype')
+    background: str                # base64 do background.jpg
+    logo_header: str               # base64 do logo_tcc.png
+    logo_footer: str               # base64 do logo_tcc_branco.png (ou logo_header)
+    team_logos: MappingProxyType   # caminho do arquivo -> base64
+    versao: str                    # hash do conteúdo (chave dos caches de HTML gerado a partir do bundle)
+
+    def team_logo(self, team_name):
+        """
+        Base64 do logo do time (string vazia se não houver arquivo).
+        """
+        path = utils.get_team_logo_path(team_name)
+        return self.team_logos.get(os.path.abspath(path), "") if path else ""
+
+    @property
+    def font_mime(self):
+        return "font/woff2" if self.font_format == "woff2" else "font/otf"
+
+    def nbytes(self):
+        textos = [self.background, self.logo_header, self.logo_footer]
+        textos += list(self.fonts.values()) + list(self.team_logos.values())
+        # logo_footer pode ser a mesma string do header
+        return sum(len(t) for t in {id(t): t for t in textos}.values())
+
+def build_asset_bundle(escala=None):
+    """
+    Lê e codifica todos os assets do board.
+    Com `escala`, usa os derivados redimensionados para essa escala de exportação.
+    """
+    if escala is None:
+        imagem = lambda caminho, tipo: utils.get_file_base64(caminho)
+    else:
+        escala = asset_build.escala_derivada(escala)
+        imagem = lambda caminho, tipo: utils.get_file_base64(asset_build.derivative(caminho, tipo, escala))
+
+    fonts = {}
+    font_format = "woff2"
+    for peso, nome in FONT_FILES.items():
+        caminho, formato = asset_build.subset_font(os.path.join(FONTS_DIR, nome))
+        fonts[peso] = utils.get_file_base64(caminho)
+        if formato != "woff2":
+            font_format = formato
+
+    team_logos = {}
+    if os.path.isdir(TEAMS_DIR):
+        for nome in sorted(os.listdir(TEAMS_DIR)):
+            caminho = os.path.join(TEAMS_DIR, nome)
+            if os.path.isfile(caminho):
+                team_logos[os.path.abspath(caminho)] = imagem(caminho, 'team')
+
+    logo_header = imagem(os.path.join(LOGOS_DIR, "logo_tcc.png"), 'header')
+    # Fallback to main logo if white doesn't exist
+    logo_footer = imagem(os.path.join(LOGOS_DIR, "logo_tcc_branco.png"), 'footer') or logo_header
+
+    background = imagem(os.path.join(LOGOS_DIR, "background.jpg"), 'background')
+
+    h = hashlib.sha1(font_format.encode("ascii"))
+    for texto in [*fonts.values(), background, logo_header, logo_footer]:
+        h.update(texto.encode("ascii") + b";")
+    for caminho, texto in team_logos.items():
+        h.update(f"{os.path.basename(caminho)}:{texto};".encode("ascii"))
+
+    return AssetBundle(
+        fonts=MappingProxyType(fonts),
+        font_format=font_format,
+        background=background,
+        logo_header=logo_header,
+        logo_footer=logo_footer,
+        team_logos=MappingProxyType(team_logos),
+        versao=h.hexdigest(),
+    )
+
+@cache_namespaces.cached(cache_namespaces.NS_ASSETS, resource=True, show_spinner=False)
+def get_asset_bundle(escala=None):
+    """
+    Bundle compartilhado do processo (mesmo objeto para todas as sessões).
+    `escala` seleciona os derivados da escala de exportação (None = originais).
+    """
+    bundle = build_asset_bundle(escala)
+    rotulo = f" ({asset_build.escala_derivada(escala):.1f}x)" if escala else ""
+    print(f"Asset bundle{rotulo}: {len(bundle.team_logos)} logos de times, {len(bundle.fonts)} fontes, "
+          f"{bundle.nbytes() / 1024 / 1024:.2f} MB em base64")
+    return bundle
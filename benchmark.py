@@ -0,0 +1,704 @@
+"""
+Benchmarks das rotinas pesadas do app (rodar localmente, fora do Streamlit).
+
+Uso: python benchmark.py <caso> [--linhas N]
+"""
+import argparse
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+TIMES = ['FLAMENGO', 'PALMEIRAS', 'BOTAFOGO', 'SAO PAULO', 'CORINTHIANS', 'GREMIO', 'INTERNACIONAL',
+         'CRUZEIRO', 'ATLETICO-MG', 'BAHIA', 'FLUMINENSE', 'VASCO', 'SANTOS', 'VITORIA',
+         'MIRASSOL', 'REMO', 'CORITIBA', 'CHAPECOENSE', 'BRAGANTINO', 'ATHLETICO-PR']
+
+def gerar_temporada(linhas=50000, seed=42):
+    """
+    Gera um DataFrame sintético no formato de load_data ('Por jogo' já limpo).
+    """
+    rng = np.random.default_rng(seed)
+    jogadores_por_time = 30
+    por_jogo = 14
+    datas = pd.date_range("2025-04-01", periods=max(1, math.ceil(linhas / (len(TIMES) * por_jogo))), freq="3D")
+
+    # Cada time escala 14 jogadores distintos por data (sem repetir jogador na mesma data)
+    time_idx, jogador_idx, data_idx = [], [], []
+    for d in range(len(datas)):
+        for t in range(len(TIMES)):
+            escalados = rng.choice(jogadores_por_time, por_jogo, replace=False)
+            time_idx.extend([t] * por_jogo)
+            jogador_idx.extend(escalados)
+            data_idx.extend([d] * por_jogo)
+    time_idx = np.array(time_idx[:linhas])
+    jogador_idx = np.array(jogador_idx[:linhas])
+    data_idx = np.array(data_idx[:linhas])
+    linhas = len(time_idx)
+    nomes = [f"JOGADOR {TIMES[t]} {j}" for t, j in zip(time_idx, jogador_idx)]
+
+    df = pd.DataFrame({
+        'Data_dt': datas[data_idx],
+        'Jogador_Original': [n.title() for n in nomes],
+        'Jogador_Norm': nomes,
+        'Time': [TIMES[t].title() for t in time_idx],
+        'Time_Norm': [TIMES[t] for t in time_idx],
+        'PosReal': (jogador_idx % 6) + 1,
+        'Mand': rng.choice(['C', 'F'], linhas),
+        'Adversário': rng.choice(TIMES, linhas),
+        'Pts': rng.normal(3, 4, linhas).round(1),
+        'Básica': rng.normal(2, 2, linhas).round(1),
+    })
+    for col in utils.RANKING_SCOUTS:
+        df[col] = rng.poisson(0.3, linhas).astype(float)
+    df['Data'] = df['Data_dt'].dt.strftime('%d/%m/%Y')
+    return df
+
+def gerar_planilha(caminho, linhas=50000):
+    """
+    Grava uma planilha sintética com a aba 'Por jogo' no formato bruto do usuário.
+    """
+    df = gerar_temporada(linhas)
+    bruto = df[['Data', 'Jogador_Original', 'Time', 'PosReal', 'Mand', 'Adversário', 'Pts', 'Básica'] + utils.RANKING_SCOUTS]
+    bruto = bruto.rename(columns={'Jogador_Original': 'Nome2'})
+    bruto.to_excel(caminho, sheet_name='Por jogo', index=False)
+    return caminho
+
+def _cronometrar(func, *args, repeticoes=3, **kwargs):
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = func(*args, **kwargs)
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor, resultado
+
+def _ranking_loop(df, n_jogos, filter_type, target_round, rodadas_data, top_n_players, posicao_filter=None, pos_map=None):
+    """
+    Implementação original do utils.process_ranking (loop por time e por linha),
+    mantida como referência de tempo e de equivalência (tests/test_ranking.py).
+    """
+    player_data = {}
+    times = df['Time_Norm'].unique()
+    
+    # Mapeamento do filtro de posição para nomes normalizados possíveis
+    target_positions = []
+    if posicao_filter:
+        if isinstance(posicao_filter, str):
+            target_positions = [utils.normalize_name(posicao_filter)]
+        else:
+             target_positions = [utils.normalize_name(p) for p in posicao_filter]
+
+    for time_norm in times:
+        df_time = df[df['Time_Norm'] == time_norm].copy()
+        
+        # REGRA DE OURO: Ordenação por DATA decrescente
+        df_time = df_time.sort_values(by='Data_dt', ascending=False)
+        
+        # Identificar Jogos do Time que entram
+        eligible_dates = []
+        
+        if filter_type == "Todas":
+            # Pega datas únicas dos últimos N jogos
+            unique_dates = df_time['Data_dt'].unique()
+            # unique já retorna sorted se veio do df sorted? 
+            # NÃO, unique devolve appearance order. Como df tá sorted clean, deve funfar.
+            # Melhor garantir:
+            unique_dates_sorted = sorted(unique_dates, reverse=True)
+            eligible_dates = unique_dates_sorted[:n_jogos]
+            
+        elif filter_type == "Por Mando":
+            next_match = utils.get_next_match_info(time_norm, rodadas_data, target_round)
+            if next_match:
+                target_mando = next_match['mando']
+                # Filtrar coluna 'Mand'
+                # 'C' ou 'Casa' ou 'M'
+                # Vamos normalizar a coluna Mand para garantir
+                df_time['Mand_Norm'] = df_time['Mand'].apply(lambda x: str(x).upper().strip())
+                
+                if target_mando == 'CASA':
+                    df_mando = df_time[df_time['Mand_Norm'].isin(['C', 'CASA', 'M', 'MANDANTE'])]
+                else:
+                    df_mando = df_time[df_time['Mand_Norm'].isin(['F', 'FORA', 'V', 'VISITANTE'])]
+                
+                unique_dates_sorted = sorted(df_mando['Data_dt'].unique(), reverse=True)
+                eligible_dates = unique_dates_sorted[:n_jogos]
+            else:
+                eligible_dates = []
+
+        # Pegar linhas desses jogos
+        df_selected = df_time[df_time['Data_dt'].isin(eligible_dates)]
+        
+        for _, row in df_selected.iterrows():
+            nome_norm = row['Jogador_Norm']
+            
+            # Detecção de Posição
+            # 1. Tenta pegar do mapa externo (Meia/Volante)
+            pos_real = None
+            if pos_map and nome_norm in pos_map:
+                pos_real = pos_map[nome_norm]
+            
+            # 2. Se não achou ou não é Meia/Volante, usa o ID da planilha convertido
+            if not pos_real:
+                # Usa 'PosReal' ou 'Posicao' ou 'PosID'
+                target_pos_col = 'PosReal' if 'PosReal' in row else 'PosID'
+                val_pos = row.get(target_pos_col, 0)
+                pos_real = utils.map_pos_id_to_name(val_pos)
+            
+            # Filtro Posição
+            if target_positions:
+                if utils.normalize_name(pos_real) not in target_positions:
+                    continue
+            
+            if nome_norm not in player_data:
+                player_data[nome_norm] = {
+                    'Nome': row.get('Jogador_Original', row.get('Nome2', 'Unknown')),
+                    'Time': row['Time'],
+                    'Posicao': pos_real,
+                    'Jogos': [],
+                    'Total_Pontos': 0.0,
+                    'Total_Media_Basica': 0.0,
+                    'Scouts': {}
+                }
+            
+            p = player_data[nome_norm]
+            
+            # Info do Jogo
+            mando_str = str(row['Mand']).upper()
+            is_casa = mando_str in ['C', 'CASA', 'M']
+            
+            game_scouts = {}
+            for col in ['G', 'A', 'SG', 'DE', 'FS', 'FF', 'FD', 'DS', 'CA', 'CV', 'GS', 'PP', 'PC', 'FC', 'I', 'PI']:
+                val = row.get(col, 0)
+                if val > 0:
+                    game_scouts[col] = int(val)
+                    p['Scouts'][col] = p['Scouts'].get(col, 0) + int(val)
+            
+            p['Jogos'].append({
+                'Data': row['Data_dt'],
+                'Adversario': row.get('Adversário', '??'),
+                'Casa': is_casa,
+                'Pontos': row.get('Pts', 0),
+                'Basica': row.get('Básica', 0),
+                'Scouts': game_scouts
+            })
+            
+            # Totais temporários (serão recalculados após o corte)
+            p['Total_Pontos'] += row.get('Pts', 0)
+            p['Total_Media_Basica'] += row.get('Básica', 0)
+            
+    # Finalizar Lista e Aplicar "Safety Net"
+    ranking = []
+    for nome, data in player_data.items():
+        # 1. Garantir ordem cronológica
+        data['Jogos'].sort(key=lambda x: x['Data'], reverse=True)
+        
+        # 2. Cortar excedentes (Safety Net)
+        if len(data['Jogos']) > n_jogos:
+            data['Jogos'] = data['Jogos'][:n_jogos]
+            
+            # 3. Recalcular Totais Baseado no Corte
+            data['Total_Pontos'] = sum(j['Pontos'] for j in data['Jogos'])
+            data['Total_Media_Basica'] = sum(j['Basica'] for j in data['Jogos'])
+            
+            # 4. Recalcular Scouts Totais
+            data['Scouts'] = {}
+            for j in data['Jogos']:
+                for s_key, s_val in j['Scouts'].items():
+                    data['Scouts'][s_key] = data['Scouts'].get(s_key, 0) + s_val
+
+        # Calcular Médias Finais
+        # Divisão sempre pelo n_jogos TEÓRICO ou REAL?
+        # Regra user: "Média" = Total / N
+        # Se o jogador jogou MENOS que N, divide por N ou pelo real?
+        # Geralmente em ranking "Média" é pelo N jogos disputados ou N do filtro?
+        # Código anterior usava `n_jogos` (filtro). Manterei para consistência.
+        # Mas se ele jogou 2 e filtro é 3?
+        # User disse "O número pequeno 'Média' será... Total / N".
+        # Vamos manter divisão por `n_jogos` se > 0 else 1.
+        
+        divisor = n_jogos if n_jogos > 0 else 1
+        data['Media_Pontos'] = data['Total_Pontos'] / divisor
+        data['Media_Basica'] = data['Total_Media_Basica'] / divisor
+        
+        ranking.append(data)
+        
+    # Validar ordenação final do ranking
+    ranking.sort(key=lambda x: x['Total_Pontos'], reverse=True)
+    
+    return ranking[:top_n_players]
+
+def bench_ranking(linhas):
+    df = gerar_temporada(linhas)
+    rodadas = {t: [{'rodada': 10, 'oponente': 'X', 'mando': 'CASA' if i % 2 else 'FORA'}] for i, t in enumerate(TIMES)}
+    for filtro in ["Todas", "Por Mando"]:
+        args = (df, 5, filtro, 10, rodadas, 50)
+        t_old, _ = _cronometrar(_ranking_loop, *args, posicao_filter='MEIA', repeticoes=1)
+        t_new, _ = _cronometrar(utils.process_ranking, *args, posicao_filter='MEIA')
+        print(f"process_ranking [{filtro}] {linhas} linhas: loop {t_old:.3f}s | vetorizado {t_new:.3f}s "
+              f"({t_old / t_new:.1f}x)")
+
+def bench_rankings_multiplos(linhas):
+    df = gerar_temporada(linhas)
+    posicoes = ['GOLEIRO', 'LATERAL', 'ZAGUEIRO', 'MEIA', 'ATACANTE', 'TECNICO']
+
+    def uma_por_vez():
+        return {p: utils.process_ranking(df, 5, "Todas", 10, {}, 50, posicao_filter=p) for p in posicoes}
+
+    t_sep, _ = _cronometrar(uma_por_vez)
+    t_uni, _ = _cronometrar(utils.process_rankings, df, 5, "Todas", 10, {}, 50, posicoes)
+    print(f"process_rankings ({len(posicoes)} posições) {linhas} linhas: chamadas separadas {t_sep:.3f}s | "
+          f"passada única {t_uni:.3f}s ({t_sep / t_uni:.1f}x)")
+
+def bench_load_data(linhas):
+    tmp = tempfile.mkdtemp(prefix="bench_dicas_")
+    cache_original = utils.CACHE_DIR
+    try:
+        utils.CACHE_DIR = os.path.join(tmp, "cache")
+        planilha = gerar_planilha(os.path.join(tmp, "temporada.xlsx"), linhas)
+
+        t_frio, df_frio = _cronometrar(utils.load_data, planilha, repeticoes=1)
+        t_quente, df_quente = _cronometrar(utils.load_data, planilha)
+        iguais = df_frio.equals(df_quente)
+        print(f"load_data {len(df_frio)} linhas: frio (XLSX) {t_frio:.3f}s | quente (cache) {t_quente:.3f}s "
+              f"({t_frio / t_quente:.0f}x) | idêntico: {'OK' if iguais else 'DIVERGENTE'}")
+    finally:
+        utils.CACHE_DIR = cache_original
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def bench_excel_engines(linhas):
+    tmp = tempfile.mkdtemp(prefix="bench_dicas_")
+    try:
+        planilha = gerar_planilha(os.path.join(tmp, "temporada.xlsx"), linhas)
+        # Colunas extras que o app não usa, para medir o ganho do usecols
+        extra = pd.read_excel(planilha, sheet_name='Por jogo')
+        for i in range(10):
+            extra[f'Extra{i}'] = i
+        extra.to_excel(planilha, sheet_name='Por jogo', index=False)
+
+        for engine in utils.excel_engines():
+            t_tudo, _ = _cronometrar(utils.read_excel, planilha, engine=engine, sheet_name='Por jogo', repeticoes=1)
+            t_cols, _ = _cronometrar(utils.read_excel, planilha, engine=engine, sheet_name='Por jogo',
+                                     usecols=lambda c: c in utils.DATA_COLUMNS, repeticoes=1)
+            print(f"read_excel [{engine}] {linhas} linhas: todas as colunas {t_tudo:.3f}s | "
+                  f"só colunas usadas {t_cols:.3f}s")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def bench_normalize(linhas):
+    df = gerar_temporada(linhas)
+    nomes = df['Jogador_Original']
+    sem_cache = utils._normalize_str.__wrapped__
+
+    def original(x):
+        return "" if pd.isna(x) else sem_cache(str(x))
+
+    utils._normalize_str.cache_clear()
+    t_orig, r_orig = _cronometrar(nomes.apply, original)
+    t_memo, _ = _cronometrar(nomes.apply, utils.normalize_name)
+    utils._normalize_str.cache_clear()
+    t_lote, r_lote = _cronometrar(utils.normalize_series, nomes)
+    status = "OK" if r_orig.equals(r_lote) else "DIVERGENTE"
+    print(f"normalize_name {len(nomes)} linhas ({nomes.nunique()} nomes distintos): sem cache {t_orig:.3f}s | "
+          f"lru_cache {t_memo:.3f}s ({t_orig / t_memo:.1f}x) | normalize_series {t_lote:.3f}s "
+          f"({t_orig / t_lote:.1f}x) | equivalência: {status}")
+
+def gerar_mercado(atletas=800, seed=7):
+    """
+    Gera uma lista de atletas no formato de /atletas/mercado e um mapa de MPV parcial.
+    """
+    rng = np.random.default_rng(seed)
+    clubes = list(utils.CLUB_MAP.keys())
+    lista = []
+    for i in range(atletas):
+        lista.append({
+            'atleta_id': 100000 + i,
+            'apelido': f"Jogador {i} Ção",
+            'nome': f"Nome Completo {i}",
+            'clube_id': int(clubes[rng.integers(0, len(clubes))]),
+            'posicao_id': int(rng.integers(1, 7)),
+            'preco_num': round(float(rng.uniform(1, 25)), 2),
+        })
+    mpv_map = {100000 + i: round(float(rng.uniform(0, 8)), 2) for i in range(0, atletas, 2)}
+    return lista, mpv_map
+
+def _mercado_loop(api_data, gm_data):
+    # Loop original do app.py (referência de tempo e de equivalência em tests/test_mercado.py)
+    processed_data = []
+    for atleta in api_data:
+        aid = atleta.get('atleta_id')
+        mpv = 0.0
+        if aid and aid in gm_data:
+            mpv = gm_data[aid]
+        club_id = str(atleta.get('clube_id'))
+        team_name = utils.CLUB_MAP.get(club_id, 'Outros')
+        pos_name = utils.map_pos_id_to_name(atleta.get('posicao_id'))
+        processed_data.append({
+            'id': aid,
+            'Jogador_Original': atleta.get('apelido', atleta.get('nome', 'N/A')),
+            'Jogador_Norm': utils.normalize_name(atleta.get('apelido', atleta.get('nome', 'N/A'))),
+            'Time': team_name,
+            'Posicao': pos_name,
+            'Preco': float(atleta.get('preco_num', 0)),
+            'MinValorizar': float(mpv)
+        })
+    return pd.DataFrame(processed_data)
+
+def bench_mercado(linhas):
+    atletas, mpv_map = gerar_mercado()
+    t_loop, _ = _cronometrar(_mercado_loop, atletas, mpv_map, repeticoes=20)
+    t_novo, _ = _cronometrar(utils.build_mercado_df, atletas, mpv_map, repeticoes=20)
+    print(f"build_mercado_df {len(atletas)} atletas: loop {t_loop * 1000:.1f}ms | "
+          f"passada única {t_novo * 1000:.1f}ms ({t_loop / t_novo:.1f}x)")
+
+def bench_assets(linhas):
+    import streamlit as st
+    import asset_bundle
+
+    t_build, bundle = _cronometrar(asset_bundle.build_asset_bundle, repeticoes=1)
+    logos = list(bundle.team_logos)
+
+    # Padrão antigo: st.cache_data devolve uma cópia (pickle) a cada hit
+    @st.cache_data(show_spinner=False)
+    def logo_cache_data(path):
+        return utils.get_file_base64(path)
+
+    @st.cache_data(show_spinner=False)
+    def fundo_cache_data():
+        return utils.get_file_base64(os.path.join(asset_bundle.LOGOS_DIR, "background.jpg"))
+
+    def render_cache_data():
+        return [fundo_cache_data()] + [logo_cache_data(p) for p in logos]
+
+    def render_bundle():
+        b = asset_bundle.get_asset_bundle()
+        return [b.background] + [b.team_logos[p] for p in logos]
+
+    render_cache_data()
+    render_bundle()
+    t_data, _ = _cronometrar(render_cache_data, repeticoes=20)
+    t_res, _ = _cronometrar(render_bundle, repeticoes=20)
+    print(f"assets ({bundle.nbytes() / 1024 / 1024:.2f} MB base64, montagem {t_build:.3f}s): "
+          f"por render com st.cache_data {t_data * 1000:.2f}ms | bundle st.cache_resource {t_res * 1000:.3f}ms")
+
+def gerar_board(jogadores=60, seed=3):
+    """
+    Listas de jogadores no formato de st.session_state['players'].
+    """
+    import board_render
+
+    rng = np.random.default_rng(seed)
+    posicoes = board_render.GROUPS_LEFT + board_render.GROUPS_RIGHT
+    times = ['Flamengo', 'Palmeiras', 'Botafogo', 'São Paulo', 'Corinthians', 'Grêmio', 'Bahia', 'Athletico-PR']
+    players = {pos: [] for pos in posicoes}
+    for i in range(jogadores):
+        players[posicoes[i % len(posicoes)]].append({
+            'name': f"JOGADOR {i:02d}",
+            'team': times[rng.integers(len(times))],
+            'price': float(rng.uniform(2, 25)),
+            'mpv': float(rng.uniform(-2, 9)),
+            'conf': "ABCDE"[rng.integers(5)],
+            'badges': {'unanimidade': bool(rng.random() < 0.2), 'bom_capitao': bool(rng.random() < 0.2),
+                       'reserva_luxo': bool(rng.random() < 0.1)}
+        })
+    return players
+
+def _board_fstring(players, rodada, bundle):
+    """
+    Padrão antigo do preview: CSS gerado duas vezes e cards concatenados com +=.
+    """
+    import board_render
+
+    bg_css = board_render.render_css(bundle)  # noqa: F841 - o preview antigo gerava e descartava
+
+    def generate_pos_block(pos_key):
+        lista = players.get(pos_key, [])
+        if not lista: return ""
+        block_html = f"""
+            <div class="position-group">
+                <div class="pos-title-bar">{pos_key}</div>
+            """
+        for p in sorted(lista, key=board_render.player_sort_key):
+            t_logo = bundle.team_logo(p['team'])
+            t_img = f'<img src="data:image/png;base64,{t_logo}" class="team-logo"/>' if t_logo else ''
+            team_circle_class = "team-circle"
+            if p['team'] in ['São Paulo', 'Athletico-PR', 'Flamengo']:
+                team_circle_class += " sm"
+            icons_html = ""
+            if p['badges']['unanimidade']: icons_html += '<span class="icon-badge icon-star">★</span>'
+            if p['badges']['reserva_luxo']: icons_html += '<span class="icon-badge icon-rl">RL</span>'
+            if p['badges']['bom_capitao']: icons_html += '<span class="icon-badge icon-c">C</span>'
+            conf_class = "bg-conf-a"
+            if p['conf'] == 'B': conf_class = "bg-conf-b"
+            if p['conf'] == 'C': conf_class = "bg-conf-c"
+            if p['conf'] == 'D': conf_class = "bg-conf-d"
+            mpv = float(p.get('mpv', 0.0))
+            val_class = board_render.mpv_class(pos_key, mpv)
+            block_html += f"""
+                <div class="player-card">
+                    <div class="card-left">
+                        <div class="{team_circle_class}">
+                            {t_img}
+                        </div>
+                        <div class="p-name"><span class="name-text">{p['name']}</span>{icons_html}</div>
+                    </div>
+                        
+                    <div class="stats-row">
+                        <div class="stat-box">
+                            <div class="stat-label lbl-price">C$</div>
+                            <div class="stat-value">{p['price']:.1f}</div>
+                        </div>
+                        <div class="stat-box">
+                            <div class="stat-label">MPV</div>
+                            <div class="stat-value {val_class}">{mpv:.1f}</div>
+                        </div>
+                        <div class="stat-box">
+                            <div class="stat-label">CONF</div>
+                            <div class="conf-circle {conf_class}" style="box-shadow: 0 4px 8px rgba(0,0,0,0.5);">{p['conf']}</div>
+                        </div>
+                    </div>
+                </div>
+                """
+        block_html += "</div>"
+        return block_html
+
+    html_left = ""
+    for pos in board_render.GROUPS_LEFT: html_left += generate_pos_block(pos)
+    html_right = ""
+    for pos in board_render.GROUPS_RIGHT: html_right += generate_pos_block(pos)
+    return board_render.PAGE.render(
+        css=board_render.render_css(bundle), res_options=board_render.res_options_html(),
+        logo_header=bundle.logo_header, rodada=rodada, html_left=html_left, html_right=html_right,
+        logo_footer=bundle.logo_footer)
+
+def bench_board(linhas):
+    import asset_bundle
+    import board_render
+
+    players = gerar_board()
+    bundle = asset_bundle.get_asset_bundle(asset_bundle.DEFAULT_EXPORT_SCALE)
+    css = board_render.render_css(bundle)
+    t_old, r_old = _cronometrar(_board_fstring, players, 10, bundle, repeticoes=20)
+    t_new, r_new = _cronometrar(board_render.render_board, players, 10, bundle=bundle, use_cache=False, repeticoes=20)
+    t_css, _ = _cronometrar(board_render.render_board, players, 10, bundle=bundle, css=css, use_cache=False,
+                            repeticoes=20)
+    n = sum(len(v) for v in players.values())
+    print(f"board {n} jogadores ({len(r_new) / 1024 / 1024:.2f} MB): f-string += {t_old * 1000:.2f}ms | "
+          f"template {t_new * 1000:.2f}ms | template + CSS em cache {t_css * 1000:.2f}ms | "
+          f"equivalência: {'OK' if r_old == r_new else 'DIVERGENTE'}")
+
+def bench_board_incremental(linhas):
+    """
+    Loop editor -> preview: adiciona um meia por vez e regenera o board.
+    """
+    import copy
+
+    import asset_bundle
+    import board_render
+
+    escala = asset_bundle.DEFAULT_EXPORT_SCALE
+    bundle = asset_bundle.get_asset_bundle(escala)
+    css = board_render.render_css(bundle)
+    base = gerar_board()
+    novos = gerar_board(jogadores=120, seed=11)['Meias']
+
+    def editar(use_cache):
+        players = copy.deepcopy(base)
+        html = None
+        for p in novos:
+            players['Meias'].append(p)
+            html = board_render.render_board(players, 10, escala=escala, bundle=bundle, css=css, use_cache=use_cache)
+        return html
+
+    antes = board_render.block_cache_stats()
+    t_full, r_full = _cronometrar(editar, False, repeticoes=1)
+    t_inc, r_inc = _cronometrar(editar, True, repeticoes=1)
+    depois = board_render.block_cache_stats()
+    hits, misses = depois['hits'] - antes['hits'], depois['misses'] - antes['misses']
+    print(f"board incremental ({len(novos)} edições): tudo de novo {t_full / len(novos) * 1000:.2f}ms/render | "
+          f"blocos em cache {t_inc / len(novos) * 1000:.2f}ms/render | blocos {hits} hits / {misses} misses "
+          f"({hits / max(1, hits + misses):.0%}), {depois['nbytes'] / 1024 / 1024:.1f} MB | "
+          f"equivalência: {'OK' if r_full == r_inc else 'DIVERGENTE'}")
+
+def bench_export(linhas, exportacoes=5):
+    """
+    Latência por exportação PNG: pw_capture.py (Chromium novo por imagem)
+    vs render_worker (browser persistente), frio e quente.
+    """
+    import subprocess
+    import sys
+
+    import board_render
+    import render_worker
+
+    diretorio = tempfile.mkdtemp()
+    try:
+        html_path = os.path.join(diretorio, "board.html")
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(board_render.render_board(gerar_board(), 10, escala=3.0))
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pw_capture.py")
+        t0 = time.perf_counter()
+        for i in range(exportacoes):
+            subprocess.run([sys.executable, script, html_path, os.path.join(diretorio, f"sub{i}.png"),
+                            "3.0", str(render_worker.BASE_WIDTH)], check=True, capture_output=True)
+        t_sub = (time.perf_counter() - t0) / exportacoes
+
+        worker = render_worker.RenderWorker()
+        try:
+            t0 = time.perf_counter()
+            worker.capture(html_path=html_path, scale=3.0, output_path=os.path.join(diretorio, "frio.png"))
+            t_frio = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            for i in range(exportacoes):
+                worker.capture(html_path=html_path, scale=3.0, output_path=os.path.join(diretorio, f"w{i}.png"))
+            t_quente = (time.perf_counter() - t0) / exportacoes
+        finally:
+            worker.close()
+    except Exception as e:
+        print(f"export: Chromium do Playwright indisponível ({type(e).__name__}: {e})")
+        return
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+    print(f"export PNG 3.0x: pw_capture subprocess {t_sub:.2f}s/imagem | worker frio {t_frio:.2f}s | "
+          f"worker quente {t_quente:.2f}s/imagem")
+
+def bench_export_scales(linhas):
+    """
+    3.0x/4.0x/6.0x do mesmo board: uma escala por vez vs todas em paralelo,
+    com tempo por escala e pico de memória (Python + Chromium).
+    """
+    import board_render
+    import render_worker
+
+    escalas = [e for e, _ in board_render.EXPORT_OPTIONS]
+    html = board_render.render_board(gerar_board(), 10, escala=max(escalas))
+    diretorio = tempfile.mkdtemp()
+    worker = None
+    try:
+        worker = render_worker.RenderWorker()
+        worker.warm_up(escalas)
+        for rotulo, max_parallel in (("sequencial", 1), ("paralelo", None)):
+            saidas = {e: os.path.join(diretorio, f"{rotulo}_{e:.1f}x.png") for e in escalas}
+            with render_worker.PeakMemory() as memoria:
+                t0 = time.perf_counter()
+                r = worker.capture_scales(escalas, html=html, output_paths=saidas, max_parallel=max_parallel)
+                total = time.perf_counter() - t0
+            por_escala = " ".join(f"{e:.1f}x={r[e]['segundos']:.2f}s" for e in escalas)
+            pico = f"{memoria.pico / 1024 / 1024:.0f} MB" if memoria.pico is not None else "n/d"
+            print(f"export multiescala {rotulo}: total {total:.2f}s ({por_escala}) | pico {pico}")
+    except Exception as e:
+        print(f"export multiescala: Chromium do Playwright indisponível ({type(e).__name__}: {e})")
+    finally:
+        if worker is not None:
+            worker.close()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+def bench_tiles(linhas):
+    """
+    Exportação em tiles a 6.0x: tempo e pico de memória da captura única vs
+    tiles (precisa do Chromium). A igualdade pixel a pixel fica em tests/test_tiles.py.
+    """
+    import board_render
+    import render_worker
+
+    html = board_render.render_board(gerar_board(), 10, escala=6.0)
+    diretorio = tempfile.mkdtemp()
+    worker = None
+    try:
+        worker = render_worker.RenderWorker()
+        for rotulo, tiled in (("captura única", False), ("tiles", True)):
+            with render_worker.PeakMemory() as memoria:
+                t0 = time.perf_counter()
+                worker.capture(html=html, scale=6.0, output_path=os.path.join(diretorio, f"6x_{tiled}.png"),
+                               tiled=tiled)
+                t = time.perf_counter() - t0
+            pico = f"{memoria.pico / 1024 / 1024:.0f} MB" if memoria.pico is not None else "n/d"
+            print(f"6.0x {rotulo}: {t:.2f}s | pico {pico}")
+    except Exception as e:
+        print(f"tiles: Chromium do Playwright indisponível ({type(e).__name__}: {e})")
+    finally:
+        if worker is not None:
+            worker.close()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+def bench_raster(linhas):
+    """
+    Rasterizador Pillow: tempo de desenho (frio e quente), de codificação PNG
+    e do render_board_png completo.
+    """
+    import io
+
+    import board_raster
+
+    for jogadores in (24, 60):
+        players = gerar_board(jogadores)
+        for escala in (3.0, 6.0):
+            t_frio, _ = _cronometrar(board_raster.render_board_image, players, 10, escala, repeticoes=1)
+            t_quente, img = _cronometrar(board_raster.render_board_image, players, 10, escala)
+            t_png, _ = _cronometrar(img.save, io.BytesIO(), "PNG", compress_level=board_raster.PNG_COMPRESS_LEVEL,
+                                    compress_type=board_raster.PNG_COMPRESS_TYPE, repeticoes=1)
+            t_total, _ = _cronometrar(board_raster.render_board_png, players, 10, escala, repeticoes=1)
+            print(f"raster {jogadores} jogadores {escala:.1f}x {img.width}x{img.height}: desenho frio {t_frio:.2f}s | "
+                  f"quente {t_quente:.2f}s | PNG {t_png:.2f}s | render_board_png {t_total:.2f}s")
+
+def bench_export_cache(linhas):
+    """
+    Cache de exportação: mesmo board exportado de novo (e com a lista
+    reordenada) sai do disco em vez de ser desenhado outra vez.
+    Usa o backend pillow para rodar sem Chromium.
+    """
+    import cache_namespaces
+    import export_boards
+    import export_cache
+
+    players = gerar_board(24)
+    reordenado = {pos: list(reversed(lista)) for pos, lista in players.items()}
+    with tempfile.TemporaryDirectory() as tmp:
+        export_cache.EXPORT_CACHE_DIR = os.path.join(tmp, "cache")
+        boards = [{'nome': "bench", 'rodada': 10, 'scales': [3.0, 4.0], 'players': players}]
+        t_frio, _ = _cronometrar(export_boards.export_boards, boards, tmp, True, None, None, "pillow", repeticoes=1)
+        t_quente, _ = _cronometrar(export_boards.export_boards, boards, tmp, True, None, None, "pillow")
+        boards[0]['players'] = reordenado
+        t_reord, _ = _cronometrar(export_boards.export_boards, boards, tmp, True, None, None, "pillow", repeticoes=1)
+        arquivos, tamanho = export_cache.disk_usage()
+    stats = cache_namespaces.cache_stats()[cache_namespaces.NS_EXPORT]
+    print(f"export_cache 2 escalas + HTML: frio {t_frio:.2f}s | repetido {t_quente * 1000:.1f}ms "
+          f"({t_frio / t_quente:.0f}x) | lista reordenada {t_reord * 1000:.1f}ms")
+    print(f"export_cache {stats['hits']} hits / {stats['misses']} misses | "
+          f"{arquivos} arquivos, {tamanho / 1024 / 1024:.1f} MB em disco")
+
+CASOS = {
+    'ranking': bench_ranking,
+    'rankings': bench_rankings_multiplos,
+    'load_data': bench_load_data,
+    'excel': bench_excel_engines,
+    'normalize': bench_normalize,
+    'mercado': bench_mercado,
+    'assets': bench_assets,
+    'board': bench_board,
+    'board_incremental': bench_board_incremental,
+    'export': bench_export,
+    'export_scales': bench_export_scales,
+    'tiles': bench_tiles,
+    'raster': bench_raster,
+    'export_cache': bench_export_cache,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Gerador de Dicas por Posição")
+    parser.add_argument("caso", choices=sorted(CASOS) + ["todos"])
+    parser.add_argument("--linhas", type=int, default=50000)
+    args = parser.parse_args()
+
+    casos = CASOS.values() if args.caso == "todos" else [CASOS[args.caso]]
+    for caso in casos:
+        caso(args.linhas)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+"""
+Rasterizador nativo do board com Pillow: desenha a mesma arte do HTML
+(board_render + CSS do app) direto numa imagem, sem browser.
+
+As medidas abaixo são as do CSS do board, em px CSS; tudo é multiplicado
+pela escala na hora de desenhar. Fontes: os OTF Decalotype do projeto.
+É uma reprodução do layout (não um motor de CSS): sombras são simplificadas
+e a quebra do nome segue a mesma regra gulosa do browser.
+
+Uso:
+    img = board_raster.render_board_image(players, rodada=12, escala=3.0)
+    png = board_raster.render_board_png(players, rodada=12, escala=3.0, output_path="board.png")
+"""
+import io
+import os
+import zlib
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+import asset_build
+import asset_bundle
+import board_render
+import utils
+
+# Layout do board (px CSS)
+BOARD_WIDTH = 1200
+MIN_HEIGHT = 1200
+PADDING = 40
+HEADER_HEIGHT = 100
+HEADER_GAP = 30
+COLUMN_GAP = 30
+COLUMN_WIDTH = (BOARD_WIDTH - 2 * PADDING - COLUMN_GAP) / 2
+GROUP_GAP = 20
+CARD_GAP = 12
+FOOTER_HEIGHT = 90
+FOOTER_BORDER = 3
+LINE_HEIGHT = 1.2   # line-height: normal da Decalotype ((ascender + descender) / unitsPerEm)
+ASCENT = 2016 / 2048
+
+# Cores do CSS
+VERDE_TCC = (13, 59, 42)
+VERDE_BORDA = (30, 124, 92)
+VERDE_LIMAO = (163, 230, 53)
+BRANCO = (255, 255, 255)
+AMARELO_ESTRELA = (241, 196, 15)
+SOMBRA_TEXTO = (0, 0, 0, 110)
+CONF_CORES = {
+    'bg-conf-a': (46, 204, 113),
+    'bg-conf-b': (205, 220, 57),
+    'bg-conf-c': (241, 196, 15),
+    'bg-conf-d': (231, 76, 60),
+}
+VAL_CORES = {
+    'val-green': (46, 204, 113),
+    'val-red': (255, 82, 82),
+    'val-white': BRANCO,
+}
+BADGES = {   # classe -> (cor, texto, tamanho da fonte)
+    'icon-c': ((46, 204, 113), "C", 16),
+    'icon-rl': ((230, 126, 34), "RL", 12),
+}
+
+SUPERSAMPLE = 4   # Anti-aliasing de círculos e cantos
+
+@lru_cache(maxsize=32)
+def _font(peso, px):
+    arquivo = asset_bundle.FONT_FILES[800 if peso >= 800 else 700 if peso >= 600 else 500]
+    return ImageFont.truetype(os.path.join(asset_bundle.FONTS_DIR, arquivo), max(1, px))
+
+@lru_cache(maxsize=128)
+def _circle_mask(d):
+    grande = Image.new("L", (d * SUPERSAMPLE, d * SUPERSAMPLE), 0)
+    ImageDraw.Draw(grande).ellipse((0, 0, d * SUPERSAMPLE - 1, d * SUPERSAMPLE - 1), fill=255)
+    return grande.resize((d, d), Image.LANCZOS)
+
+@lru_cache(maxsize=16)
+def _star_mask(d):
+    import math
+
+    grande = Image.new("L", (d * SUPERSAMPLE, d * SUPERSAMPLE), 0)
+    c, r_ext = d * SUPERSAMPLE / 2, d * SUPERSAMPLE / 2
+    pontos = []
+    for i in range(10):
+        r = r_ext if i % 2 == 0 else r_ext * 0.42
+        ang = math.pi / 2 + i * math.pi / 5
+        pontos.append((c + r * math.cos(ang), c - r * math.sin(ang)))
+    ImageDraw.Draw(grande).polygon(pontos, fill=255)
+    return grande.resize((d, d), Image.LANCZOS)
+
+@lru_cache(maxsize=64)
+def _imagem(caminho, tipo, escala, largura, altura):
+    """
+    Imagem RGBA redimensionada para caber (contain) em largura x altura px.
+    """
+    with Image.open(asset_build.derivative(caminho, tipo, escala)) as im:
+        im = im.convert("RGBA")
+        fator = min(largura / im.width, altura / im.height)
+        return im.resize((max(1, round(im.width * fator)), max(1, round(im.height * fator))), Image.LANCZOS)
+
+@lru_cache(maxsize=2)
+def _fundo_origem(escala):
+    """
+    Derivado do background.jpg já decodificado (RGB, no tamanho do derivado).
+    """
+    caminho = os.path.join(asset_bundle.LOGOS_DIR, "background.jpg")
+    if not os.path.exists(caminho):
+        return None
+    with Image.open(asset_build.derivative(caminho, 'background', escala)) as im:
+        return im.convert("RGB")
+
+@lru_cache(maxsize=2)
+def _fundo_largura(escala, largura):
+    """
+    Background redimensionado para a largura do board (depende só da escala).
+    É o único tamanho guardado: nada do tamanho do canvas fica em cache.
+    """
+    origem = _fundo_origem(escala)
+    return origem.resize((largura, max(1, round(origem.height * largura / origem.width))), Image.LANCZOS)
+
+def _pintar_fundo(img, escala):
+    """
+    background.jpg em 'cover' centralizado, desenhado direto no canvas.
+    """
+    origem = _fundo_origem(escala)
+    if origem is None:
+        return
+    largura, altura = img.size
+    if largura / origem.width >= altura / origem.height:
+        # Cover pela largura: cola a faixa central (offset negativo, sem recortar)
+        fundo = _fundo_largura(escala, largura)
+        img.paste(fundo, (0, -((fundo.height - altura) // 2)))
+        return
+    # Board mais alto que o background: cover pela altura, redimensionando só a
+    # região visível. Ampliando, o derivado não tem detalhe para o LANCZOS
+    # preservar, e o BILINEAR custa ~1/3 menos num canvas de 40 MP
+    fator = altura / origem.height
+    w = largura / fator
+    x = (origem.width - w) / 2
+    img.paste(origem.resize((largura, altura), Image.BILINEAR, box=(x, 0, x + w, origem.height)), (0, 0))
+
+def _aspecto(caminho):
+    if not os.path.exists(caminho):
+        return 1.0
+    with Image.open(caminho) as im:
+        return im.width / im.height
+
+class _Canvas:
+    """
+    Primitivas de desenho em coordenadas CSS (convertidas pela escala).
+    """
+    def __init__(self, escala, largura, altura):
+        self.escala = escala
+        self.img = Image.new("RGBA", (self.px(largura), self.px(altura)), BRANCO)
+        self.draw = ImageDraw.Draw(self.img, "RGBA")
+
+    def px(self, v):
+        return int(round(v * self.escala))
+
+    def medir(self, texto, tamanho, peso=800, espacamento=0):
+        largura = _font(peso, self.px(tamanho)).getlength(texto) / self.escala
+        return largura + espacamento * len(texto)
+
+    def texto(self, x, topo, texto, tamanho, peso=800, cor=BRANCO, sombra=False, espacamento=0, altura_linha=None):
+        """
+        Texto com o topo da caixa de linha em `topo` (como no CSS, com half-leading).
+        """
+        fonte = _font(peso, self.px(tamanho))
+        altura_linha = altura_linha or tamanho * LINE_HEIGHT
+        base = topo + (altura_linha - tamanho * LINE_HEIGHT) / 2 + tamanho * ASCENT
+        if sombra:
+            self._texto(x + 1, base + 1, texto, fonte, SOMBRA_TEXTO, espacamento)
+        self._texto(x, base, texto, fonte, cor, espacamento)
+
+    def _texto(self, x, base, texto, fonte, cor, espacamento):
+        if not espacamento:
+            self.draw.text((self.px(x), self.px(base)), texto, font=fonte, fill=cor, anchor="ls")
+            return
+        for ch in texto:
+            self.draw.text((self.px(x), self.px(base)), ch, font=fonte, fill=cor, anchor="ls")
+            x += fonte.getlength(ch) / self.escala + espacamento
+
+    def texto_centro(self, cx, topo, texto, tamanho, peso=800, cor=BRANCO, sombra=False, espacamento=0,
+                     altura_linha=None):
+        largura = self.medir(texto, tamanho, peso, espacamento) - espacamento * (len(texto) > 0)
+        self.texto(cx - largura / 2, topo, texto, tamanho, peso, cor, sombra, espacamento, altura_linha)
+
+    def _preencher(self, x0, y0, x1, y1, r, cor):
+        if r <= 0:
+            self.draw.rectangle((x0, y0, x1 - 1, y1 - 1), fill=cor)
+            return
+        r = min(r, (x1 - x0) // 2, (y1 - y0) // 2)
+        if x1 - r > x0 + r:
+            self.draw.rectangle((x0 + r, y0, x1 - r - 1, y1 - 1), fill=cor)
+        if y1 - r > y0 + r:
+            self.draw.rectangle((x0, y0 + r, x1 - 1, y1 - r - 1), fill=cor)
+        mascara = _circle_mask(2 * r)
+        for mx, my, dx, dy in ((0, 0, x0, y0), (r, 0, x1 - r, y0), (0, r, x0, y1 - r), (r, r, x1 - r, y1 - r)):
+            self.img.paste(cor, (dx, dy, dx + r, dy + r), mascara.crop((mx, my, mx + r, my + r)))
+
+    def caixa(self, x, y, largura, altura, raio, cor, borda=0, cor_borda=None):
+        """
+        Retângulo arredondado (border-radius) com borda opcional, em px CSS.
+        """
+        x0, y0, x1, y1 = self.px(x), self.px(y), self.px(x + largura), self.px(y + altura)
+        r = self.px(raio)
+        if borda:
+            b = max(1, self.px(borda))
+            self._preencher(x0, y0, x1, y1, r, cor_borda)
+            self._preencher(x0 + b, y0 + b, x1 - b, y1 - b, max(0, r - b), cor)
+        else:
+            self._preencher(x0, y0, x1, y1, r, cor)
+
+    def circulo(self, x, y, d, cor, borda=0, cor_borda=None):
+        self.caixa(x, y, d, d, d / 2, cor, borda, cor_borda)
+
+    def estrela(self, x, y, d, cor):
+        tamanho = self.px(d)
+        self.img.paste(cor, (self.px(x), self.px(y), self.px(x) + tamanho, self.px(y) + tamanho), _star_mask(tamanho))
+
+    def imagem(self, caminho, tipo, x, y, largura, altura):
+        """
+        Imagem centralizada em 'contain' na caixa (px CSS).
+        """
+        if not caminho or not os.path.exists(caminho):
+            return
+        im = _imagem(caminho, tipo, self.escala, self.px(largura), self.px(altura))
+        dx = self.px(x) + (self.px(largura) - im.width) // 2
+        dy = self.px(y) + (self.px(altura) - im.height) // 2
+        self.img.alpha_composite(im, (dx, dy))
+
+# --- Medidas dos componentes (px CSS) ---
+
+NAME_SIZE = 24
+NAME_LINE = NAME_SIZE * 1.1
+STAR_SIZE = 22           # ★ vem da fonte de fallback do browser (~0.85em de 26px)
+BADGE_SIZE = 28          # 24px + borda 2px
+BADGE_MARGIN = 3
+STAT_MIN_WIDTH = 55
+STAT_GAP = 12
+CONF_SIZE = 36           # 32px + borda 2px
+CARD_PAD_X, CARD_PAD_Y, CARD_BORDER = 18, 12, 2
+CIRCLE_BORDER = 3
+TITLE_SIZE = 32
+TITLE_PAD_X, TITLE_PAD_Y = 30, 6
+
+def _icones(p):
+    icones = []
+    if p['badges']['unanimidade']: icones.append('icon-star')
+    if p['badges']['reserva_luxo']: icones.append('icon-rl')
+    if p['badges']['bom_capitao']: icones.append('icon-c')
+    return icones
+
+def _largura_icone(icone):
+    return (STAR_SIZE if icone == 'icon-star' else BADGE_SIZE) + 2 * BADGE_MARGIN
+
+def _quebrar_nome(canvas, nome, icones, largura_max):
+    """
+    Quebra gulosa do nome + ícones em linhas: [[(tipo, valor, largura), ...], ...].
+    """
+    espaco = canvas.medir(" ", NAME_SIZE)
+    palavras = nome.upper().split() or [""]
+    itens = [('texto', w, canvas.medir(w, NAME_SIZE)) for w in palavras]
+    if itens:
+        # margin-right: 6px do .name-text
+        tipo, valor, largura = itens[-1]
+        itens[-1] = (tipo, valor, largura + 6)
+    itens += [('icone', i, _largura_icone(i)) for i in icones]
+
+    linhas, atual, largura_atual = [], [], 0
+    for item in itens:
+        extra = item[2] + (espaco if atual and item[0] == 'texto' and atual[-1][0] == 'texto' else 0)
+        if atual and largura_atual + extra > largura_max:
+            linhas.append(atual)
+            atual, largura_atual = [], 0
+            extra = item[2]
+        atual.append(item)
+        largura_atual += extra
+    linhas.append(atual)
+    return linhas
+
+def _altura_linha_nome(linha):
+    # Badges inline-flex (28px + margem) aumentam a caixa de linha
+    return max([NAME_LINE] + [BADGE_SIZE + 4 for t, v, _ in linha if t == 'icone' and v != 'icon-star'])
+
+def _stat_boxes(canvas, p, mpv):
+    caixas = [
+        ("C$", 15, f"{p['price']:.1f}"),
+        ("MPV", 14, f"{mpv:.1f}"),
+        ("CONF", 14, None),
+    ]
+    resultado = []
+    for rotulo, tamanho, valor in caixas:
+        largura = max(STAT_MIN_WIDTH, canvas.medir(rotulo, tamanho, espacamento=0.5),
+                      canvas.medir(valor, 22) if valor else CONF_SIZE)
+        resultado.append((rotulo, tamanho, valor, largura))
+    return resultado
+
+def _layout_card(canvas, p, pos_key):
+    mpv = float(p.get('mpv', 0.0))
+    stats = _stat_boxes(canvas, p, mpv)
+    largura_stats = sum(s[3] for s in stats) + STAT_GAP * (len(stats) - 1)
+    circulo = (60 if p['team'] in board_render.TEAMS_CIRCLE_SM else 68) + 2 * CIRCLE_BORDER
+    interno = COLUMN_WIDTH - 2 * (CARD_PAD_X + CARD_BORDER)
+    linhas = _quebrar_nome(canvas, p['name'], _icones(p), interno - largura_stats - circulo - 12)
+    altura_nome = sum(_altura_linha_nome(l) for l in linhas)
+    altura_stats = 14 * LINE_HEIGHT + 8 + CONF_SIZE
+    conteudo = max(circulo, altura_nome, altura_stats)
+    return {
+        'p': p, 'mpv': mpv, 'stats': stats, 'largura_stats': largura_stats, 'circulo': circulo,
+        'linhas': linhas, 'altura_nome': altura_nome, 'conteudo': conteudo,
+        'altura': conteudo + 2 * (CARD_PAD_Y + CARD_BORDER),
+        'val_class': board_render.mpv_class(pos_key, mpv),
+        'conf_class': board_render.CONF_CLASSES.get(p['conf'], "bg-conf-a"),
+    }
+
+def _altura_titulo():
+    return TITLE_SIZE * LINE_HEIGHT + 2 * TITLE_PAD_Y + 4
+
+def _layout_grupo(canvas, pos_key, players):
+    cards = [_layout_card(canvas, p, pos_key) for p in sorted(players, key=board_render.player_sort_key)]
+    altura = _altura_titulo() + 12 + sum(c['altura'] + CARD_GAP for c in cards)
+    return {'pos': pos_key, 'cards': cards, 'altura': altura}
+
+# --- Desenho ---
+
+def _desenhar_icone(canvas, icone, x, y_centro):
+    if icone == 'icon-star':
+        canvas.estrela(x + BADGE_MARGIN, y_centro - STAR_SIZE / 2 - 1, STAR_SIZE, AMARELO_ESTRELA)
+        return
+    cor, texto, tamanho = BADGES[icone]
+    topo = y_centro - BADGE_SIZE / 2
+    canvas.circulo(x + BADGE_MARGIN, topo, BADGE_SIZE, cor, 2, BRANCO)
+    canvas.texto_centro(x + BADGE_MARGIN + BADGE_SIZE / 2, topo, texto, tamanho, 700, altura_linha=BADGE_SIZE)
+
+def _desenhar_card(canvas, card, x, y):
+    p = card['p']
+    canvas.caixa(x, y, COLUMN_WIDTH, card['altura'], 16, VERDE_TCC, CARD_BORDER, VERDE_BORDA)
+    x_int, y_int = x + CARD_BORDER + CARD_PAD_X, y + CARD_BORDER + CARD_PAD_Y
+    meio = y_int + card['conteudo'] / 2
+
+    # Logo do time
+    d = card['circulo']
+    canvas.circulo(x_int, meio - d / 2, d, BRANCO)
+    interno = (d - 2 * CIRCLE_BORDER) * 0.96
+    canvas.imagem(utils.get_team_logo_path(p['team']), 'team', x_int + (d - interno) / 2, meio - interno / 2,
+                  interno, interno)
+
+    # Nome + ícones
+    nx = x_int + d + 12
+    ny = meio - card['altura_nome'] / 2
+    espaco = canvas.medir(" ", NAME_SIZE)
+    for linha in card['linhas']:
+        altura = _altura_linha_nome(linha)
+        cx = nx
+        for i, (tipo, valor, largura) in enumerate(linha):
+            if tipo == 'texto':
+                if i and linha[i - 1][0] == 'texto':
+                    cx += espaco
+                canvas.texto(cx, ny, valor, NAME_SIZE, 800, sombra=True, altura_linha=altura)
+            else:
+                _desenhar_icone(canvas, valor, cx, ny + altura / 2)
+            cx += largura
+        ny += altura
+
+    # Stats (C$, MPV, CONF)
+    sx = x_int + COLUMN_WIDTH - 2 * (CARD_PAD_X + CARD_BORDER) - card['largura_stats']
+    altura_stats = 14 * LINE_HEIGHT + 8 + CONF_SIZE
+    sy = meio - altura_stats / 2
+    for rotulo, tamanho, valor, largura in card['stats']:
+        centro = sx + largura / 2
+        canvas.texto_centro(centro, sy, rotulo, tamanho, 800, sombra=True, espacamento=0.5)
+        abaixo = sy + tamanho * LINE_HEIGHT + 8
+        if valor is None:
+            canvas.circulo(centro - CONF_SIZE / 2, abaixo, CONF_SIZE, CONF_CORES[card['conf_class']])
+            canvas.texto_centro(centro, abaixo, p['conf'], 18, 800, VERDE_TCC, altura_linha=CONF_SIZE)
+        else:
+            cor = VAL_CORES[card['val_class']] if rotulo == "MPV" else BRANCO
+            canvas.texto_centro(centro, abaixo + 8, valor, 22, 800, cor, sombra=True, altura_linha=22)
+        sx += largura + STAT_GAP
+
+def _desenhar_grupo(canvas, grupo, x, y):
+    largura_titulo = canvas.medir(grupo['pos'].upper(), TITLE_SIZE) + 2 * TITLE_PAD_X + 4
+    tx = x + (COLUMN_WIDTH - largura_titulo) / 2
+    canvas.caixa(tx, y, largura_titulo, _altura_titulo(), 8, BRANCO, 2, VERDE_TCC)
+    canvas.texto_centro(x + COLUMN_WIDTH / 2, y + 2 + TITLE_PAD_Y, grupo['pos'].upper(), TITLE_SIZE, 800, VERDE_TCC)
+    y += _altura_titulo() + 12
+    for card in grupo['cards']:
+        _desenhar_card(canvas, card, x, y)
+        y += card['altura'] + CARD_GAP
+
+def _desenhar_header(canvas, rodada):
+    logo = os.path.join(asset_bundle.LOGOS_DIR, "logo_tcc.png")
+    largura_logo = HEADER_HEIGHT * _aspecto(logo)
+    esquerda, direita = PADDING + 10, BOARD_WIDTH - PADDING - 10
+    canvas.imagem(logo, 'header', esquerda, PADDING, largura_logo, HEADER_HEIGHT)
+    canvas.imagem(logo, 'header', direita - largura_logo, PADDING, largura_logo, HEADER_HEIGHT)
+
+    x0, x1 = esquerda + largura_logo + 15, direita - largura_logo - 15
+    altura = 38 * LINE_HEIGHT + 20 + 4
+    y = PADDING + (HEADER_HEIGHT - altura) / 2
+    canvas.caixa(x0, y, x1 - x0, altura, 12, VERDE_TCC, 2, BRANCO)
+    titulo = f"DICAS POR POSIÇÃO – TCC – RODADA {rodada}"
+    while len(titulo) > 1 and canvas.medir(titulo, 38) > x1 - x0 - 64:
+        titulo = titulo[:-2] + "…"   # text-overflow: ellipsis
+    canvas.texto_centro((x0 + x1) / 2, y + 2 + 10, titulo, 38, 800, sombra=True)
+
+def _desenhar_footer(canvas, topo):
+    canvas.caixa(0, topo, BOARD_WIDTH, FOOTER_BORDER, 0, VERDE_LIMAO)
+    y = topo + FOOTER_BORDER
+    canvas.caixa(0, y, BOARD_WIDTH, FOOTER_HEIGHT, 0, VERDE_TCC)
+
+    logo = os.path.join(asset_bundle.LOGOS_DIR, "logo_tcc_branco.png")
+    if not os.path.exists(logo):
+        logo = os.path.join(asset_bundle.LOGOS_DIR, "logo_tcc.png")
+    largura_logo = 60 * _aspecto(logo)
+    canvas.imagem(logo, 'footer', 20, y + (FOOTER_HEIGHT - 60) / 2, largura_logo, 60)
+    canvas.imagem(logo, 'footer', BOARD_WIDTH - 20 - largura_logo, y + (FOOTER_HEIGHT - 60) / 2, largura_logo, 60)
+
+    # Legenda: ícone + texto, gap 25
+    itens = [('icon-rl', "Luxo"), ('icon-star', "Unanimidade"), ('icon-c', "Bom Capitão"), ('conf', "Nível de Confiança")]
+    larguras = [(_largura_icone(i) if i != 'conf' else 15 + 2 * BADGE_MARGIN) + 5 + canvas.medir(t, 14, 700)
+                for i, t in itens]
+    altura_legenda = BADGE_SIZE + 4
+    bloco = altura_legenda + 6 + 14 * LINE_HEIGHT
+    ly = y + (FOOTER_HEIGHT - bloco) / 2
+    lx = (BOARD_WIDTH - sum(larguras) - 25 * (len(itens) - 1)) / 2
+    for (icone, texto), largura in zip(itens, larguras):
+        meio = ly + altura_legenda / 2
+        if icone == 'conf':
+            canvas.circulo(lx + BADGE_MARGIN, meio - 7.5, 15, CONF_CORES['bg-conf-a'])
+            largura_icone = 15 + 2 * BADGE_MARGIN
+        else:
+            _desenhar_icone(canvas, icone, lx, meio)
+            largura_icone = _largura_icone(icone)
+        canvas.texto(lx + largura_icone + 5, meio - 14 * LINE_HEIGHT / 2, texto, 14, 700)
+        lx += largura + 25
+
+    canvas.texto_centro(BOARD_WIDTH / 2, ly + altura_legenda + 6, "MATERIAL EXCLUSIVO – TREINANDO CAMPEÕES DE CARTOLA",
+                        14, 700, espacamento=1)
+
+def render_board_image(players, rodada, escala=asset_bundle.DEFAULT_EXPORT_SCALE):
+    """
+    Board desenhado com Pillow, em RGB, com 1200 * escala px de largura.
+    `players` tem o formato de st.session_state['players'].
+    """
+    medidor = _Canvas(escala, 1, 1)
+    colunas = []
+    for grupos in (board_render.GROUPS_LEFT, board_render.GROUPS_RIGHT):
+        colunas.append([_layout_grupo(medidor, pos, players[pos]) for pos in grupos if players.get(pos)])
+    altura_colunas = max([sum(g['altura'] for g in c) + GROUP_GAP * max(0, len(c) - 1) for c in colunas] + [0])
+    altura_footer = FOOTER_HEIGHT + FOOTER_BORDER
+    altura = max(MIN_HEIGHT, PADDING + HEADER_HEIGHT + HEADER_GAP + altura_colunas + altura_footer)
+
+    canvas = _Canvas(escala, BOARD_WIDTH, altura)
+    _pintar_fundo(canvas.img, escala)
+    _desenhar_header(canvas, rodada)
+    for i, grupos in enumerate(colunas):
+        x = PADDING + i * (COLUMN_WIDTH + COLUMN_GAP)
+        y = PADDING + HEADER_HEIGHT + HEADER_GAP
+        for grupo in grupos:
+            _desenhar_grupo(canvas, grupo, x, y)
+            y += grupo['altura'] + GROUP_GAP
+    _desenhar_footer(canvas, altura - altura_footer)
+    return canvas.img.convert("RGB")
+
+PNG_COMPRESS_LEVEL = 1   # PNG do board é grande; compressão máxima custa mais que o desenho
+PNG_COMPRESS_TYPE = zlib.Z_RLE   # ~20% mais rápido que o padrão, arquivo ~10% maior
+
+def render_board_png(players, rodada, escala=asset_bundle.DEFAULT_EXPORT_SCALE, output_path=None):
+    """
+    PNG do board (bytes); grava também em `output_path` se informado.
+    """
+    buffer = io.BytesIO()
+    render_board_image(players, rodada, escala).save(buffer, "PNG", compress_level=PNG_COMPRESS_LEVEL,
+                                                        compress_type=PNG_COMPRESS_TYPE)
+    png = buffer.getvalue()
+    if output_path:
+        with open(output_path, "wb") as f:
+            f.write(png)
+    return png
@@ -0,0 +1,817 @@
+"""
+Renderização do board "DICAS POR POSIÇÃO" em HTML, sem depender do Streamlit.
+
+Os templates são compilados uma vez na importação (trechos fixos + campos)
+e cada página é montada numa lista de pedaços com um único ''.join, em vez
+de concatenar f-strings grandes com +=. O CSS do board entra uma vez por página.
+Cada bloco de posição fica em cache pelo hash da sua lista de jogadores: ao
+adicionar um meia, só o bloco dos Meias é renderizado de novo.
+
+Uso fora do app:
+    html = board_render.render_board(players, rodada=12, escala=3.0)
+"""
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+
+import asset_bundle
+import cache_namespaces
+
+class Template:
+    """
+    Template pré-compilado: o texto é partido uma única vez em trechos fixos
+    e campos {{ nome }}; renderizar só intercala os valores já formatados.
+    """
+    _CAMPO = re.compile(r"\{\{ (\w+) \}\}")
+
+    def __init__(self, texto):
+        partes = self._CAMPO.split(texto)
+        self.literais = tuple(partes[0::2])
+        self.campos = tuple(partes[1::2])
+
+    def render_into(self, saida, valores):
+        """
+        Acrescenta os pedaços do template em `saida` (lista), sem concatenar.
+        """
+        literais = self.literais
+        saida.append(literais[0])
+        for i, campo in enumerate(self.campos, 1):
+            saida.append(str(valores[campo]))
+            saida.append(literais[i])
+
+    def render(self, **valores):
+        saida = []
+        self.render_into(saida, valores)
+        return "".join(saida)
+
+# Opções de qualidade do PNG: (escala, rótulo)
+EXPORT_OPTIONS = [
+    (3.0, "3.0x (3600px - Padrão)"),
+    (4.0, "4.0x (4800px - Print A3)"),
+    (6.0, "6.0x (~7200px - 600 DPI)"),
+]
+
+# Colunas do board
+GROUPS_LEFT = ['Técnicos', 'Laterais', 'Meias']
+GROUPS_RIGHT = ['Goleiros', 'Zagueiros', 'Atacantes']
+
+# Times cujo logo fica melhor no círculo menor (60px)
+TEAMS_CIRCLE_SM = ('São Paulo', 'Athletico-PR', 'Flamengo')
+
+# Tamanho total dos blocos de posição guardados: cada card leva o logo do time
+# em base64, então um bloco de posição passa fácil de 100 KB nas escalas altas
+BLOCK_CACHE_MAX_MB = 32
+
+CONF_CLASSES = {'B': "bg-conf-b", 'C': "bg-conf-c", 'D': "bg-conf-d"}
+
+CSS = Template("""
+    /* Fonts Global import */
+    @font-face {
+        font-family: 'Decalotype';
+        src: url(data:{{ font_mime }};base64,{{ font_800 }}) format('{{ font_format }}');
+        font-weight: 800;
+        font-style: normal;
+        font-display: block;
+    }
+    @font-face {
+        font-family: 'Decalotype';
+        src: url(data:{{ font_mime }};base64,{{ font_700 }}) format('{{ font_format }}');
+        font-weight: 700;
+        font-style: normal;
+        font-display: block;
+    }
+    @font-face {
+        font-family: 'Decalotype';
+        src: url(data:{{ font_mime }};base64,{{ font_500 }}) format('{{ font_format }}');
+        font-weight: 500;
+        font-style: normal;
+        font-display: block;
+    }
+    
+    /* REPORT CONTAINER */
+    .report-container {
+        font-family: 'Decalotype', sans-serif;
+        width: 1200px; /* FIXED WIDTH for consistent export */
+        margin: 0 auto;
+        background-color: #ffffff;
+        background-image: url(data:image/jpeg;base64,{{ background }});
+        background-size: cover;
+        background-size: cover;
+        background-position: center;
+        background-repeat: no-repeat;
+        padding: 40px; 
+        padding-bottom: 0; /* Footer vai até a borda */
+        box-sizing: border-box;
+        min-height: 1200px;
+        color: white;
+        -webkit-font-smoothing: antialiased;
+        display: flex;
+        flex-direction: column;
+    }
+    
+    /* HEADER V2 */
+    .tcc-header {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        margin-bottom: 30px;
+        padding: 0 10px;
+    }
+    
+    .header-logo {
+        height: 100px; /* Slightly smaller to fit better */
+        width: auto;
+        object-fit: contain;
+    }
+    
+    .header-title-box {
+        background-color: #0d3b2a;
+        color: white;
+        padding: 10px 30px; /* Reduced padding */
+        border-radius: 12px;
+        font-size: 38px; /* Reduced font size to fit one line */
+        font-weight: 800;
+        text-transform: uppercase;
+        border: 2px solid white;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+        flex-grow: 1; /* Allow to grow */
+        margin: 0 15px;
+        text-align: center;
+        box-shadow: 0 4px 10px rgba(0,0,0,0.4);
+        white-space: nowrap; /* Force single line */
+        overflow: hidden;
+        text-overflow: ellipsis;
+    }
+
+    /* GRID LAYOUT */
+    .grid-container {
+        display: flex;
+        gap: 30px;
+        align-items: flex-start;
+    }
+    
+    .col-left, .col-right {
+        flex: 1;
+        display: flex;
+        flex-direction: column;
+        gap: 20px;
+    }
+    
+    /* POSITION TITLE V2 */
+    .position-group {
+        width: 100%;
+        margin-bottom: 0;
+        text-align: center; /* Centers the inline-block title */
+    }
+
+    .pos-title-bar {
+        background-color: #ffffff;
+        color: #0d3b2a;
+        padding: 6px 30px; /* Wider padding */
+        border-radius: 8px;
+        font-size: 32px;
+        font-weight: 800;
+        text-transform: uppercase;
+        border: 2px solid #0d3b2a;
+        display: inline-block;
+        margin-bottom: 12px;
+        box-shadow: 0 4px 10px rgba(0,0,0,0.15);
+    }
+    
+    /* PLAYER CARD COMPACT */
+    .player-card {
+        background-color: #0d3b2a;
+        border: 2px solid #1E7C5C;
+        border-radius: 16px;
+        padding: 12px 18px;
+        margin-bottom: 12px;
+        box-shadow: 0 3px 6px rgba(0,0,0,0.3);
+        color: white;
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        text-align: left; /* Reset text align from parent */
+    }
+    
+    .card-left {
+        display: flex;
+        align-items: center;
+        gap: 12px;
+    }
+    
+    .team-circle {
+        width: 68px; /* Slightly larger default */
+        height: 68px;
+        background: white;
+        border-radius: 50%;
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        border: 3px solid white;
+        box-shadow: 0 6px 12px rgba(0,0,0,0.6);
+        flex-shrink: 0;
+    }
+    
+    .team-circle.sm {
+        width: 60px; /* Smaller for specific teams */
+        height: 60px;
+    }
+    
+    .team-logo {
+        width: 96%; /* Increase size to reduce white padding */
+        height: 96%;
+        object-fit: contain;
+        filter: drop-shadow(0px 2px 2px rgba(0,0,0,0.2));
+    }
+
+    .p-name {
+        font-size: 24px;
+        font-weight: 800;
+        text-transform: uppercase;
+        /* allow wrapping */
+        display: block; 
+        line-height: 1.1;
+        text-shadow: 1px 1px 2px rgba(0,0,0,0.5);
+    }
+    
+    .name-text {
+        margin-right: 6px;
+        vertical-align: middle;
+    }
+    
+    /* ICONS */
+    .icon-badge {
+        display: inline-flex;
+        align-items: center;
+        justify-content: center;
+        border-radius: 50%;
+        color: white;
+        font-weight: bold;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.4);
+        margin: 2px 3px; 
+        vertical-align: middle;
+        position: relative;
+        top: -1px; /* Visual tweak for alignment */
+    }
+    
+    .icon-star {
+        color: #f1c40f; 
+        font-size: 26px; /* Slightly larger */
+        background-color: transparent !important; /* Force Clear */
+        box-shadow: none !important; /* Force Clear */
+        filter: drop-shadow(0px 1px 1px rgba(0,0,0,0.5));
+    }
+    
+    .icon-c {
+        width: 24px; 
+        height: 24px;
+        background-color: #2ecc71; 
+        font-size: 16px;
+        border: 2px solid white;
+    }
+    
+    .icon-rl {
+        width: 24px; 
+        height: 24px;
+        background-color: #e67e22; 
+        font-size: 12px;
+        border: 2px solid white;
+    }
+    
+    /* STATS & COLORS */
+    .stats-row {
+        display: flex;
+        gap: 12px; /* Close gap between stats */
+        align-items: flex-start; /* Align top */
+    }
+    
+    .stat-box {
+        text-align: center;
+        min-width: 55px;
+        display: flex;
+        flex-direction: column;
+        justify-content: flex-start; /* Top align */
+        height: 100%;
+    }
+    
+    .stat-label {
+        font-size: 14px; /* Default larger */
+        color: #ffffff;
+        font-weight: 800;
+        margin-bottom: 8px;
+        letter-spacing: 0.5px;
+        text-shadow: 0 1px 2px rgba(0,0,0,0.5);
+        align-self: center;
+        text-transform: uppercase;
+    }
+    
+    .lbl-price { font-size: 15px; } /* Slightly larger for C$ */
+    
+    .stat-value {
+        font-size: 22px;
+        font-weight: 800;
+        text-shadow: 1px 1px 2px rgba(0,0,0,0.5);
+        line-height: 1;
+        margin-top: auto; 
+        padding-top: 8px; /* Pushes value down to align with Conf Circle */
+    }
+    
+    .conf-circle {
+        width: 32px;
+        height: 32px;
+        border-radius: 50%;
+        color: #0d3b2a;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        font-weight: 900;
+        font-size: 18px;
+        margin: 0 auto;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.3);
+        border: 2px solid rgba(255,255,255,0.2);
+    }
+    
+    /* CONFIDENCE COLORS */
+    .bg-conf-a { background-color: #2ecc71; } /* Strong Green */
+    .bg-conf-b { background-color: #cddc39; } /* Lime/Green Yellow */
+    .bg-conf-c { background-color: #f1c40f; } /* Yellow */
+    .bg-conf-d { background-color: #e74c3c; } /* Red */
+    
+    .val-green { color: #2ecc71; }
+    .val-red { color: #ff5252; }
+    .val-white { color: #ffffff; }
+
+    /* FOOTER V3 - Duas linhas */
+    .tcc-footer {
+        background-color: #0d3b2a;
+        margin-top: auto; /* EMPURRA pro fundo da arte */
+        margin-left: -40px; /* Compensa o padding do container */
+        margin-right: -40px;
+        padding: 0;
+        display: flex;
+        align-items: center;
+        border-top: 3px solid #a3e635;
+        font-size: 16px;
+        font-weight: 700;
+        color: white;
+        border-radius: 0;
+        box-shadow: 0 -2px 10px rgba(0,0,0,0.2);
+        min-height: 90px;
+    }
+    
+    .footer-left {
+        flex: 0 0 auto;
+        display: flex;
+        align-items: center;
+        padding: 10px 20px;
+    }
+    
+    .footer-center {
+        flex: 1;
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: center;
+        padding: 10px 0;
+        gap: 6px;
+    }
+    
+    .footer-right {
+        flex: 0 0 auto;
+        display: flex;
+        align-items: center;
+        padding: 10px 20px;
+    }
+    
+    .footer-logo-img {
+        height: 60px;
+        width: auto;
+    }
+    
+    .footer-exclusive-text {
+        font-size: 14px;
+        font-weight: 700;
+        letter-spacing: 1px;
+        color: #ffffff;
+        text-transform: uppercase;
+    }
+    
+    .legend-box {
+        display: flex;
+        gap: 25px;
+        font-size: 14px;
+        align-items: center;
+        font-weight: 600;
+    }
+    """)
+
+POS_BLOCK_HEAD = Template("""
+            <div class="position-group">
+                <div class="pos-title-bar">{{ pos_key }}</div>
+            """)
+
+PLAYER_CARD = Template("""
+                <div class="player-card">
+                    <div class="card-left">
+                        <div class="{{ team_circle_class }}">
+                            {{ team_img }}
+                        </div>
+                        <div class="p-name"><span class="name-text">{{ name }}</span>{{ icons }}</div>
+                    </div>
+                        
+                    <div class="stats-row">
+                        <div class="stat-box">
+                            <div class="stat-label lbl-price">C$</div>
+                            <div class="stat-value">{{ price }}</div>
+                        </div>
+                        <div class="stat-box">
+                            <div class="stat-label">MPV</div>
+                            <div class="stat-value {{ val_class }}">{{ mpv }}</div>
+                        </div>
+                        <div class="stat-box">
+                            <div class="stat-label">CONF</div>
+                            <div class="conf-circle {{ conf_class }}" style="box-shadow: 0 4px 8px rgba(0,0,0,0.5);">{{ conf }}</div>
+                        </div>
+                    </div>
+                </div>
+                """)
+
+PAGE = Template("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <style>
+                {{ css }}
+                /* FORÇAR body a ter largura mínima para evitar corte */
+                html, body {
+                    margin: 0;
+                    padding: 0;
+                    min-width: 1200px;
+                    width: 1200px;
+                    overflow-x: hidden;
+                }
+            </style>
+        </head>
+        <body>
+    <div id="ui-controls" style="position:fixed; top:10px; right:10px; z-index:9999; display:flex; flex-direction:column; gap:8px; align-items:flex-end;">
+        <div style="background:rgba(13, 59, 42, 0.9); padding:8px 12px; border-radius:8px; border:1px solid #a3e635; display:flex; flex-direction:column; gap:4px; box-shadow:0 4px 6px rgba(0,0,0,0.3);">
+            <div style="display:flex; align-items:center; gap:10px;">
+                <span style="color:white; font-weight:bold; font-family:sans-serif; font-size:14px;">Qualidade:</span>
+                <select id="resSelect" style="padding:5px; border-radius:4px; border:none; font-weight:bold; cursor:pointer;">
+                    {{ res_options }}
+                </select>
+            </div>
+            <div style="color:#a3e635; font-family:sans-serif; font-size:11px; max-width:200px; line-height:1.2;">
+                * 6.0x é a qualidade "600 DPI" antiga. Só use se seu PC aguentar!
+            </div>
+        </div>
+        <button onclick="window.downloadHighRes()" style="padding:12px 24px; background-color:#0d3b2a; color:white; border:2px solid #a3e635; border-radius:8px; cursor:pointer; font-weight:bold; font-size:16px; box-shadow:0 4px 10px rgba(0,0,0,0.3); transition:all 0.2s; display:flex; align-items:center; gap:8px;">
+            ⬇️ BAIXAR PNG
+        </button>
+    </div>
+            <div class="report-container" id="capture">
+                <!-- HEADER V2 -->
+                <div class="tcc-header">
+                    <img src="data:image/png;base64,{{ logo_header }}" class="header-logo">
+                    <div class="header-title-box">DICAS POR POSIÇÃO &ndash; TCC &ndash; RODADA {{ rodada }}</div>
+                    <img src="data:image/png;base64,{{ logo_header }}" class="header-logo">
+                </div>
+                
+                <!-- BODY -->
+                <div class="grid-container">
+                    <div class="col-left">{{ html_left }}</div>
+                    <div class="col-right">{{ html_right }}</div>
+                </div>
+                
+                <!-- FOOTER V3 -->
+                <div class="tcc-footer">
+                    <div class="footer-left">
+                         <img src="data:image/png;base64,{{ logo_footer }}" class="footer-logo-img">
+                    </div>
+                    <div class="footer-center">
+                        <div class="legend-box">
+                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge icon-rl">RL</span> Luxo</span>
+                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge icon-star" style="background:transparent; color:#f1c40f; box-shadow:none;">★</span> Unanimidade</span>
+                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge icon-c">C</span> Bom Capitão</span>
+                            <span style="display:flex; align-items:center; gap:5px;"><span class="icon-badge bg-conf-a" style="width:15px;height:15px;"></span> Nível de Confiança</span>
+                        </div>
+                        <div class="footer-exclusive-text">MATERIAL EXCLUSIVO &ndash; TREINANDO CAMPEÕES DE CARTOLA</div>
+                    </div>
+                    <div class="footer-right">
+                        <img src="data:image/png;base64,{{ logo_footer }}" class="footer-logo-img">
+                    </div>
+                </div>
+            </div>
+
+            <!-- SCRIPTS LOADED AT END OF BODY -->
+            <script src="https://cdnjs.cloudflare.com/ajax/libs/html-to-image/1.11.11/html-to-image.min.js"></script>
+            <script>
+                window.downloadHighRes = function() {
+                    var node = document.getElementById('capture');
+                    var uiControls = document.getElementById('ui-controls');
+                    var btn = document.querySelector('button[onclick="window.downloadHighRes()"');
+                    
+                    // 1. ESCONDER CONTROLES durante captura
+                    uiControls.style.display = 'none';
+                    
+                    // 2. Feedback visual
+                    document.body.style.cursor = 'wait';
+                    
+                    // 3. GET USER SELECTION
+                    var sel = document.getElementById('resSelect');
+                    var targetScale = parseFloat(sel.value);
+                    
+                    // 4. FORÇAR largura exata do container
+                    var CONTAINER_WIDTH = 1200;
+                    
+                    // 5. Medir altura REAL do conteúdo (sem min-height)
+                    var originalMinHeight = node.style.minHeight;
+                    node.style.minHeight = '0';
+                    
+                    // Forçar reflow
+                    void node.offsetHeight;
+                    
+                    var realHeight = node.scrollHeight;
+                    
+                    // Restaurar min-height
+                    node.style.minHeight = originalMinHeight;
+                    
+                    console.log('Capture: ' + CONTAINER_WIDTH + 'x' + realHeight + ' at ' + targetScale + 'x');
+                    
+                    // 6. Cap scale para limites do browser
+                    var MAX_PIXELS = 30000;
+                    if (realHeight * targetScale > MAX_PIXELS) {
+                        var safeScale = MAX_PIXELS / realHeight;
+                        if (safeScale < targetScale) {
+                            targetScale = safeScale;
+                            alert('⚠️ Escala ajustada para ' + targetScale.toFixed(2) + 'x (limite do navegador).');
+                        }
+                    }
+                    
+                    // 7. CAPTURAR com html-to-image
+                    htmlToImage.toBlob(node, {
+                        backgroundColor: null,
+                        width: CONTAINER_WIDTH,
+                        height: realHeight,
+                        pixelRatio: targetScale,
+                        style: {
+                            transform: 'none',
+                            visibility: 'visible',
+                            maxHeight: 'none',
+                            maxWidth: 'none',
+                            overflow: 'visible',
+                            width: CONTAINER_WIDTH + 'px',
+                            height: 'auto',
+                            minHeight: '0',
+                            margin: '0',
+                            padding: '40px',
+                            paddingBottom: '0'
+                        }
+                    })
+                    .then(function(blob) {
+                        // RESTAURAR controles
+                        uiControls.style.display = 'flex';
+                        document.body.style.cursor = 'default';
+                        
+                        if (!blob) {
+                            throw new Error('Blob vazio gerado.');
+                        }
+                        
+                        var url = URL.createObjectURL(blob);
+                        var link = document.createElement('a');
+                        link.download = 'Dicas_Rodada_TCC_' + targetScale.toFixed(1) + 'x.png';
+                        link.href = url;
+                        link.click();
+                        
+                        setTimeout(function() { URL.revokeObjectURL(url); }, 100);
+                        
+                        // Feedback de sucesso
+                        if (btn) {
+                            var originalText = btn.innerHTML;
+                            btn.innerHTML = '✅ SUCESSO!';
+                            setTimeout(function() { btn.innerHTML = originalText; }, 2000);
+                        }
+                    })
+                    .catch(function(error) {
+                        // RESTAURAR controles mesmo em erro
+                        uiControls.style.display = 'flex';
+                        document.body.style.cursor = 'default';
+                        
+                        console.error('Capture failed:', error);
+                        alert('❌ ERRO ao gerar imagem ' + targetScale + 'x.\\n\\nTente uma qualidade menor.');
+                    });
+                };
+            </script>
+        </body>
+        </html>
+        """)
+
+def render_css(bundle):
+    """
+    CSS do board (fontes e background embutidos) para o bundle de assets.
+    """
+    return CSS.render(
+        font_mime=bundle.font_mime,
+        font_format=bundle.font_format,
+        font_800=bundle.fonts[800],
+        font_700=bundle.fonts[700],
+        font_500=bundle.fonts[500],
+        background=bundle.background,
+    )
+
+def player_from_dict(d):
+    """
+    Jogador no formato do editor (st.session_state['players']) a partir de um
+    dict externo (JSON/YAML), com os mesmos defaults do formulário.
+    """
+    badges = d.get('badges') or {}
+    return {
+        "name": str(d.get('name', '')).strip(),
+        "team": d.get('team', ''),
+        "price": float(d.get('price', 0.0)),
+        "mpv": float(d.get('mpv', 0.0)),
+        "conf": d.get('conf', 'A'),
+        "badges": {
+            "unanimidade": bool(badges.get('unanimidade', False)),
+            "bom_capitao": bool(badges.get('bom_capitao', False)),
+            "reserva_luxo": bool(badges.get('reserva_luxo', False))
+        }
+    }
+
+def player_sort_key(p):
+    """
+    Ordem dos cards: Unanimidade, Bom Capitão, Confiança (A < B < ...), Nome.
+    """
+    # not True < not False: quem tem o badge vem primeiro
+    return (
+        not p['badges']['unanimidade'],
+        not p['badges']['bom_capitao'],
+        p['conf'],
+        p['name']
+    )
+
+def mpv_class(pos_key, mpv):
+    """
+    Cor do MPV: verde se barato de valorizar, vermelho acima de 6.
+    """
+    limite_verde = 2.00 if pos_key == 'Técnicos' else 3.00
+    if mpv <= limite_verde:
+        return "val-green"
+    if mpv > 6.00:
+        return "val-red"
+    return "val-white"
+
+def _card_values(p, pos_key, bundle):
+    t_logo = bundle.team_logo(p['team'])
+    mpv = float(p.get('mpv', 0.0))
+
+    icons = []
+    if p['badges']['unanimidade']: icons.append('<span class="icon-badge icon-star">★</span>')
+    if p['badges']['reserva_luxo']: icons.append('<span class="icon-badge icon-rl">RL</span>')
+    if p['badges']['bom_capitao']: icons.append('<span class="icon-badge icon-c">C</span>')
+
+    return {
+        'team_circle_class': "team-circle sm" if p['team'] in TEAMS_CIRCLE_SM else "team-circle",
+        'team_img': f'<img src="data:image/png;base64,{t_logo}" class="team-logo"/>' if t_logo else '',
+        'name': p['name'],
+        'icons': "".join(icons),
+        'price': f"{p['price']:.1f}",
+        'val_class': mpv_class(pos_key, mpv),
+        'mpv': f"{mpv:.1f}",
+        'conf_class': CONF_CLASSES.get(p['conf'], "bg-conf-a"),
+        'conf': p['conf'],
+    }
+
+def render_pos_block_into(saida, pos_key, players, bundle):
+    """
+    Acrescenta em `saida` o bloco da posição (título + cards ordenados).
+    Posição sem jogadores não gera nada.
+    """
+    if not players:
+        return
+    POS_BLOCK_HEAD.render_into(saida, {'pos_key': pos_key})
+    for p in sorted(players, key=player_sort_key):
+        PLAYER_CARD.render_into(saida, _card_values(p, pos_key, bundle))
+    saida.append("</div>")
+
+def render_pos_block(pos_key, players, bundle):
+    saida = []
+    render_pos_block_into(saida, pos_key, players, bundle)
+    return "".join(saida)
+
+def players_key(players):
+    """
+    Hash do conteúdo da lista de jogadores (independe da ordem de inserção,
+    já que o bloco ordena os cards).
+    """
+    ordenados = sorted(players, key=player_sort_key)
+    texto = json.dumps(ordenados, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+class _BlockCache:
+    """
+    LRU em memória dos blocos de posição, limitado pelo tamanho total e
+    registrado no namespace NS_BOARD (um dict direto: o st.cache_resource
+    custa ~1ms por consulta só para montar a chave, mais que renderizar o bloco).
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._blocos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            bloco = self._blocos.get(chave)
+            if bloco is not None:
+                self._blocos.move_to_end(chave)
+        cache_namespaces.record(cache_namespaces.NS_BOARD, bloco is not None)
+        return bloco
+
+    def put(self, chave, bloco):
+        if len(bloco) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._blocos.pop(chave, None)
+            if anterior is not None:
+                self.nbytes -= len(anterior)
+            self._blocos[chave] = bloco
+            self.nbytes += len(bloco)
+            while self.nbytes > self.max_bytes:
+                _, removido = self._blocos.popitem(last=False)
+                self.nbytes -= len(removido)
+
+    def clear(self):
+        with self._lock:
+            self._blocos.clear()
+            self.nbytes = 0
+
+_block_cache = _BlockCache(BLOCK_CACHE_MAX_MB * 1024 * 1024)
+cache_namespaces.register(cache_namespaces.NS_BOARD, _block_cache)
+
+def cached_pos_block(pos_key, players, bundle, escala=None):
+    """
+    Bloco da posição vindo do cache quando a lista de jogadores não mudou.
+    `bundle` deve ser o de asset_bundle.get_asset_bundle(escala); a versão
+    dele entra na chave, então logos/fontes novos não reaproveitam blocos velhos.
+    """
+    if not players:
+        return ""
+    chave = (pos_key, players_key(players), escala, bundle.versao)
+    bloco = _block_cache.get(chave)
+    if bloco is None:
+        bloco = render_pos_block(pos_key, players, bundle)
+        _block_cache.put(chave, bloco)
+    return bloco
+
+def block_cache_stats():
+    """
+    Hits/misses e tamanho total (nbytes) do cache de blocos de posição.
+    """
+    stats = cache_namespaces.cache_stats().get(cache_namespaces.NS_BOARD, {'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+    return {**stats, 'nbytes': _block_cache.nbytes}
+
+def res_options_html(escala_max=None):
+    """
+    <option>s do resSelect: escalas até `escala_max` (todas se None).
+    """
+    return "".join(
+        f'<option value="{e:.1f}"{" selected" if e == escala_max else ""}>{rotulo}</option>'
+        for e, rotulo in EXPORT_OPTIONS if escala_max is None or e <= escala_max
+    )
+
+def render_board(players, rodada, escala=None, bundle=None, css=None, use_cache=True):
+    """
+    HTML completo do board.
+    `players` tem o formato de st.session_state['players'] ({posição: [jogador, ...]}).
+    `escala` escolhe os derivados dos assets e limita as opções do resSelect;
+    `bundle`/`css` podem ser passados para reaproveitar o que já está em cache
+    (com `use_cache`, `bundle` deve ser o da `escala`).
+    """
+    if bundle is None:
+        bundle = asset_bundle.get_asset_bundle(escala)
+    if css is None:
+        css = render_css(bundle)
+
+    colunas = []
+    for grupos in (GROUPS_LEFT, GROUPS_RIGHT):
+        if use_cache:
+            colunas.append("".join(cached_pos_block(pos, players.get(pos, []), bundle, escala) for pos in grupos))
+            continue
+        saida = []
+        for pos in grupos:
+            render_pos_block_into(saida, pos, players.get(pos, []), bundle)
+        colunas.append("".join(saida))
+
+    return PAGE.render(
+        css=css,
+        res_options=res_options_html(escala),
+        logo_header=bundle.logo_header,
+        rodada=rodada,
+        html_left=colunas[0],
+        html_right=colunas[1],
+        logo_footer=bundle.logo_footer,
+    )
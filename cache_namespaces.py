@@ -0,0 +1,127 @@
+"""
+Namespaces para o cache do Streamlit.
+
+Cada função em cache é registrada em um namespace ('mercado', 'gato_mestre',
+'assets', ...). Assim um refresh do mercado invalida só o que é do mercado,
+em vez de st.cache_data.clear() derrubar o cache de todo o processo
+(fontes, background e logos de todos os usuários conectados).
+Mantém também contadores de hit/miss por namespace.
+
+O mercado e o Gato Mestre não passam pelo st.cache: utils.refresh_mercado
+revalida o mercado na API a cada clique (GET condicional contra o snapshot em
+disco), então não há o que invalidar no refresh; ele só registra os acessos
+aqui com record()/count().
+"""
+import functools
+import threading
+
+import streamlit as st
+
+NS_MERCADO = "mercado"
+NS_GATO_MESTRE = "gato_mestre"
+NS_ASSETS = "assets"
+NS_ARQUIVOS = "arquivos"
+NS_BOARD = "board"
+NS_EXPORT = "export"
+
+_funcoes = {}  # namespace -> {chave: função em cache}
+_stats = {}    # namespace -> {'chamadas': n, 'misses': n}
+_lock = threading.Lock()
+
+def _contar(namespace, campo):
+    with _lock:
+        stats = _stats.setdefault(namespace, {'chamadas': 0, 'misses': 0})
+        stats[campo] = stats.get(campo, 0) + 1
+
+def _registrar(namespace, cache):
+    # Script do Streamlit roda de novo a cada rerun e redecora as funções dele:
+    # a mesma função (módulo + nome) substitui o registro anterior em vez de acumular
+    nome = getattr(cache, '__qualname__', None)
+    chave = (getattr(cache, '__module__', None), nome) if nome else id(cache)
+    with _lock:
+        _funcoes.setdefault(namespace, {})[chave] = cache
+
+def cached(namespace, resource=False, **cache_kwargs):
+    """
+    Decorator equivalente a st.cache_data (ou st.cache_resource com resource=True)
+    que registra a função no namespace e conta hits/misses.
+    """
+    cache_st = st.cache_resource if resource else st.cache_data
+
+    def decorator(func):
+        @functools.wraps(func)
+        def computar(*args, **kwargs):
+            # Só executa quando o Streamlit não achou o valor em cache
+            _contar(namespace, 'misses')
+            return func(*args, **kwargs)
+
+        em_cache = cache_st(**cache_kwargs)(computar)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _contar(namespace, 'chamadas')
+            return em_cache(*args, **kwargs)
+
+        wrapper.clear = em_cache.clear
+        _registrar(namespace, wrapper)
+        return wrapper
+
+    return decorator
+
+def register(namespace, cache):
+    """
+    Registra no namespace um cache próprio (fora do st.cache_*), que precisa
+    ter .clear(); invalidate() passa a limpá-lo junto.
+    """
+    _registrar(namespace, cache)
+
+def record(namespace, hit):
+    """
+    Conta um acesso de um cache próprio nas estatísticas do namespace.
+    """
+    _contar(namespace, 'chamadas')
+    if not hit:
+        _contar(namespace, 'misses')
+
+def count(namespace, evento):
+    """
+    Conta um evento que não é hit nem miss (ex.: 'offline'); aparece à parte
+    no cache_stats() do namespace.
+    """
+    if evento in ('chamadas', 'misses', 'hits', 'hit_rate'):
+        raise ValueError(f"Evento reservado: {evento}")
+    _contar(namespace, evento)
+
+def invalidate(namespace, *args, **kwargs):
+    """
+    Limpa o cache das funções do namespace.
+    Com argumentos, limpa só a entrada correspondente a eles (ex.: o token atual).
+    """
+    with _lock:
+        funcoes = list(_funcoes.get(namespace, {}).values())
+    for func in funcoes:
+        if args or kwargs:
+            try:
+                func.clear(*args, **kwargs)
+                continue
+            except TypeError:
+                pass  # Streamlit antigo: clear() não aceita argumentos
+        func.clear()
+
+def cache_stats():
+    """
+    Contadores por namespace: {namespace: {'hits', 'misses', 'hit_rate'}},
+    mais um campo por evento registrado com count().
+    """
+    with _lock:
+        snapshot = {ns: dict(v) for ns, v in _stats.items()}
+    resultado = {}
+    for ns, v in sorted(snapshot.items()):
+        hits = max(0, v['chamadas'] - v['misses'])
+        resultado[ns] = {
+            'hits': hits,
+            'misses': v['misses'],
+            'hit_rate': hits / v['chamadas'] if v['chamadas'] else 0.0
+        }
+        resultado[ns].update({k: n for k, n in v.items() if k not in ('chamadas', 'misses')})
+    return resultado
@@ -6,7 +6,7 @@ import requests
 # Fetch market data
 print("Fetching market data to identify missing teams...")
 try:
-    data = utils.fetch_mercado_data()
+    data, _ = utils.fetch_mercado_snapshot()
     
     missing_teams = {}
     
@@ -1,13 +1,13 @@
 
 import utils
-import requests
+import http_client
 import json
 
 def fetch_market():
     url = "https://api.cartola.globo.com/atletas/mercado"
     headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        resp = requests.get(url, headers=headers)
+        resp = http_client.get(url, headers=headers)
         if resp.status_code == 200:
             return resp.json().get('atletas', [])
     except:
@@ -0,0 +1,197 @@
+"""
+Exportação em lote da arte "DICAS POR POSIÇÃO" sem o Streamlit.
+
+Lê a descrição dos boards em JSON (ou YAML, se o PyYAML estiver instalado),
+renderiza o HTML com o CSS do board e exporta os PNGs de todos os boards
+numa única instância do Chromium (render_worker), com as escalas de cada
+board capturadas em paralelo. Com --backend pillow, os PNGs são desenhados
+direto pelo board_raster, sem browser. Boards já exportados (mesmo conteúdo,
+escala e assets) saem do export_cache sem renderizar de novo (--no-cache desliga).
+
+Formatos aceitos:
+    {"Goleiros": [...], "Meias": [...], ...}              # um board (mesmo formato de st.session_state['players'])
+    {"boards": [{"players": {...}, "rodada": 12, "scales": [3.0, 4.0], "nome": "..."}, ...]}
+    [{"players": {...}, "rodada": 12}, ...]
+
+Uso: python export_boards.py boards.json [--rodada 12] [--scale 3.0 ...] [--saida exports] [--html]
+                             [--max-parallel N] [--backend playwright|pillow] [--no-cache]
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import board_raster
+import cache_namespaces
+import board_render
+import export_cache
+import render_worker
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+POSICOES = board_render.GROUPS_LEFT + board_render.GROUPS_RIGHT
+
+def load_spec(caminho):
+    """
+    Lê o arquivo de descrição (JSON ou YAML pela extensão).
+    """
+    with open(caminho, "r", encoding="utf-8") as f:
+        if caminho.lower().endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError("PyYAML não está instalado; use JSON ou pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def _slug(texto):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", str(texto)).strip("_") or "board"
+
+def parse_boards(spec, rodada=None, scales=None):
+    """
+    Normaliza a descrição em uma lista de boards:
+    [{'nome', 'rodada', 'scales', 'players'}].
+    `rodada`/`scales` valem para os boards que não definem os seus.
+    """
+    if isinstance(spec, dict) and 'boards' in spec:
+        itens = spec['boards']
+    elif isinstance(spec, dict):
+        itens = [{'players': spec}]
+    else:
+        itens = spec
+
+    boards = []
+    for i, item in enumerate(itens, 1):
+        players = item.get('players', {})
+        desconhecidas = set(players) - set(POSICOES)
+        if desconhecidas:
+            raise ValueError(f"board {i}: posições desconhecidas {sorted(desconhecidas)}")
+        rodada_board = item.get('rodada', rodada)
+        if rodada_board is None:
+            raise ValueError(f"board {i}: informe a rodada (no arquivo ou com --rodada)")
+        boards.append({
+            'nome': _slug(item.get('nome', f"Dicas_Rodada_{rodada_board}_{i}")),
+            'rodada': int(rodada_board),
+            'scales': [float(s) for s in item.get('scales', scales or [board_render.EXPORT_OPTIONS[0][0]])],
+            'players': {pos: [board_render.player_from_dict(p) for p in players.get(pos, [])] for pos in POSICOES},
+        })
+    return boards
+
+BACKENDS = ("playwright", "pillow")
+
+def _gravar(caminho, dados):
+    with open(caminho, "wb") as f:
+        f.write(dados)
+
+def export_boards(boards, saida, salvar_html=False, worker=None, max_parallel=None, backend="playwright",
+                  use_cache=True):
+    """
+    Renderiza e exporta todos os boards.
+    playwright: tudo no mesmo worker; cada board é renderizado uma vez (assets
+    na maior escala pedida) e as escalas são capturadas em paralelo, um
+    contexto por device_scale_factor.
+    pillow: cada escala é desenhada pelo board_raster, sem browser.
+    Com use_cache, PNG/HTML já exportados (mesmo conteúdo, escala e assets)
+    são copiados do export_cache e só as escalas que faltam são geradas.
+    Retorna a lista de (png, escala, segundos da captura).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend desconhecido: {backend} (opções: {', '.join(BACKENDS)})")
+    os.makedirs(saida, exist_ok=True)
+    versao = export_cache.asset_version() if use_cache else None
+
+    jobs = []
+    resultados = []
+    for board in boards:
+        base = os.path.join(saida, board['nome'])
+        saidas = {e: f"{base}_{e:.1f}x.png" for e in board['scales']}
+        chaves = {}
+        faltando = []
+        # O playwright captura todas as escalas do mesmo HTML, montado na maior
+        escala_html = max(board['scales'])
+        for escala in board['scales']:
+            t0 = time.perf_counter()
+            png = None
+            if use_cache:
+                chaves[escala] = export_cache.export_key(board['players'], board['rodada'], escala, backend, versao,
+                                                         escala_html if backend == "playwright" else None)
+                png = export_cache.get(chaves[escala], "png")
+            if png is None:
+                faltando.append(escala)
+                continue
+            _gravar(saidas[escala], png)
+            resultados.append((saidas[escala], escala, time.perf_counter() - t0))
+
+        html = None
+        if salvar_html or (backend == "playwright" and faltando):
+            def gerar_html(b=board):
+                return board_render.render_board(b['players'], b['rodada'], escala=escala_html)
+            if use_cache:
+                html = export_cache.cached_export(board['players'], board['rodada'], escala_html, "html", "html",
+                                                  gerar_html).decode("utf-8")
+            else:
+                html = gerar_html()
+        if salvar_html:
+            with open(base + ".html", "w", encoding="utf-8") as f:
+                f.write(html)
+        if not faltando:
+            continue
+        if backend == "pillow":
+            for escala in faltando:
+                t0 = time.perf_counter()
+                png = board_raster.render_board_png(board['players'], board['rodada'], escala, saidas[escala])
+                if use_cache:
+                    export_cache.put(chaves[escala], "png", png)
+                resultados.append((saidas[escala], escala, time.perf_counter() - t0))
+            continue
+        worker = worker or render_worker.get_worker()
+        jobs.append((saidas, chaves, worker.submit_scales(faltando, html=html, output_paths=saidas,
+                                                          max_parallel=max_parallel)))
+
+    for saidas, chaves, futuro in jobs:
+        for escala, r in sorted(futuro.result().items()):
+            if escala in chaves:
+                png = r['png']
+                if png is None:
+                    # Captura em tiles grava direto no arquivo
+                    with open(saidas[escala], "rb") as f:
+                        png = f.read()
+                export_cache.put(chaves[escala], "png", png)
+            resultados.append((saidas[escala], escala, r['segundos']))
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta boards DICAS POR POSIÇÃO em lote (sem Streamlit)")
+    parser.add_argument("arquivo", help="JSON/YAML com as listas de jogadores")
+    parser.add_argument("--rodada", type=int, help="Rodada padrão dos boards")
+    parser.add_argument("--scale", type=float, nargs="+", dest="scales", help="Escalas padrão (ex.: 3.0 4.0)")
+    parser.add_argument("--saida", default="exports", help="Diretório de saída")
+    parser.add_argument("--html", action="store_true", help="Grava também o HTML de cada board")
+    parser.add_argument("--max-parallel", type=int, default=None,
+                        help="Máximo de escalas rasterizando juntas por board (6x pesa na RAM)")
+    parser.add_argument("--backend", choices=BACKENDS, default="playwright",
+                        help="playwright (Chromium) ou pillow (desenho nativo, sem browser)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignora o cache de exportação em disco")
+    args = parser.parse_args()
+
+    boards = parse_boards(load_spec(args.arquivo), args.rodada, args.scales)
+    with render_worker.PeakMemory() as memoria:
+        t0 = time.perf_counter()
+        resultados = export_boards(boards, args.saida, salvar_html=args.html, max_parallel=args.max_parallel,
+                                   backend=args.backend, use_cache=not args.no_cache)
+        total = time.perf_counter() - t0
+
+    for png, escala, t in resultados:
+        print(f"{escala:.1f}x {png} ({t:.2f}s)")
+    pico = f"{memoria.pico / 1024 / 1024:.0f} MB" if memoria.pico is not None else "n/d"
+    print(f"{len(boards)} boards, {len(resultados)} PNGs em {total:.1f}s "
+          f"({len(boards) / total * 60:.1f} boards/min, {len(resultados) / total * 60:.1f} PNGs/min) "
+          f"| pico de memória {pico}")
+    stats = cache_namespaces.cache_stats().get(cache_namespaces.NS_EXPORT)
+    if stats:
+        print(f"cache de exportação: {stats['hits']} hits / {stats['misses']} misses")
+
+if __name__ == "__main__":
+    main()
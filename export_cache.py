@@ -0,0 +1,150 @@
+"""
+Cache em disco dos resultados de exportação (PNG/HTML), endereçado pelo conteúdo.
+
+A chave é o hash das listas de jogadores normalizadas (por posição, na ordem
+do board), da rodada, da escala, do backend, da escala do HTML capturado (no
+playwright) e da versão dos assets/código do board. Exportar de novo o mesmo board (refresh do preview, outro usuário no
+mesmo deploy, lote repetido) devolve o arquivo salvo sem montar HTML nem abrir
+o browser. A remoção é LRU por tamanho total (mtime atualizado a cada hit),
+e os hits/misses aparecem no namespace NS_EXPORT do cache_namespaces.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import board_render
+import cache_namespaces
+import utils
+
+EXPORT_CACHE_DIR = os.path.join(utils.CACHE_DIR, "exports")
+EXPORT_CACHE_MAX_MB = 1024
+EXPORT_CACHE_MAX_AGE_DAYS = 30
+EXPORT_CACHE_VERSION = 1
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Tudo que muda o resultado sem mudar os jogadores: assets e o código que desenha
+ASSET_DIRS = [os.path.join(BASE_DIR, "assets", d) for d in ("fonts", "logos", "teams")]
+SOURCE_FILES = [os.path.join(BASE_DIR, f) for f in
+                ("board_render.py", "board_raster.py", "asset_bundle.py", "asset_build.py", "render_worker.py",
+                 "utils.py")]   # utils: busca dos escudos e LOGO_ALIASES
+
+_lock = threading.Lock()
+
+def asset_version():
+    """
+    Hash do (caminho, tamanho, mtime) dos assets e dos módulos de renderização.
+    Só stat, sem ler os arquivos: custa bem menos que um render.
+    """
+    h = hashlib.sha1()
+    arquivos = list(SOURCE_FILES)
+    for diretorio in ASSET_DIRS:
+        if os.path.isdir(diretorio):
+            arquivos += [os.path.join(diretorio, n) for n in sorted(os.listdir(diretorio))]
+    for caminho in arquivos:
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            continue
+        h.update(f"{os.path.relpath(caminho, BASE_DIR)}:{info.st_size}:{info.st_mtime_ns};".encode("utf-8"))
+    return h.hexdigest()
+
+def export_key(players, rodada, escala, backend, versao=None, escala_html=None):
+    """
+    Chave do resultado: jogadores de cada posição (players_key já ignora a
+    ordem de inserção), rodada, escala, backend e versão dos assets.
+    `escala_html` é a escala em que o HTML capturado foi montado (playwright):
+    o mesmo PNG 2x sai diferente de um HTML 2x ou 4x.
+    """
+    posicoes = board_render.GROUPS_LEFT + board_render.GROUPS_RIGHT
+    conteudo = {
+        'v': EXPORT_CACHE_VERSION,
+        'players': {pos: board_render.players_key(players.get(pos, [])) for pos in posicoes},
+        'rodada': int(rodada),
+        'escala': round(float(escala), 2),
+        'backend': backend,
+        'assets': versao or asset_version(),
+    }
+    if escala_html is not None:
+        conteudo['escala_html'] = round(float(escala_html), 2)
+    texto = json.dumps(conteudo, sort_keys=True)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+def _path(chave, ext):
+    return os.path.join(EXPORT_CACHE_DIR, f"{chave}.{ext}")
+
+def get(chave, ext):
+    """
+    Bytes do resultado em cache, ou None. Conta hit/miss no NS_EXPORT.
+    """
+    caminho = _path(chave, ext)
+    try:
+        with open(caminho, "rb") as f:
+            dados = f.read()
+        os.utime(caminho)  # Marca uso recente para a remoção LRU
+    except OSError:
+        dados = None
+    cache_namespaces.record(cache_namespaces.NS_EXPORT, dados is not None)
+    return dados
+
+def put(chave, ext, dados):
+    """
+    Grava o resultado (escrita atômica) e poda o diretório pelo tamanho total.
+    """
+    caminho = _path(chave, ext)
+    os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+    tmp = f"{caminho}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(dados)
+        os.replace(tmp, caminho)
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o cache de exportação ({e})")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return
+    with _lock:
+        utils.prune_cache_dir(EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_MB, EXPORT_CACHE_MAX_AGE_DAYS)
+
+def cached_export(players, rodada, escala, backend, ext, gerar):
+    """
+    Resultado do cache ou, num miss, de `gerar()` (bytes ou str), que é gravado.
+    Retorna sempre bytes.
+    """
+    chave = export_key(players, rodada, escala, backend)
+    dados = get(chave, ext)
+    if dados is None:
+        dados = gerar()
+        if isinstance(dados, str):
+            dados = dados.encode("utf-8")
+        put(chave, ext, dados)
+    return dados
+
+def disk_usage():
+    """
+    (arquivos, bytes) ocupados no diretório do cache.
+    """
+    if not os.path.isdir(EXPORT_CACHE_DIR):
+        return 0, 0
+    tamanhos = []
+    for nome in os.listdir(EXPORT_CACHE_DIR):
+        try:
+            tamanhos.append(os.path.getsize(os.path.join(EXPORT_CACHE_DIR, nome)))
+        except OSError:
+            pass
+    return len(tamanhos), sum(tamanhos)
+
+class _DiskCache:
+    """
+    Adaptador para cache_namespaces.invalidate(NS_EXPORT) apagar os arquivos.
+    """
+    def clear(self, *args, **kwargs):
+        if not os.path.isdir(EXPORT_CACHE_DIR):
+            return
+        for nome in os.listdir(EXPORT_CACHE_DIR):
+            try:
+                os.remove(os.path.join(EXPORT_CACHE_DIR, nome))
+            except OSError:
+                pass
+
+cache_namespaces.register(cache_namespaces.NS_EXPORT, _DiskCache())
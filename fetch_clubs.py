@@ -1,10 +1,10 @@
 
-import requests
+import http_client
 import json
 
 url = "https://api.cartola.globo.com/clubes"
 try:
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    response = http_client.get(url, headers={"User-Agent": "Mozilla/5.0"})
     if response.status_code == 200:
         data = response.json()
         print("--- Clubes Found ---")
@@ -0,0 +1,80 @@
+"""
+Cliente HTTP compartilhado para a API do Cartola.
+
+Uma única requests.Session por processo (keep-alive, pool de conexões),
+timeouts de conexão/leitura em toda chamada e retry limitado com backoff
+exponencial + jitter para falhas transitórias.
+"""
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) em segundos
+DEFAULT_TIMEOUT = (3.05, 15)
+DEFAULT_RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 4.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+POOL_SIZE = 10
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """
+    Retorna a Session compartilhada do processo, criando na primeira chamada.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+def reset_session():
+    """
+    Fecha a Session atual (a próxima chamada cria outra).
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+def _backoff(tentativa):
+    espera = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** tentativa))
+    return random.uniform(0, espera)  # Full jitter
+
+def get(url, headers=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, **kwargs):
+    """
+    GET com timeout e retry.
+    Repete em erro de conexão/timeout e em status transitórios (429/5xx).
+    Retorna a última resposta recebida; se todas as tentativas falharem
+    sem resposta, relança a última exceção de requests.
+    """
+    session = get_session()
+    for tentativa in range(retries + 1):
+        ultima = tentativa == retries
+        try:
+            response = session.get(url, headers=headers, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if ultima:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS or ultima:
+                return response
+            response.close()
+        time.sleep(_backoff(tentativa))
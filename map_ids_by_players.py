@@ -1,5 +1,5 @@
 
-import requests
+import http_client
 import json
 import collections
 
@@ -7,7 +7,7 @@ def main():
     url = "https://api.cartola.globo.com/atletas/mercado"
     headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        resp = requests.get(url, headers=headers)
+        resp = http_client.get(url, headers=headers)
         data = resp.json().get('atletas', [])
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,101 @@
+"""
+Gravação de PNG em streaming, faixa por faixa.
+
+Usado na exportação em tiles (render_worker): cada faixa capturada é
+decodificada, filtrada e comprimida direto no arquivo final, então a memória
+fica limitada ao tamanho de uma faixa e não da imagem inteira (7200px+ no 6x).
+"""
+import io
+import struct
+import zlib
+
+from PIL import Image
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_CHUNK_SIZE = 1 << 20   # Bytes comprimidos por chunk IDAT
+COMPRESS_LEVEL = 6
+
+def _chunk(tipo, dados):
+    return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", zlib.crc32(tipo + dados) & 0xffffffff)
+
+def _ihdr(largura, altura):
+    # 8 bits, RGBA (color type 6), sem entrelaçamento
+    return _chunk(b"IHDR", struct.pack(">IIBBBBB", largura, altura, 8, 6, 0, 0, 0))
+
+class PngStreamWriter:
+    """
+    Escreve um PNG RGBA de `largura` x `altura` em `destino` (arquivo binário)
+    recebendo as linhas em faixas, de cima para baixo.
+    Se o total de linhas no fim diferir de `altura` e o destino permitir seek,
+    o IHDR é corrigido; senão close() lança ValueError.
+    """
+    def __init__(self, destino, largura, altura, nivel=COMPRESS_LEVEL):
+        self.destino = destino
+        self.largura = largura
+        self.altura = altura
+        self.linhas = 0
+        self._stride = largura * 4
+        self._zlib = zlib.compressobj(nivel)
+        self._pendente = []
+        self._pendente_bytes = 0
+        self._inicio = destino.tell() if destino.seekable() else None
+        destino.write(PNG_SIGNATURE + _ihdr(largura, altura))
+
+    def _emitir(self, dados, final=False):
+        if dados:
+            self._pendente.append(dados)
+            self._pendente_bytes += len(dados)
+        if self._pendente_bytes >= IDAT_CHUNK_SIZE or (final and self._pendente_bytes):
+            self.destino.write(_chunk(b"IDAT", b"".join(self._pendente)))
+            self._pendente = []
+            self._pendente_bytes = 0
+
+    def write_rows(self, dados, linhas):
+        """
+        `linhas` linhas RGBA contíguas (largura * 4 bytes cada).
+        """
+        if len(dados) != linhas * self._stride:
+            raise ValueError(f"faixa com {len(dados)} bytes, esperado {linhas} x {self._stride}")
+        mv = memoryview(dados)
+        stride = self._stride
+        # Filtro 0 (None) em todas as linhas: um byte antes de cada linha
+        filtrado = b"".join(b"\x00" + mv[i:i + stride] for i in range(0, len(dados), stride))
+        self._emitir(self._zlib.compress(filtrado))
+        self.linhas += linhas
+
+    def write_image(self, imagem):
+        """
+        Acrescenta uma imagem do Pillow como próxima faixa.
+        """
+        if imagem.width != self.largura:
+            raise ValueError(f"faixa com {imagem.width}px de largura, esperado {self.largura}px")
+        if imagem.mode != "RGBA":
+            imagem = imagem.convert("RGBA")
+        self.write_rows(imagem.tobytes(), imagem.height)
+
+    def write_png(self, png):
+        """
+        Acrescenta uma faixa vinda de bytes PNG (ex.: screenshot com clip).
+        """
+        with Image.open(io.BytesIO(png)) as imagem:
+            self.write_image(imagem)
+
+    def close(self):
+        self._emitir(self._zlib.flush(), final=True)
+        self.destino.write(_chunk(b"IEND", b""))
+        if self.linhas != self.altura:
+            if self._inicio is None:
+                raise ValueError(f"PNG com {self.linhas} linhas, IHDR declarou {self.altura}")
+            fim = self.destino.tell()
+            self.destino.seek(self._inicio + len(PNG_SIGNATURE))
+            self.destino.write(_ihdr(self.largura, self.linhas))
+            self.destino.seek(fim)
+            self.altura = self.linhas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *exc):
+        if tipo is None:
+            self.close()
+        return False
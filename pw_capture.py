@@ -1,6 +1,8 @@
 """
 Script executado como SUBPROCESS para capturar screenshot via Playwright.
 Isso evita conflito de event loop asyncio com o Streamlit.
+Sobe um Chromium por imagem; para várias exportações use o render_worker.py,
+que mantém o browser aberto.
 
 Uso: python pw_capture.py <arquivo_html> <arquivo_png_saida> <scale> <largura_base>
 """
@@ -8,6 +10,8 @@ import sys
 import os
 from playwright.sync_api import sync_playwright
 
+from render_worker import WAIT_ASSETS_JS
+
 def main():
     if len(sys.argv) < 5:
         print("Uso: python pw_capture.py <html_path> <output_png_path> <scale> <base_width>")
@@ -30,15 +34,9 @@ def main():
         
         page = context.new_page()
         page.goto(file_url, wait_until="networkidle")
-        page.wait_for_timeout(3000)
         
-        # Esconder controles de UI
-        page.evaluate("""
-            () => {
-                const el = document.getElementById('ui-controls');
-                if (el) el.style.display = 'none';
-            }
-        """)
+        # Espera fontes e imagens e esconde os controles de UI
+        page.evaluate(WAIT_ASSETS_JS)
         
         # Capturar o elemento #capture (report-container)
         element = page.locator("#capture")
@@ -0,0 +1,488 @@
+"""
+Worker de exportação PNG com um Chromium headless persistente.
+
+O pw_capture.py sobe um Chromium novo a cada imagem e espera 3s fixos antes
+do screenshot. Aqui o browser fica aberto no processo, as páginas de cada
+escala são reaproveitadas entre jobs e a captura espera só o necessário:
+document.fonts.ready e o decode de todas as imagens.
+
+O Playwright roda num event loop próprio em uma thread dedicada (sem
+conflito com o loop do Streamlit); os jobs entram por uma fila local
+(submit/capture) ou por socket TCP em 127.0.0.1.
+
+Uso:
+    python render_worker.py serve [--port 8765]     # worker em socket local
+    python render_worker.py capture <html> <png> [--scale 3.0] [--port 8765]
+    python render_worker.py scales <html> <prefixo_png> [--scales 3.0 4.0 6.0]   # local, em paralelo
+"""
+import argparse
+import asyncio
+import atexit
+import io
+import json
+import math
+import os
+import re
+import socket
+import socketserver
+import threading
+import time
+
+import png_stitch
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_PORT = 8765
+BASE_WIDTH = 1200        # .report-container
+VIEWPORT_PADDING = 80
+VIEWPORT_HEIGHT = 800
+PAGES_PER_SCALE = 2
+READY_TIMEOUT_MS = 15000
+
+# Escalas a partir das quais a captura é feita em faixas (tiles) costuradas em
+# streaming; cada faixa tem até TILE_HEIGHT_PX pixels de altura
+TILED_MIN_SCALE = 6.0
+TILE_HEIGHT_PX = 2048
+
+# O board é todo inline (data URIs); só o html-to-image do botão do preview vem
+# de CDN e não é usado na captura, então a rede fica bloqueada
+BLOCKED_URLS = re.compile(r"^https?://")
+
+# Espera fontes e imagens (em vez de um sleep fixo) e esconde os controles de UI
+WAIT_ASSETS_JS = """
+async () => {
+    await document.fonts.ready;
+    await Promise.all(Array.from(document.images).map(
+        img => img.decode ? img.decode().catch(() => null) : null
+    ));
+    const el = document.getElementById('ui-controls');
+    if (el) el.style.display = 'none';
+    // Dois frames para o layout final ser pintado
+    await new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
+}
+"""
+
+async def _abortar(route):
+    await route.abort()
+
+def file_url(html_path):
+    return "file:///" + os.path.abspath(html_path).replace("\\", "/").lstrip("/")
+
+async def _load(page, html=None, url=None):
+    if html is not None:
+        await page.set_content(html, wait_until="load", timeout=READY_TIMEOUT_MS)
+    else:
+        await page.goto(url, wait_until="load", timeout=READY_TIMEOUT_MS)
+    await page.evaluate(WAIT_ASSETS_JS)
+
+async def _capture_target(page):
+    for seletor in ("#capture", ".report-container"):
+        element = page.locator(seletor)
+        if await element.count() > 0:
+            return element.first
+    return None
+
+def tile_step(escala, tile_height=TILE_HEIGHT_PX):
+    """
+    Altura da faixa em px CSS: cabe em `tile_height` pixels e, na escala,
+    dá um número inteiro de pixels (as faixas encaixam sem linha duplicada).
+    """
+    passo = max(1, int(tile_height // escala))
+    while passo > 1 and not float(passo * escala).is_integer():
+        passo -= 1
+    return passo
+
+async def capture_tiled(page, escala, output_path=None, tile_height=TILE_HEIGHT_PX):
+    """
+    Captura a área do board em faixas horizontais (screenshot com clip) e
+    costura o PNG em streaming: a memória fica limitada a uma faixa, qualquer
+    que seja a escala. Com `output_path` grava o arquivo e retorna None;
+    sem ele, retorna os bytes do PNG.
+    """
+    alvo = await _capture_target(page)
+    scroll_x, scroll_y = await page.evaluate("() => [window.scrollX, window.scrollY]")
+    if alvo is not None:
+        box = await alvo.bounding_box()
+        x0, y0 = math.floor(box['x'] + scroll_x), math.floor(box['y'] + scroll_y)
+        x1 = math.ceil(box['x'] + scroll_x + box['width'])
+        y1 = math.ceil(box['y'] + scroll_y + box['height'])
+    else:
+        x0 = y0 = 0
+        x1, y1 = await page.evaluate(
+            "() => [document.documentElement.scrollWidth, document.documentElement.scrollHeight]")
+
+    passo = tile_step(escala, tile_height)
+    destino = open(output_path, "wb") if output_path else io.BytesIO()
+    try:
+        with png_stitch.PngStreamWriter(destino, round((x1 - x0) * escala), round((y1 - y0) * escala)) as writer:
+            for y in range(y0, y1, passo):
+                clip = {'x': x0, 'y': y, 'width': x1 - x0, 'height': min(passo, y1 - y)}
+                writer.write_png(await page.screenshot(type="png", clip=clip, full_page=True))
+        return None if output_path else destino.getvalue()
+    finally:
+        if output_path:
+            destino.close()
+
+async def capture_page(page, html=None, url=None, output_path=None, escala=1.0, tile_height=None):
+    """
+    Carrega o HTML (string) ou a URL na página, espera os assets e captura
+    o #capture (ou .report-container, ou a página inteira). Retorna os bytes do PNG.
+    Com `tile_height`, captura em faixas (ver capture_tiled).
+    """
+    await _load(page, html, url)
+    if tile_height:
+        return await capture_tiled(page, escala, output_path, tile_height)
+
+    alvo = await _capture_target(page)
+    if alvo is not None:
+        return await alvo.screenshot(path=output_path, type="png")
+    return await page.screenshot(path=output_path, type="png", full_page=True)
+
+class RenderWorker:
+    """
+    Chromium headless aberto enquanto o worker viver, com um contexto por
+    escala (device_scale_factor) e até `pages_per_scale` páginas reaproveitadas.
+    """
+    def __init__(self, pages_per_scale=PAGES_PER_SCALE, base_width=BASE_WIDTH):
+        if async_playwright is None:
+            raise RuntimeError("playwright não está instalado (pip install playwright && playwright install chromium)")
+        self.pages_per_scale = pages_per_scale
+        self.base_width = base_width
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="render-worker", daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self._browser = None
+        self._start_lock = None
+        self._pools = {}   # escala -> {'context', 'livres': asyncio.Queue, 'criadas': n}
+        self.jobs = 0
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _ensure_browser(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._pools = {}
+        return self._browser
+
+    async def _pool(self, escala):
+        browser = await self._ensure_browser()
+        async with self._start_lock:
+            pool = self._pools.get(escala)
+            if pool is None:
+                context = await browser.new_context(
+                    viewport={"width": self.base_width + VIEWPORT_PADDING, "height": VIEWPORT_HEIGHT},
+                    device_scale_factor=escala,
+                )
+                await context.route(BLOCKED_URLS, _abortar)
+                pool = self._pools[escala] = {'context': context, 'livres': asyncio.Queue(), 'criadas': 0}
+        return pool
+
+    async def _acquire(self, escala):
+        pool = await self._pool(escala)
+        if pool['livres'].empty() and pool['criadas'] < self.pages_per_scale:
+            pool['criadas'] += 1
+            try:
+                return await pool['context'].new_page()
+            except Exception:
+                pool['criadas'] -= 1
+                raise
+        return await pool['livres'].get()
+
+    def _release(self, escala, page, ok):
+        pool = self._pools.get(escala)
+        if pool is None:
+            return
+        if ok and not page.is_closed():
+            pool['livres'].put_nowait(page)
+        else:
+            # Página em estado duvidoso: descarta e deixa criar outra
+            pool['criadas'] -= 1
+            if not page.is_closed():
+                asyncio.ensure_future(page.close())
+
+    async def _capture(self, html, url, escala, output_path, tile_height=None):
+        page = await self._acquire(escala)
+        ok = False
+        try:
+            png = await capture_page(page, html=html, url=url, output_path=output_path,
+                                     escala=escala, tile_height=tile_height)
+            ok = True
+            return png
+        finally:
+            self._release(escala, page, ok)
+            self.jobs += 1
+
+    def submit(self, html=None, html_path=None, scale=3.0, output_path=None, tiled=None):
+        """
+        Enfileira uma captura; retorna um concurrent.futures.Future com os bytes do PNG
+        (None se a captura foi em tiles direto para `output_path`).
+        `tiled`: None = em tiles a partir de TILED_MIN_SCALE; True/False; ou a
+        altura de cada faixa em pixels.
+        """
+        if html is None and html_path is None:
+            raise ValueError("informe html ou html_path")
+        url = file_url(html_path) if html is None else None
+        escala = float(scale)
+        return self._run(self._capture(html, url, escala, output_path, _tile_height(escala, tiled)))
+
+    def capture(self, html=None, html_path=None, scale=3.0, output_path=None, tiled=None, timeout=None):
+        return self.submit(html, html_path, scale, output_path, tiled).result(timeout)
+
+    def submit_scales(self, scales, html=None, html_path=None, output_paths=None, max_parallel=None):
+        """
+        Mesmo HTML capturado em várias escalas ao mesmo tempo (um contexto por
+        device_scale_factor no mesmo browser). `output_paths`: {escala: caminho}.
+        `max_parallel` limita quantas escalas rasterizam juntas (6x pesa na RAM);
+        escalas a partir de TILED_MIN_SCALE são capturadas em tiles.
+        Retorna um Future com {escala: {'png': bytes ou None, 'segundos': s}}.
+        """
+        if html is None and html_path is None:
+            raise ValueError("informe html ou html_path")
+        url = file_url(html_path) if html is None else None
+        output_paths = output_paths or {}
+        escalas = [float(e) for e in scales]
+
+        async def todas():
+            limite = asyncio.Semaphore(max_parallel or len(escalas))
+
+            async def uma(escala):
+                async with limite:
+                    t0 = time.perf_counter()
+                    png = await self._capture(html, url, escala, output_paths.get(escala), _tile_height(escala))
+                    return escala, {'png': png, 'segundos': time.perf_counter() - t0}
+
+            return dict(await asyncio.gather(*(uma(e) for e in escalas)))
+
+        return self._run(todas())
+
+    def capture_scales(self, scales, html=None, html_path=None, output_paths=None, max_parallel=None, timeout=None):
+        return self.submit_scales(scales, html, html_path, output_paths, max_parallel).result(timeout)
+
+    def warm_up(self, scales=(3.0,)):
+        """
+        Sobe o browser e abre uma página por escala antes do primeiro job.
+        """
+        async def aquecer():
+            for escala in scales:
+                self._release(float(escala), await self._acquire(float(escala)), True)
+        self._run(aquecer()).result()
+
+    def close(self):
+        async def fechar():
+            for pool in self._pools.values():
+                await pool['context'].close()
+            self._pools = {}
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+            self._browser = self._playwright = None
+        if self._thread.is_alive():
+            try:
+                self._run(fechar()).result(timeout=10)
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+
+def process_tree_rss(pid=None):
+    """
+    RSS em bytes do processo e de todos os descendentes (Python + Chromium).
+    Usa psutil; sem ele, lê /proc no Linux. None se não houver como medir.
+    """
+    pid = pid or os.getpid()
+    if psutil is not None:
+        try:
+            processo = psutil.Process(pid)
+            processos = [processo] + processo.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for p in processos:
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                pass  # Processo terminou durante a leitura
+        return total
+
+    if not os.path.isdir("/proc"):
+        return None
+    pagina = os.sysconf("SC_PAGE_SIZE")
+    filhos, rss = {}, {}
+    for nome in os.listdir("/proc"):
+        if not nome.isdigit():
+            continue
+        try:
+            with open(f"/proc/{nome}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{nome}/statm") as f:
+                rss[int(nome)] = int(f.read().split()[1]) * pagina
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(ppid, []).append(int(nome))
+    total, pilha = 0, [pid]
+    while pilha:
+        atual = pilha.pop()
+        total += rss.get(atual, 0)
+        pilha.extend(filhos.get(atual, []))
+    return total
+
+class PeakMemory:
+    """
+    Context manager que amostra process_tree_rss() em background e guarda o pico
+    (em bytes, ou None se a medição não estiver disponível).
+    """
+    def __init__(self, intervalo=0.05):
+        self.intervalo = intervalo
+        self.pico = None
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _amostrar(self):
+        while True:
+            rss = process_tree_rss()
+            if rss is not None and (self.pico is None or rss > self.pico):
+                self.pico = rss
+            if self._parar.wait(self.intervalo):
+                return
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._amostrar, name="peak-memory", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+        return False
+
+def _tile_height(escala, tiled=None):
+    # tiled: None = automático pela escala, bool, ou a altura da faixa em pixels
+    if tiled is None:
+        tiled = escala >= TILED_MIN_SCALE
+    if tiled is True:
+        return TILE_HEIGHT_PX
+    return tiled or None
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_worker():
+    """
+    Worker compartilhado do processo, criado na primeira chamada.
+    """
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = RenderWorker()
+                atexit.register(_worker.close)
+    return _worker
+
+# --- Socket local: um job JSON por linha, uma resposta JSON por linha ---
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for linha in self.rfile:
+            if not linha.strip():
+                continue
+            t0 = time.perf_counter()
+            try:
+                job = json.loads(linha)
+                get_worker().capture(
+                    html=job.get('html'),
+                    html_path=job.get('html_path'),
+                    scale=job.get('scale', 3.0),
+                    output_path=job['output'],
+                    tiled=job.get('tiled'),
+                    timeout=job.get('timeout', 120),
+                )
+                resposta = {'ok': True, 'output': job['output'], 'ms': (time.perf_counter() - t0) * 1000}
+            except Exception as e:
+                resposta = {'ok': False, 'erro': f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(resposta) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def serve(port=DEFAULT_PORT, scales=(3.0,)):
+    """
+    Sobe o worker (browser já aquecido) e atende jobs em 127.0.0.1:`port`.
+    """
+    get_worker().warm_up(scales)
+    with _Server(("127.0.0.1", port), _JobHandler) as server:
+        print(f"render_worker ouvindo em 127.0.0.1:{port}")
+        server.serve_forever()
+
+def request_capture(output_path, html_path=None, html=None, scale=3.0, port=DEFAULT_PORT, timeout=120):
+    """
+    Envia um job para o worker em socket e espera a resposta.
+    Lança RuntimeError se o worker reportar erro.
+    """
+    job = {'output': os.path.abspath(output_path), 'scale': scale, 'timeout': timeout}
+    if html_path is not None:
+        job['html_path'] = os.path.abspath(html_path)
+    else:
+        job['html'] = html
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+        sock.sendall((json.dumps(job) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as f:
+            resposta = json.loads(f.readline())
+    if not resposta.get('ok'):
+        raise RuntimeError(resposta.get('erro', "falha no render_worker"))
+    return resposta
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker de exportação PNG (Chromium persistente)")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument("--scales", type=float, nargs="+", default=[3.0])
+    p_cap = sub.add_parser("capture")
+    p_cap.add_argument("html_path")
+    p_cap.add_argument("output")
+    p_cap.add_argument("--scale", type=float, default=3.0)
+    p_cap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_esc = sub.add_parser("scales")
+    p_esc.add_argument("html_path")
+    p_esc.add_argument("prefixo")
+    p_esc.add_argument("--scales", type=float, nargs="+", default=[3.0, 4.0, 6.0])
+    p_esc.add_argument("--max-parallel", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.comando == "serve":
+        serve(args.port, tuple(args.scales))
+    elif args.comando == "scales":
+        saidas = {e: f"{args.prefixo}_{e:.1f}x.png" for e in args.scales}
+        with PeakMemory() as memoria:
+            t0 = time.perf_counter()
+            resultado = get_worker().capture_scales(args.scales, html_path=args.html_path, output_paths=saidas,
+                                                    max_parallel=args.max_parallel)
+            total = time.perf_counter() - t0
+        for escala, r in sorted(resultado.items()):
+            tamanho = os.path.getsize(saidas[escala]) / 1024 / 1024
+            print(f"{escala:.1f}x: {r['segundos']:.2f}s -> {saidas[escala]} ({tamanho:.1f} MB)")
+        pico = f"{memoria.pico / 1024 / 1024:.0f} MB" if memoria.pico is not None else "n/d"
+        print(f"total {total:.2f}s | pico de memória (Python + Chromium) {pico}")
+    else:
+        resposta = request_capture(args.output, html_path=args.html_path, scale=args.scale, port=args.port)
+        print(f"OK {resposta['output']} ({resposta['ms']:.0f}ms)")
+
+if __name__ == "__main__":
+    main()
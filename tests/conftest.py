@@ -0,0 +1,8 @@
+"""
+Os módulos do app ficam na raiz do repositório (sem pacote): coloca a raiz no
+sys.path para os testes importarem utils, http_client etc.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
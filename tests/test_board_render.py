@@ -0,0 +1,39 @@
+"""
+Cache de blocos de posição do board_render.
+"""
+import dataclasses
+
+import asset_bundle
+import benchmark
+import board_render
+
+def test_bloco_em_cache_igual_ao_renderizado():
+    bundle = asset_bundle.get_asset_bundle(None)
+    players = benchmark.gerar_board(24)
+    com_cache = board_render.render_board(players, 10, bundle=bundle, css="", use_cache=True)
+    sem_cache = board_render.render_board(players, 10, bundle=bundle, css="", use_cache=False)
+    assert com_cache == sem_cache
+
+def test_lru_limitado_pelo_tamanho_total():
+    cache = board_render._BlockCache(max_bytes=100)
+    for i in range(5):
+        cache.put(i, "x" * 30)
+    assert cache.nbytes <= 100
+    assert cache.get(0) is None and cache.get(1) is None
+    assert cache.get(4) == "x" * 30
+
+    cache.put("grande", "x" * 101)   # Maior que o limite inteiro: não entra
+    assert cache.get("grande") is None
+    assert cache.nbytes <= 100
+
+def test_bundle_novo_nao_reaproveita_bloco():
+    bundle = asset_bundle.get_asset_bundle(None)
+    jogadores = benchmark.gerar_board(24)['Meias']
+    bloco = board_render.cached_pos_block('Meias', jogadores, bundle)
+
+    logos = {caminho: "" for caminho in bundle.team_logos}   # Logos trocados no disco
+    novo = dataclasses.replace(bundle, team_logos=logos, versao=bundle.versao + "-novo")
+    antes = board_render.block_cache_stats()['misses']
+    outro = board_render.cached_pos_block('Meias', jogadores, novo)
+    assert board_render.block_cache_stats()['misses'] == antes + 1
+    assert outro != bloco
@@ -0,0 +1,56 @@
+"""
+Registro e invalidação por namespace (cache_namespaces).
+"""
+import cache_namespaces
+
+def _decorar(namespace, chamadas):
+    # Como o script do app a cada rerun: a mesma função decorada de novo
+    @cache_namespaces.cached(namespace)
+    def dobro(x):
+        chamadas.append(x)
+        return 2 * x
+    return dobro
+
+def test_redecorar_nao_acumula_registros():
+    namespace = "teste_redecorar"
+    chamadas = []
+    for _ in range(5):
+        dobro = _decorar(namespace, chamadas)
+    assert len(cache_namespaces._funcoes[namespace]) == 1
+
+    assert dobro(3) == 6
+    assert dobro(3) == 6
+    assert chamadas == [3]
+    cache_namespaces.invalidate(namespace)
+    assert dobro(3) == 6
+    assert chamadas == [3, 3]
+
+def test_register_e_record():
+    namespace = "teste_register"
+
+    class Cache:
+        limpezas = 0
+
+        def clear(self):
+            Cache.limpezas += 1
+
+    cache = Cache()
+    cache_namespaces.register(namespace, cache)
+    cache_namespaces.register(namespace, cache)
+    cache_namespaces.invalidate(namespace)
+    assert Cache.limpezas == 1
+
+    cache_namespaces.record(namespace, hit=False)
+    cache_namespaces.record(namespace, hit=True)
+    cache_namespaces.record(namespace, hit=True)
+    stats = cache_namespaces.cache_stats()[namespace]
+    assert (stats['hits'], stats['misses']) == (2, 1)
+
+def test_count_fica_fora_de_hits_e_misses():
+    namespace = "teste_count"
+    cache_namespaces.record(namespace, hit=True)
+    cache_namespaces.count(namespace, 'offline')
+    cache_namespaces.count(namespace, 'offline')
+    stats = cache_namespaces.cache_stats()[namespace]
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 0, 1.0)
+    assert stats['offline'] == 2
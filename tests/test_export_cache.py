@@ -0,0 +1,19 @@
+"""
+Chave do export_cache.
+"""
+import os
+
+import export_cache
+
+PLAYERS = {'Goleiros': [{'name': "Fulano", 'team': "Flamengo", 'conf': "A", 'badges': {'unanimidade': False, 'bom_capitao': False}}]}
+
+def test_chave_playwright_depende_da_escala_do_html():
+    versao = "v"
+    base = export_cache.export_key(PLAYERS, 5, 2.0, "playwright", versao, escala_html=2.0)
+    assert base == export_cache.export_key(PLAYERS, 5, 2.0, "playwright", versao, escala_html=2.0)
+    assert base != export_cache.export_key(PLAYERS, 5, 2.0, "playwright", versao, escala_html=4.0)
+    # Sem escala do HTML (pillow/html) a chave não muda de formato
+    assert export_cache.export_key(PLAYERS, 5, 2.0, "pillow", versao) != base
+
+def test_versao_cobre_busca_dos_escudos():
+    assert os.path.join(export_cache.BASE_DIR, "utils.py") in export_cache.SOURCE_FILES
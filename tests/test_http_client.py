@@ -0,0 +1,140 @@
+"""
+http_client contra um servidor HTTP local (stub) em thread.
+"""
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import http_client
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # Keep-alive, para testar o reuso da conexão
+
+    def do_GET(self):
+        servidor = self.server
+        servidor.recebidos.append({'path': self.path, 'headers': dict(self.headers), 'porta': self.client_address[1]})
+        roteiro = servidor.roteiros.get(self.path, [])
+        status = roteiro.pop(0) if len(roteiro) > 1 else (roteiro[0] if roteiro else 200)
+        if self.path == "/lento":
+            time.sleep(servidor.atraso)
+        corpo = json.dumps({'status': status, 'path': self.path}).encode("utf-8")
+        usar_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        if usar_gzip:
+            corpo = gzip.compress(corpo)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if usar_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass   # Cliente que desistiu por timeout fecha a conexão antes da resposta
+
+@pytest.fixture
+def servidor(monkeypatch):
+    srv = _Servidor(("127.0.0.1", 0), _Stub)
+    srv.recebidos = []
+    srv.roteiros = {}   # path -> status das respostas em ordem (o último se repete)
+    srv.atraso = 0
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    thread = threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setattr(http_client, "_backoff", lambda tentativa: 0)
+    http_client.reset_session()
+    yield srv
+    http_client.reset_session()
+    srv.shutdown()
+    srv.server_close()
+
+def _chamadas(srv, path):
+    return [r for r in srv.recebidos if r['path'] == path]
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retry_em_status_transitorio(servidor, status):
+    servidor.roteiros["/x"] = [status, status, 200]
+    r = http_client.get(servidor.url + "/x", retries=2)
+    assert r.status_code == 200
+    assert len(_chamadas(servidor, "/x")) == 3
+
+def test_retries_esgotados_devolvem_ultima_resposta(servidor):
+    servidor.roteiros["/x"] = [503]
+    r = http_client.get(servidor.url + "/x", retries=2)
+    assert r.status_code == 503
+    assert len(_chamadas(servidor, "/x")) == 3
+
+@pytest.mark.parametrize("status", [400, 401, 403, 404])
+def test_sem_retry_em_4xx(servidor, status):
+    servidor.roteiros["/x"] = [status, 200]
+    r = http_client.get(servidor.url + "/x", retries=2)
+    assert r.status_code == status
+    assert len(_chamadas(servidor, "/x")) == 1
+
+def test_timeout_padrao_em_toda_chamada(servidor, monkeypatch):
+    usados = []
+    session = http_client.get_session()
+    original = session.get
+
+    def get_espiao(url, **kwargs):
+        usados.append(kwargs.get('timeout'))
+        return original(url, **kwargs)
+
+    monkeypatch.setattr(session, "get", get_espiao)
+    http_client.get(servidor.url + "/x")
+    assert usados == [http_client.DEFAULT_TIMEOUT]
+    assert http_client.DEFAULT_TIMEOUT[0] > 0 and http_client.DEFAULT_TIMEOUT[1] > 0
+
+def test_timeout_de_leitura_com_retry(servidor):
+    servidor.atraso = 0.5
+    t0 = time.perf_counter()
+    with pytest.raises(requests.Timeout):
+        http_client.get(servidor.url + "/lento", timeout=(1, 0.1), retries=1)
+    # Duas tentativas, cada uma cortada pelo timeout de leitura (não pelo atraso do servidor)
+    assert len(_chamadas(servidor, "/lento")) == 2
+    assert time.perf_counter() - t0 < 2 * servidor.atraso + 0.5
+
+def test_retry_em_erro_de_conexao(monkeypatch):
+    monkeypatch.setattr(http_client, "_backoff", lambda tentativa: 0)
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    porta = srv.server_address[1]
+    srv.server_close()   # Porta livre e sem ninguém escutando
+    tentativas = []
+    original = http_client.get_session().get
+
+    def get_contando(url, **kwargs):
+        tentativas.append(url)
+        return original(url, **kwargs)
+
+    monkeypatch.setattr(http_client.get_session(), "get", get_contando)
+    with pytest.raises(requests.ConnectionError):
+        http_client.get(f"http://127.0.0.1:{porta}/x", retries=2)
+    assert len(tentativas) == 3
+
+def test_gzip_negociado(servidor):
+    r = http_client.get(servidor.url + "/x")
+    assert "gzip" in _chamadas(servidor, "/x")[0]['headers']['Accept-Encoding']
+    assert r.headers['Content-Encoding'] == "gzip"
+    assert r.json() == {'status': 200, 'path': "/x"}
+
+def test_session_e_conexao_reusadas(servidor):
+    assert http_client.get_session() is http_client.get_session()
+    for _ in range(3):
+        http_client.get(servidor.url + "/x").close()
+    portas = {r['porta'] for r in _chamadas(servidor, "/x")}
+    assert len(portas) == 1   # Mesma conexão TCP (keep-alive) nas três chamadas
+
+    http_client.reset_session()
+    http_client.get(servidor.url + "/x").close()
+    assert len({r['porta'] for r in _chamadas(servidor, "/x")}) == 2
@@ -0,0 +1,86 @@
+"""
+Leitura da planilha 'Por jogo' (utils.load_data / utils.read_excel) e da classificação
+de volantes e meias (utils.load_classificacao).
+"""
+import pandas as pd
+import pytest
+
+import utils
+
+@pytest.fixture
+def planilha(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "CACHE_DIR", str(tmp_path / "cache"))
+    caminho = tmp_path / "temporada.xlsx"
+    pd.DataFrame({
+        'Data': ["01/05/2025", "04/05/2025"],
+        'Nome2': ["Arrascaeta", "Rossi"],
+        'Time': ["Flamengo", "Flamengo"],
+        'Posicao': ["MEIA", "GOLEIRO"],
+        'Preco': [18.5, 10.0],
+        'MinValorizar': [4.2, 2.0],
+        'Pts': [12.3, 5.0],
+        'ColunaQueOAppNaoUsa': [1, 2],
+    }).to_excel(caminho, sheet_name='Por jogo', index=False)
+    return str(caminho)
+
+def test_load_data_mantem_colunas_do_editor(planilha):
+    # O seletor de jogadores do app filtra por Posicao e lê Preco/MinValorizar
+    df = utils.load_data(planilha)
+    for coluna in ('Posicao', 'Preco', 'MinValorizar', 'Jogador_Original', 'Time'):
+        assert coluna in df.columns
+    assert 'ColunaQueOAppNaoUsa' not in df.columns
+    assert df.loc[df['Posicao'] == 'MEIA', 'Preco'].tolist() == [18.5]
+
+def test_load_data_do_cache_igual_ao_excel(planilha):
+    frio = utils.load_data(planilha)
+    quente = utils.load_data(planilha)
+    pd.testing.assert_frame_equal(frio, quente)
+
+def test_read_excel_cai_para_o_proximo_engine(planilha, monkeypatch):
+    if 'calamine' not in utils.excel_engines() or 'openpyxl' not in utils.excel_engines():
+        pytest.skip("precisa de calamine e openpyxl instalados")
+    from python_calamine import CalamineError
+
+    original = pd.read_excel
+    usados = []
+
+    def read_excel_falso(*args, engine=None, **kwargs):
+        usados.append(engine)
+        if engine == 'calamine':
+            raise CalamineError("arquivo corrompido")
+        return original(*args, engine=engine, **kwargs)
+
+    monkeypatch.setattr(pd, "read_excel", read_excel_falso)
+    df = utils.read_excel(planilha, sheet_name='Por jogo')
+    assert usados == ['calamine', 'openpyxl']
+    assert len(df) == 2
+
+def test_classificacao_detecta_cabecalho(tmp_path):
+    caminho = tmp_path / "classificacao.xlsx"
+    # Título acima do cabeçalho; célula de jogador vazia não vira 'NAN'
+    pd.DataFrame([
+        ["Classificação da rodada", None],
+        ["Jogador", "Classificação"],
+        ["Gerson", "Volante"],
+        [None, "Meia"],
+        ["De la Cruz", "Meia"],
+    ]).to_excel(caminho, header=False, index=False)
+    assert utils.load_classificacao(str(caminho)) == {'GERSON': 'VOLANTE', 'DE LA CRUZ': 'MEIA'}
+
+def test_classificacao_formato_wide(tmp_path):
+    caminho = tmp_path / "wide.xlsx"
+    # Sem coluna de classificação: cabeçalho na linha 1 e marcadores por coluna
+    pd.DataFrame([
+        ["Volantes e meias", None, None, None],
+        ["Jogador", "1º Volante", "2º Volante", "Meia"],
+        ["Pulgar", "x", None, None],
+        ["Allan", None, "x", "x"],
+        ["Arrascaeta", None, None, "x"],
+        ["Sem marca", None, None, None],
+        [None, None, None, "x"],
+    ]).to_excel(caminho, header=False, index=False)
+    assert utils.load_classificacao(str(caminho)) == {'PULGAR': 'VOLANTE', 'ALLAN': 'VOLANTE', 'ARRASCAETA': 'MEIA'}
+
+def test_classificacao_ignora_jogador_vazio():
+    df = pd.DataFrame({'Jogador': ["Gerson", float('nan'), None], 'Classificação': ["Volante", "Meia", "Meia"]})
+    assert utils._mapping_classificacao(df) == {'GERSON': 'VOLANTE'}
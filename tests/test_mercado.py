@@ -0,0 +1,133 @@
+"""
+Mercado: build_mercado_df vs o loop original e refresh_mercado contra um
+servidor local (stub) no lugar da API do Cartola e do Gato Mestre.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import benchmark
+import cache_namespaces
+import http_client
+import utils
+
+ETAG = '"mercado-v1"'
+
+class _Cartola(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _responder(self, status, dados=None, headers=()):
+        corpo = json.dumps(dados).encode("utf-8") if dados is not None else b""
+        self.send_response(status)
+        for nome, valor in headers:
+            self.send_header(nome, valor)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        self.server.recebidos.append(self.path)
+        if self.path == "/atletas/mercado":
+            if self.headers.get("If-None-Match") == ETAG:
+                return self._responder(304)
+            return self._responder(200, {'atletas': self.server.atletas}, [("ETag", ETAG)])
+        if self.path.startswith("/gm"):
+            # Só o header Bearer devolve dados (no endpoint que o teste escolher)
+            if self.path == self.server.gm_ok and self.headers.get("Authorization") == "Bearer tok":
+                return self._responder(200, {str(k): {'minimo_para_valorizar': v} for k, v in self.server.mpv.items()})
+            return self._responder(401, {})
+        self._responder(404, {})
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def cartola(tmp_path, monkeypatch):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Cartola)
+    srv.daemon_threads = True
+    srv.recebidos = []
+    srv.gm_ok = "/gm1"
+    srv.atletas, srv.mpv = benchmark.gerar_mercado(atletas=40)
+    url = f"http://127.0.0.1:{srv.server_address[1]}"
+    threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True).start()
+
+    monkeypatch.setattr(utils, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(utils, "CARTOLA_API", url)
+    monkeypatch.setattr(utils, "GM_ENDPOINTS", [f"{url}/gm1", f"{url}/gm2"])
+    monkeypatch.setattr(utils, "_GM_AUTH_PREFERIDA", {})
+    http_client.reset_session()
+    yield srv
+    http_client.reset_session()
+    srv.shutdown()
+    srv.server_close()
+
+def _esperar(condicao, timeout=5.0):
+    limite = time.monotonic() + timeout
+    while not condicao():
+        assert time.monotonic() < limite, "servidor não recebeu os pedidos esperados"
+        time.sleep(0.01)
+
+def _stats(namespace):
+    return cache_namespaces.cache_stats().get(namespace, {'hits': 0, 'misses': 0})
+
+def test_build_mercado_df_igual_ao_loop():
+    atletas, mpv_map = benchmark.gerar_mercado()
+    pd.testing.assert_frame_equal(benchmark._mercado_loop(atletas, mpv_map), utils.build_mercado_df(atletas, mpv_map))
+
+def test_build_mercado_df_vazio():
+    df = utils.build_mercado_df([])
+    assert df.empty
+    assert list(df.columns) == ['id', 'Jogador_Original', 'Jogador_Norm', 'Time', 'Posicao', 'Preco', 'MinValorizar']
+
+def test_refresh_revalida_e_conta_hits(cartola):
+    merc0, gm0 = _stats(cache_namespaces.NS_MERCADO), _stats(cache_namespaces.NS_GATO_MESTRE)
+
+    primeiro = utils.refresh_mercado("tok")
+    assert primeiro['mercado_origem'] == 'api'
+    assert len(primeiro['atletas']) == 40
+    assert primeiro['gm_valido'] and primeiro['mpv_map'] == cartola.mpv
+    # O perdedor da corrida (X-GLB-Token no /gm1) pode chegar depois do retorno:
+    # espera ele antes de zerar os pedidos recebidos
+    _esperar(lambda: len(cartola.recebidos) >= 3)
+    # Corrida só entre os headers do primeiro endpoint; o /gm2 nem é tentado
+    assert sorted(cartola.recebidos) == ["/atletas/mercado", "/gm1", "/gm1"]
+
+    # Segundo clique: mercado revalidado (304, servido do snapshot) e GM pela rota lembrada
+    cartola.recebidos.clear()
+    segundo = utils.refresh_mercado("tok")
+    assert segundo['mercado_origem'] == '304'
+    assert segundo['atletas'] == primeiro['atletas']
+    assert segundo['mpv_map'] == cartola.mpv
+    assert sorted(cartola.recebidos) == ["/atletas/mercado", "/gm1"]
+
+    merc1, gm1 = _stats(cache_namespaces.NS_MERCADO), _stats(cache_namespaces.NS_GATO_MESTRE)
+    assert (merc1['hits'] - merc0['hits'], merc1['misses'] - merc0['misses']) == (1, 1)
+    assert (gm1['hits'] - gm0['hits'], gm1['misses'] - gm0['misses']) == (1, 1)
+
+def test_refresh_offline_usa_snapshot(cartola, monkeypatch):
+    atletas = utils.refresh_mercado("")['atletas']
+    monkeypatch.setattr(utils, "CARTOLA_API", "http://127.0.0.1:9")   # Porta fechada
+    monkeypatch.setattr(http_client, "_backoff", lambda tentativa: 0)
+    antes = _stats(cache_namespaces.NS_MERCADO)
+    offline = utils.refresh_mercado("")
+    assert offline['mercado_origem'] == 'offline'
+    assert offline['atletas'] == atletas
+    # Servido do snapshot, mas não conta como hit: vai para o contador 'offline'
+    depois = _stats(cache_namespaces.NS_MERCADO)
+    assert (depois['hits'], depois['misses']) == (antes['hits'], antes['misses'])
+    assert depois['offline'] == antes.get('offline', 0) + 1
+
+def test_gm_segundo_endpoint_so_depois_do_primeiro_falhar(cartola):
+    cartola.gm_ok = "/gm2"
+    gm = utils.fetch_gato_mestre("tok")
+    assert gm['valido'] and gm['mpv_map'] == cartola.mpv
+    _esperar(lambda: len(cartola.recebidos) >= 4)
+    # Os dois headers no /gm1 (401) e só então os dois no /gm2
+    assert cartola.recebidos[:2] == ["/gm1", "/gm1"]
+    assert sorted(cartola.recebidos[2:]) == ["/gm2", "/gm2"]
+    assert utils._GM_AUTH_PREFERIDA
@@ -0,0 +1,58 @@
+"""
+process_ranking/process_rankings (vetorizados) vs o loop original
+(benchmark._ranking_loop): saída completa igual, floats com tolerância.
+"""
+import math
+
+import numpy as np
+import pytest
+
+import benchmark
+import utils
+
+POSICOES = ['GOLEIRO', 'LATERAL', 'ZAGUEIRO', 'MEIA', 'ATACANTE', 'TECNICO']
+
+def _assert_igual(a, b, caminho="ranking"):
+    if isinstance(a, dict) and isinstance(b, dict):
+        assert a.keys() == b.keys(), f"{caminho}: chaves {sorted(a)} != {sorted(b)}"
+        for k in a:
+            _assert_igual(a[k], b[k], f"{caminho}[{k!r}]")
+    elif isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        assert len(a) == len(b), f"{caminho}: {len(a)} itens != {len(b)}"
+        for i, (x, y) in enumerate(zip(a, b)):
+            _assert_igual(x, y, f"{caminho}[{i}]")
+    elif isinstance(a, (float, np.floating)) or isinstance(b, (float, np.floating)):
+        assert math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9), f"{caminho}: {a} != {b}"
+    else:
+        assert a == b, f"{caminho}: {a!r} != {b!r}"
+
+@pytest.fixture(scope="module")
+def temporada():
+    df = benchmark.gerar_temporada(6000)
+    rodadas = {t: [{'rodada': 10, 'oponente': 'X', 'mando': 'CASA' if i % 2 else 'FORA'}]
+               for i, t in enumerate(benchmark.TIMES)}
+    # Alguns meias reclassificados como volantes pelo mapa externo
+    meias = df.loc[df['PosReal'] == 4, 'Jogador_Norm'].unique()[:15]
+    pos_map = {nome: 'VOLANTE' for nome in meias}
+    return df, rodadas, pos_map
+
+@pytest.mark.parametrize("filtro", ["Todas", "Por Mando"])
+@pytest.mark.parametrize("posicao", [None, 'MEIA', ['VOLANTE', 'MEIA'], 'GOLEIRO'])
+@pytest.mark.parametrize("usar_pos_map", [False, True])
+def test_process_ranking_igual_ao_loop(temporada, filtro, posicao, usar_pos_map):
+    df, rodadas, pos_map = temporada
+    args = (df, 5, filtro, 10, rodadas, 50)
+    kwargs = {'posicao_filter': posicao, 'pos_map': pos_map if usar_pos_map else None}
+    esperado = benchmark._ranking_loop(*args, **kwargs)
+    obtido = utils.process_ranking(*args, **kwargs)
+    assert esperado, "cenário sem jogadores não testa nada"
+    _assert_igual(esperado, obtido)
+
+@pytest.mark.parametrize("filtro", ["Todas", "Por Mando"])
+def test_process_rankings_igual_a_chamadas_separadas(temporada, filtro):
+    df, rodadas, pos_map = temporada
+    args = (df, 5, filtro, 10, rodadas, 50)
+    juntos = utils.process_rankings(*args, POSICOES, pos_map=pos_map)
+    for posicao in POSICOES:
+        _assert_igual(utils.process_ranking(*args, posicao_filter=posicao, pos_map=pos_map), juntos[posicao],
+                      f"ranking[{posicao}]")
@@ -0,0 +1,64 @@
+"""
+Exportação em tiles: costura do PNG em streaming (png_stitch) e, com o
+Chromium do Playwright instalado, tiles vs a captura única do elemento.
+"""
+import io
+import os
+
+import numpy as np
+import pytest
+from PIL import Image, ImageChops
+
+import png_stitch
+
+def _chromium_instalado():
+    try:
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            return os.path.exists(p.chromium.executable_path)
+    except Exception:
+        return False
+
+def _imagem(caminho):
+    with Image.open(caminho) as im:
+        return im.convert("RGBA")
+
+def test_costura_em_faixas_identica_ao_original():
+    rng = np.random.default_rng(1)
+    original = Image.fromarray(rng.integers(0, 256, (1500, 1200, 4), dtype=np.uint8), "RGBA")
+    saida = io.BytesIO()
+    with png_stitch.PngStreamWriter(saida, original.width, original.height) as writer:
+        for y in range(0, original.height, 256):
+            writer.write_image(original.crop((0, y, original.width, min(original.height, y + 256))))
+    with Image.open(io.BytesIO(saida.getvalue())) as costurada:
+        assert costurada.size == original.size
+        assert costurada.convert("RGBA").tobytes() == original.tobytes()
+
+def test_altura_corrigida_no_close():
+    saida = io.BytesIO()
+    with png_stitch.PngStreamWriter(saida, 10, 100) as writer:
+        writer.write_image(Image.new("RGBA", (10, 30), (1, 2, 3, 255)))
+    with Image.open(io.BytesIO(saida.getvalue())) as png:
+        assert png.size == (10, 30)
+
+@pytest.mark.skipif(not _chromium_instalado(), reason="Chromium do Playwright não instalado")
+@pytest.mark.parametrize("escala", [1.0, 2.0])
+def test_tiles_identicos_a_captura_unica(tmp_path, escala):
+    import benchmark
+    import board_render
+    import render_worker
+
+    html = board_render.render_board(benchmark.gerar_board(), 10, escala=6.0)
+    unica, tiles = str(tmp_path / "unica.png"), str(tmp_path / "tiles.png")
+    worker = render_worker.RenderWorker()
+    try:
+        # Captura única: element.screenshot direto, sem capture_tiled/PngStreamWriter
+        worker.capture(html=html, scale=escala, output_path=unica, tiled=False)
+        worker.capture(html=html, scale=escala, output_path=tiles, tiled=256)
+    finally:
+        worker.close()
+
+    a, b = _imagem(unica), _imagem(tiles)
+    assert a.size == b.size
+    assert ImageChops.difference(a, b).getbbox() is None
@@ -1,10 +1,25 @@
 import pandas as pd
+import numpy as np
 import unicodedata
+from functools import lru_cache
 import os
 import base64
-import requests
+import bisect
+import gzip
+import hashlib
+import io
+import threading
+import time
 import json
-import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import cache_namespaces
+import http_client
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # Sem pyarrow o cache de dados fica desativado
+    feather = None
 
 # Mapeamento de IDs de Clubes (2024/2025 - Série A e B)
 CLUB_MAP = {
@@ -72,190 +87,378 @@ CLUB_MAP = {
     '327': 'América-RN',
 }
 
-@st.cache_data(ttl=300) # Cache for 5 minutes
-def fetch_mercado_data():
+CARTOLA_API = "https://api.cartola.globo.com"
+
+# Endpoints do Gato Mestre (ordem de preferência)
+GM_ENDPOINTS = [
+    f"{CARTOLA_API}/auth/gatomestre/atletas",
+    f"{CARTOLA_API}/auth/mercado/atleta/gatomestre"
+]
+
+# Headers mimicking the user's browser
+GM_HEADERS_BASE = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "x-glb-app-name": "cartola-web"
+}
+
+def _corrida(funcoes, aceitar):
+    """
+    Executa as funções em paralelo e para no primeiro resultado aceito por `aceitar`.
+    Retorna (índice do vencedor ou None, lista de resultados/exceções por índice).
+    """
+    pool = ThreadPoolExecutor(max_workers=len(funcoes))
+    futuros = {pool.submit(f): i for i, f in enumerate(funcoes)}
+    resultados = [None] * len(funcoes)
+    try:
+        for futuro in as_completed(futuros):
+            i = futuros[futuro]
+            try:
+                resultados[i] = futuro.result()
+            except Exception as e:
+                resultados[i] = e
+                continue
+            if aceitar(resultados[i]):
+                return i, resultados
+        return None, resultados
+    finally:
+        # Não espera os perdedores da corrida
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _clean_token(token):
+    # Remove prefixo Bearer se existir e limpa
+    clean_token = token.strip().strip('"').strip("'")
+    if clean_token.lower().startswith("bearer "):
+        clean_token = clean_token[7:].strip()
+    return clean_token
+
+# Snapshots do mercado em disco (JSON gzip), para revalidação condicional e modo offline
+MERCADO_SNAPSHOTS_MAX = 20
+MERCADO_SNAPSHOTS_MAX_AGE_DAYS = 7
+
+def _snapshots_dir():
+    return os.path.join(CACHE_DIR, "mercado")
+
+def _listar_snapshots():
+    """
+    Caminhos dos snapshots do mercado, do mais antigo para o mais recente.
+    """
+    diretorio = _snapshots_dir()
+    if not os.path.isdir(diretorio):
+        return []
+    nomes = sorted(n for n in os.listdir(diretorio) if n.startswith("mercado-") and n.endswith(".json.gz"))
+    return [os.path.join(diretorio, n) for n in nomes]
+
+def load_ultimo_snapshot_mercado():
+    """
+    Lê o snapshot mais recente do mercado.
+    Retorna dict com 'fetched_at', 'etag', 'last_modified' e 'payload', ou None.
+    """
+    for caminho in reversed(_listar_snapshots()):
+        try:
+            with gzip.open(caminho, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Aviso: snapshot do mercado ilegível ({caminho}): {e}")
+    return None
+
+def _salvar_snapshot_mercado(payload, etag=None, last_modified=None):
+    diretorio = _snapshots_dir()
+    os.makedirs(diretorio, exist_ok=True)
+    agora = time.time()
+    nome = time.strftime("mercado-%Y%m%dT%H%M%S", time.gmtime(agora)) + f".{int(agora * 1e6) % 1_000_000:06d}.json.gz"
+    caminho = os.path.join(diretorio, nome)
+    snapshot = {'fetched_at': agora, 'etag': etag, 'last_modified': last_modified, 'payload': payload}
+    tmp = f"{caminho}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp, caminho)
+    _prune_snapshots_mercado()
+
+def _prune_snapshots_mercado():
+    """
+    Mantém no máximo MERCADO_SNAPSHOTS_MAX snapshots e apaga os mais velhos que
+    MERCADO_SNAPSHOTS_MAX_AGE_DAYS, preservando sempre o mais recente.
+    """
+    snapshots = _listar_snapshots()
+    limite = time.time() - MERCADO_SNAPSHOTS_MAX_AGE_DAYS * 86400
+    for i, caminho in enumerate(snapshots[:-1]):
+        excedente = i < len(snapshots) - MERCADO_SNAPSHOTS_MAX
+        try:
+            if excedente or os.path.getmtime(caminho) < limite:
+                os.remove(caminho)
+        except OSError:
+            pass
+
+def fetch_mercado_snapshot():
     """
-    Busca dados do mercado atual do Cartola API.
-    Retorna uma lista de dicionários com atletas.
+    Busca o mercado com GET condicional (If-None-Match / If-Modified-Since)
+    a partir do último snapshot salvo. Sem chamadas ao Streamlit (pode rodar em thread).
+    Retorna (atletas, origem), com origem:
+      'api'     - payload novo baixado e salvo como snapshot
+      '304'     - mercado inalterado, servido do snapshot
+      'offline' - API indisponível, servido do último snapshot
+      'erro'    - API indisponível e nenhum snapshot salvo
     """
-    url = "https://api.cartola.globo.com/atletas/mercado"
+    url = f"{CARTOLA_API}/atletas/mercado"
+    ultimo = load_ultimo_snapshot_mercado()
+
+    headers = {}
+    if ultimo:
+        if ultimo.get('etag'):
+            headers["If-None-Match"] = ultimo['etag']
+        if ultimo.get('last_modified'):
+            headers["If-Modified-Since"] = ultimo['last_modified']
+
     try:
-        response = requests.get(url)
+        response = http_client.get(url, headers=headers)
+        if response.status_code == 304 and ultimo:
+            return ultimo['payload'].get('atletas', []), '304'
         if response.status_code == 200:
             data = response.json()
-            return data.get('atletas', [])
-        else:
-            print(f"Erro API Mercado: {response.status_code}")
-            return []
+            try:
+                _salvar_snapshot_mercado(data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            except OSError as e:
+                print(f"Aviso: snapshot do mercado não salvo: {e}")
+            return data.get('atletas', []), 'api'
+        print(f"Erro API Mercado: {response.status_code}")
     except Exception as e:
         print(f"Erro Request Mercado: {e}")
-        return []
 
-def validate_gato_mestre_token(token):
+    if ultimo:
+        return ultimo['payload'].get('atletas', []), 'offline'
+    return [], 'erro'
+
+def _parse_gato_mestre(data):
     """
-    Valida se o token do Gato Mestre está ativo e retornando dados.
-    Tenta múltiplos formatos de header.
+    Extrai o mapa {atleta_id: minimo_para_valorizar} da resposta do Gato Mestre.
+    Retorna (mpv_map, formato) ou ({}, None) se a estrutura não for reconhecida.
     """
-    if not token:
-        return False, "Token vazio"
-        
-    # Remove prefixo Bearer se existir e limpa
-    clean_token = token.strip().strip('"').strip("'")
-    if clean_token.lower().startswith("bearer "):
-        clean_token = clean_token[7:].strip()
-    
-    url = "https://api.cartola.globo.com/auth/gatomestre/atletas"
-    
-    # Tentativa 1: X-GLB-Token
-    headers_1 = {
-        "User-Agent": "Mozilla/5.0",
-        "X-GLB-Token": clean_token
-    }
-    
-    # Tentativa 2: Bearer
-    headers_2 = {
-        "User-Agent": "Mozilla/5.0",
-        "Authorization": f"Bearer {clean_token}"
-    }
+    mpv_map = {}
+
+    # CASE 1: Response is a Dict of IDs -> Info (User's log format)
+    # {"100084": {"minimo_para_valorizar": 3.18, ...}, ...}
+    if isinstance(data, dict):
+        # Check if it's the specific format (keys are IDs, values have 'minimo_para_valorizar')
+        sample_key = next(iter(data), None)
+        if sample_key and isinstance(data[sample_key], dict) and 'minimo_para_valorizar' in data[sample_key]:
+            for aid_str, info in data.items():
+                try:
+                    aid = int(aid_str)
+                    mpv_map[aid] = float(info.get('minimo_para_valorizar', 0.0))
+                except:
+                    pass
+            return mpv_map, "Dict"
+
+        # CASE 2: Response has 'atletas' key (Legacy/Alternative)
+        elif 'atletas' in data:
+            for a in data['atletas']:
+                if 'atleta_id' in a and 'minimo_para_valorizar' in a:
+                    mpv_map[int(a['atleta_id'])] = float(a['minimo_para_valorizar'])
+            return mpv_map, "List"
+
+    # CASE 3: List of objects
+    elif isinstance(data, list):
+        for a in data:
+            if 'atleta_id' in a and 'minimo_para_valorizar' in a:
+                mpv_map[int(a['atleta_id'])] = float(a['minimo_para_valorizar'])
+        return mpv_map, "Direct List"
+
+    return {}, None
+
+# Estilo de auth (endpoint, header) que funcionou por token, para pular tentativas que falham
+_GM_AUTH_PREFERIDA = {}
+
+GM_AUTH_ESTILOS = {
+    "Bearer": lambda t: {"Authorization": f"Bearer {t}"},
+    "X-GLB-Token": lambda t: {"X-GLB-Token": t}
+}
 
+def _gm_request(url, estilo, clean_token):
+    """
+    Uma requisição ao Gato Mestre. Retorna (status, mpv_map, formato).
+    """
+    headers = {**GM_HEADERS_BASE, **GM_AUTH_ESTILOS[estilo](clean_token)}
     try:
-        # Try Method 1
-        response = requests.get(url, headers=headers_1)
+        response = http_client.get(url, headers=headers)
         if response.status_code == 200:
-            return True, "Token Válido (X-GLB-Token)"
-        
-        # If 401/403, Try Method 2
-        if response.status_code in [401, 403]:
-            response2 = requests.get(url, headers=headers_2)
-            if response2.status_code == 200:
-                return True, "Token Válido (Bearer)"
-            else:
-                return False, f"Token Inválido (401) - Verifique se copiou corretamente."
-        else:
-            return False, f"Erro API: {response.status_code}"
-            
+            return (200,) + _parse_gato_mestre(response.json())
+        return response.status_code, {}, None
     except Exception as e:
-        return False, f"Erro de Conexão: {e}"
+        print(f"Erro GM ({url}): {e}")
+        raise
 
-@st.cache_data(ttl=300, show_spinner=False)
-def fetch_gato_mestre_data(token):
+def fetch_gato_mestre(token):
     """
-    Busca dados do Gato Mestre (Mínimo para Valorizar) usando token.
-    Tenta múltiplos endpoints e suporta formato de Dicionário (ID -> Dados).
+    Valida o token e busca o Mínimo para Valorizar com a mesma resposta.
+    Se já se sabe qual endpoint/header funciona para o token, tenta só ele;
+    senão percorre os endpoints em ordem, disputando em paralelo só os estilos
+    de header de cada um (a resposta do GM é grande: disparar todos os endpoints
+    juntos baixaria o corpo inteiro mais de uma vez).
+    Não chama o Streamlit (pode rodar em thread).
+    Retorna dict com 'valido', 'msg', 'mpv_map' e 'formato'.
     """
     if not token:
-        return {}
-        
-    clean_token = token.strip().strip('"').strip("'")
-    if clean_token.lower().startswith("bearer "):
-        clean_token = clean_token[7:].strip()
+        return {'valido': False, 'msg': "Token vazio", 'mpv_map': {}, 'formato': None}
 
-    # Endpoints to try
-    endpoints = [
-        "https://api.cartola.globo.com/auth/gatomestre/atletas",
-        "https://api.cartola.globo.com/auth/mercado/atleta/gatomestre"
-    ]
-    
-    # Headers mimicking the user's browser
-    headers_base = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/plain, */*",
-        "x-glb-app-name": "cartola-web"
-    }
-    
-    for url in endpoints:
-        # Auth: Bearer is standard for this endpoint based on user logs
-        headers = headers_base.copy()
-        headers["Authorization"] = f"Bearer {clean_token}"
-        
+    clean_token = _clean_token(token)
+    chave = hashlib.sha256(clean_token.encode()).hexdigest()
+
+    preferida = _GM_AUTH_PREFERIDA.get(chave)
+    if preferida:
         try:
-            response = requests.get(url, headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                mpv_map = {}
-                
-                # CASE 1: Response is a Dict of IDs -> Info (User's log format)
-                # {"100084": {"minimo_para_valorizar": 3.18, ...}, ...}
-                if isinstance(data, dict):
-                    # Check if it's the specific format (keys are IDs, values have 'minimo_para_valorizar')
-                    sample_key = next(iter(data), None)
-                    if sample_key and isinstance(data[sample_key], dict) and 'minimo_para_valorizar' in data[sample_key]:
-                         for aid_str, info in data.items():
-                            try:
-                                aid = int(aid_str)
-                                mpv_map[aid] = float(info.get('minimo_para_valorizar', 0.0))
-                            except:
-                                pass
-                         if mpv_map:
-                             st.toast(f"GM: {len(mpv_map)} mínimos carregados (Dict)!", icon="💰")
-                             return mpv_map
-
-                    # CASE 2: Response has 'atletas' key (Legacy/Alternative)
-                    elif 'atletas' in data:
-                        atletas_list = data['atletas']
-                        for a in atletas_list:
-                             if 'atleta_id' in a and 'minimo_para_valorizar' in a:
-                                 mpv_map[int(a['atleta_id'])] = float(a['minimo_para_valorizar'])
-                        if mpv_map:
-                             st.toast(f"GM: {len(mpv_map)} mínimos carregados (List)!", icon="💰")
-                             return mpv_map
-
-                # CASE 3: List of objects
-                elif isinstance(data, list):
-                     for a in data:
-                         if 'atleta_id' in a and 'minimo_para_valorizar' in a:
-                             mpv_map[int(a['atleta_id'])] = float(a['minimo_para_valorizar'])
-                     if mpv_map:
-                         st.toast(f"GM: {len(mpv_map)} mínimos carregados (Direct List)!", icon="💰")
-                         return mpv_map
-                         
-        except Exception as e:
-            print(f"Erro GM ({url}): {e}")
-            continue
+            status, mpv_map, formato = _gm_request(preferida[0], preferida[1], clean_token)
+            if status == 200 and mpv_map:
+                return {'valido': True, 'msg': f"Token Válido ({preferida[1]})", 'mpv_map': mpv_map, 'formato': formato,
+                        'rota_lembrada': True}
+        except Exception:
+            pass
+        _GM_AUTH_PREFERIDA.pop(chave, None)
+
+    # Auth: Bearer is standard for this endpoint based on user logs
+    tentativas, resultados = [], []
+    for url in GM_ENDPOINTS:
+        estilos = [(url, estilo) for estilo in GM_AUTH_ESTILOS]
+        funcoes = [lambda u=u, e=e: _gm_request(u, e, clean_token) for u, e in estilos]
+        vencedor, parciais = _corrida(funcoes, lambda r: r[0] == 200 and bool(r[1]))
+        if vencedor is not None:
+            _GM_AUTH_PREFERIDA[chave] = estilos[vencedor]
+            _, mpv_map, formato = parciais[vencedor]
+            return {'valido': True, 'msg': f"Token Válido ({estilos[vencedor][1]})", 'mpv_map': mpv_map, 'formato': formato}
+        tentativas += estilos
+        resultados += parciais
+
+    respostas = [(t, r) for t, r in zip(tentativas, resultados) if not isinstance(r, Exception)]
+    aceitas = [t for t, r in respostas if r[0] == 200]
+    if aceitas:
+        return {'valido': True, 'msg': f"Token Válido ({aceitas[0][1]})", 'mpv_map': {}, 'formato': None}
+    if not respostas:
+        return {'valido': False, 'msg': f"Erro de Conexão: {resultados[0]}", 'mpv_map': {}, 'formato': None}
+    if all(r[0] in [401, 403] for _, r in respostas):
+        return {'valido': False, 'msg': "Token Inválido (401) - Verifique se copiou corretamente.", 'mpv_map': {}, 'formato': None}
+    status = next(r[0] for _, r in respostas if r[0] not in [401, 403])
+    return {'valido': False, 'msg': f"Erro API: {status}", 'mpv_map': {}, 'formato': None}
 
-    st.toast("GM: Dados não encontrados ou estrutura desconhecida.", icon="⚠️")
-    return {}
+def validate_gato_mestre_token(token):
+    """
+    Valida se o token do Gato Mestre está ativo e retornando dados.
+    Tenta múltiplos formatos de header.
+    """
+    gm = fetch_gato_mestre(token)
+    return gm['valido'], gm['msg']
+
+def refresh_mercado(token):
+    """
+    Atualiza mercado e Gato Mestre em paralelo: a latência fica próxima da
+    requisição mais lenta, e não da soma de todas.
+    A validação do token sai da mesma resposta que traz os dados do GM.
+    Não chama o Streamlit (as mensagens ficam a cargo de quem chama).
+    Não usa o st.cache: o mercado é sempre revalidado (GET condicional contra o
+    snapshot em disco) e o GM só lembra qual endpoint/header funciona por token.
+    Os acessos contam nos namespaces NS_MERCADO (hit = 304, servido do snapshot;
+    miss = baixado da API; 'offline'/'erro' contados à parte) e NS_GATO_MESTRE
+    (hit = rota lembrada funcionou, sem disparar a corrida).
+    Retorna dict com 'atletas', 'mercado_origem', 'gm_valido', 'gm_msg', 'mpv_map' e 'gm_formato'.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        f_mercado = pool.submit(fetch_mercado_snapshot)
+        f_gm = pool.submit(fetch_gato_mestre, token)
+        gm = f_gm.result()
+        atletas, origem = f_mercado.result()
+
+    if origem in ('api', '304'):
+        cache_namespaces.record(cache_namespaces.NS_MERCADO, origem == '304')
+    else:
+        # API fora do ar: não é acerto de cache, mesmo quando o snapshot salva o dia
+        cache_namespaces.count(cache_namespaces.NS_MERCADO, origem)
+    if token:
+        cache_namespaces.record(cache_namespaces.NS_GATO_MESTRE, gm.get('rota_lembrada', False))
+
+    return {
+        'atletas': atletas,
+        'mercado_origem': origem,
+        'gm_valido': gm['valido'],
+        'gm_msg': gm['msg'],
+        'mpv_map': gm['mpv_map'],
+        'gm_formato': gm['formato']
+    }
+
+TEAMS_LOGO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "teams")
+
+# Nomes alternativos -> arquivo (sem extensão) em assets/teams
+LOGO_ALIASES = {
+    'Bragantino': 'red_bull_bragantino',
+    'RB Bragantino': 'red_bull_bragantino',
+    'Red Bull Bragantino': 'red_bull_bragantino',
+    'Atlético Mineiro': 'atletico_mg',
+    'Athletico Paranaense': 'athletico_pr',
+    'Vasco da Gama': 'vasco',
+}
+
+_logo_index = {'mtime': None, 'paths': {}, 'missing': []}
+_logo_index_lock = threading.Lock()
+
+def _logo_key(name):
+    # Remove acentos e lower, e remove hifens/underscores/espaços para garantir match
+    return normalize_name(name).lower().replace(" ", "").replace("-", "").replace("_", "").replace(".", "")
+
+def _build_logo_index(logos_dir):
+    """
+    Mapeia nome do arquivo, nomes canônicos do CLUB_MAP, IDs do CLUB_MAP e
+    aliases para o caminho do logo.
+    """
+    paths = {}
+    for f in sorted(os.listdir(logos_dir)):
+        caminho = os.path.join(logos_dir, f)
+        if os.path.isfile(caminho):
+            paths[_logo_key(os.path.splitext(f)[0])] = caminho
+
+    for alias, arquivo in LOGO_ALIASES.items():
+        if _logo_key(arquivo) in paths:
+            paths[_logo_key(alias)] = paths[_logo_key(arquivo)]
+
+    missing = set()
+    for cid, nome in CLUB_MAP.items():
+        caminho = paths.get(_logo_key(nome))
+        if caminho:
+            paths[cid] = caminho
+        else:
+            missing.add(nome)
+    return paths, sorted(missing)
+
+def _get_logo_index():
+    """
+    Índice de logos, reconstruído só quando o mtime de assets/teams muda.
+    """
+    try:
+        mtime = os.stat(TEAMS_LOGO_DIR).st_mtime_ns
+    except OSError:
+        return {}
+    if _logo_index['mtime'] != mtime:
+        with _logo_index_lock:
+            if _logo_index['mtime'] != mtime:
+                paths, missing = _build_logo_index(TEAMS_LOGO_DIR)
+                if missing:
+                    print(f"Aviso: clubes do CLUB_MAP sem logo em assets/teams: {', '.join(missing)}")
+                _logo_index.update(paths=paths, missing=missing, mtime=mtime)
+    return _logo_index['paths']
+
+def missing_team_logos():
+    """
+    Clubes do CLUB_MAP sem arquivo de logo correspondente.
+    """
+    _get_logo_index()
+    return list(_logo_index['missing'])
 
 def get_team_logo_path(team_name):
     """
-    Retorna o caminho para o logo do time em assets/logos/.
-    Tenta mapear o nome para o arquivo correspondente.
+    Retorna o caminho para o logo do time em assets/teams/.
+    Aceita nome do clube (com ou sem acento/hífen), alias ou ID do CLUB_MAP.
     """
     if not team_name:
         return ""
-        
-    # Normalização simples para encontrar arquivo
-    # Ex: "Atlético-MG" -> "atletico-mg.png" ou "atleticomg.png"
-    # User tem assets/logos/
-    
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    logos_dir = os.path.join(base_dir, "assets", "teams")
-    
-    if not os.path.exists(logos_dir):
-        return ""
-        
-    # Tenta encontrar arquivo com match aproximado
-    # Remove acentos e lower, e remove hifens/underscores para garantir match
-    clean_name = normalize_name(team_name).lower().replace(" ", "").replace("-", "").replace("_", "")
-    
-    # Lista arquivos
-    try:
-        files = os.listdir(logos_dir)
-        for f in files:
-            f_clean = f.lower().replace("_", "").replace("-", "").replace(" ", "").split(".")[0]
-            if f_clean == clean_name or clean_name in f_clean:
-                 return os.path.join(logos_dir, f)
-                 
-        # Fallback: tentar direto nome ex: Flamengo.png
-        direct_path = os.path.join(logos_dir, f"{team_name}.png")
-        if os.path.exists(direct_path):
-            return direct_path
-            
-    except Exception:
-        pass
-        
-    return ""
+    index = _get_logo_index()
+    return index.get(_logo_key(team_name)) or index.get(str(team_name), "")
 
 def get_file_base64(file_path):
     """
@@ -267,173 +470,434 @@ def get_file_base64(file_path):
         data = f.read()
     return base64.b64encode(data).decode()
 
+def _map_unique(serie, func):
+    """
+    Aplica `func` uma única vez por valor distinto da Series e replica o resultado.
+    """
+    codes, uniques = pd.factorize(serie, use_na_sentinel=True)
+    valores = [func(u) for u in uniques]
+    valores.append(func(np.nan))  # Código -1 (NaN) cai na última posição
+    return pd.Series(np.array(valores, dtype=object)[codes], index=serie.index)
+
+# Nomes distintos são poucos perto do número de chamadas: memoiza a normalização
+NORMALIZE_CACHE_SIZE = 65536
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_str(texto):
+    nfkd_form = unicodedata.normalize('NFKD', texto)
+    return u"".join([c for c in nfkd_form if not unicodedata.combining(c)]).upper().strip()
+
 def normalize_name(name):
     """
     Normaliza nomes removendo acentos e convertendo para maiúsculas.
     """
     if pd.isna(name):
         return ""
-    nfkd_form = unicodedata.normalize('NFKD', str(name))
-    return u"".join([c for c in nfkd_form if not unicodedata.combining(c)]).upper().strip()
+    return _normalize_str(str(name))
 
-def load_data(file_path):
+def normalize_series(serie):
     """
-    Carrega os dados da planilha Excel do usuário (Aba 'Por jogo').
-    Realiza a limpeza inicial e garante os tipos de dados corretos.
+    Versão em lote de normalize_name: normaliza cada valor distinto uma vez
+    e replica o resultado para todas as linhas da Series.
+    """
+    return _map_unique(serie, normalize_name)
+
+# Leitura de Excel: usa o engine mais rápido instalado (calamine), com fallback para openpyxl
+EXCEL_ENGINES = ['calamine', 'openpyxl']
+
+# Colunas da aba 'Por jogo' efetivamente usadas pelo app
+# (Posicao, Preco e MinValorizar alimentam o seletor de jogadores do editor)
+DATA_COLUMNS = ['Data', 'Nome2', 'Jogador', 'Time', 'PosReal', 'PosID', 'Mand', 'Adversário',
+                'Pts', 'Básica', 'G', 'A', 'DE', 'SG', 'FS', 'FF', 'FD', 'DS', 'CA', 'CV',
+                'GS', 'PP', 'PC', 'FC', 'I', 'PI', 'Posicao', 'Preco', 'MinValorizar']
+
+def _engine_disponivel(engine):
+    if engine == 'calamine':
+        # Engine 'calamine' existe no pandas a partir da 2.2
+        versao = tuple(int(x) for x in pd.__version__.split('.')[:2])
+        if versao < (2, 2):
+            return False
+        modulo = 'python_calamine'
+    else:
+        modulo = engine
+    try:
+        __import__(modulo)
+        return True
+    except ImportError:
+        return False
+
+def excel_engines():
+    """
+    Lista os engines de Excel instalados, do mais rápido para o mais lento.
+    """
+    return [e for e in EXCEL_ENGINES if _engine_disponivel(e)]
+
+def read_excel(file_obj, engine=None, **kwargs):
+    """
+    Wrapper de pd.read_excel que escolhe o engine mais rápido disponível.
+    Se o engine preferido falhar no arquivo, tenta o próximo da lista.
+    """
+    engines = [engine] if engine else excel_engines()
+    erro = None
+    for eng in engines:
+        try:
+            if hasattr(file_obj, 'seek'):
+                file_obj.seek(0)
+            return pd.read_excel(file_obj, engine=eng, **kwargs)
+        except Exception as e:
+            # Cada engine tem suas exceções (python_calamine.CalamineError herda
+            # direto de Exception, openpyxl lança BadZipFile/KeyError...)
+            erro = e
+            print(f"Aviso: leitura com engine '{eng}' falhou ({e})")
+    raise erro if erro else ValueError("Nenhum engine de Excel disponível.")
+
+# Cache em disco da planilha já limpa (Feather, lido via memory-map)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+DATA_CACHE_VERSION = 3  # Incrementar ao mudar a limpeza feita em load_data
+DATA_CACHE_MAX_MB = 512
+DATA_CACHE_MAX_AGE_DAYS = 30
+
+def _read_file_bytes(file_path):
+    """
+    Lê o conteúdo bruto de um caminho ou de um arquivo enviado (UploadedFile/BytesIO).
+    """
+    if isinstance(file_path, (str, os.PathLike)):
+        with open(file_path, "rb") as f:
+            return f.read()
+    if hasattr(file_path, "getvalue"):
+        return file_path.getvalue()
+    conteudo = file_path.read()
+    file_path.seek(0)
+    return conteudo
+
+def file_hash(conteudo):
+    """
+    Hash SHA-256 (hex) do conteúdo de um arquivo, usado como chave de cache.
+    """
+    return hashlib.sha256(conteudo).hexdigest()
+
+def prune_cache_dir(diretorio, max_mb, max_age_days):
+    """
+    Remove do diretório os arquivos mais velhos que `max_age_days` e, se o total
+    ainda passar de `max_mb`, apaga os menos usados recentemente (mtime) primeiro.
     """
+    if not os.path.isdir(diretorio):
+        return
+    agora = time.time()
+    entradas = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            continue
+        if not os.path.isfile(caminho):
+            continue
+        if agora - info.st_mtime > max_age_days * 86400:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+            continue
+        entradas.append((info.st_mtime, info.st_size, caminho))
+
+    total = sum(e[1] for e in entradas)
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= max_mb * 1024 * 1024:
+            break
+        try:
+            os.remove(caminho)
+            total -= tamanho
+        except OSError:
+            pass
+
+def _data_cache_path(chave):
+    return os.path.join(CACHE_DIR, "dados", f"{chave}-v{DATA_CACHE_VERSION}.feather")
+
+def _read_data_cache(chave):
+    caminho = _data_cache_path(chave)
+    if not os.path.exists(caminho):
+        return None
     try:
-        df = pd.read_excel(file_path, sheet_name='Por jogo')
+        df = feather.read_table(caminho, memory_map=True).to_pandas()
+        os.utime(caminho)  # Marca uso recente para a política de remoção
+        return df
+    except Exception as e:
+        print(f"Aviso: cache de dados ignorado ({e})")
+        return None
+
+def _write_data_cache(chave, df):
+    caminho = _data_cache_path(chave)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp = f"{caminho}.{threading.get_ident()}.tmp"
+    try:
+        feather.write_feather(df, tmp, compression="uncompressed")
+        os.replace(tmp, caminho)
+    except Exception as e:
+        # Colunas com tipos mistos não são serializáveis em Arrow: segue sem cache
+        print(f"Aviso: não foi possível gravar o cache de dados ({e})")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return
+    prune_cache_dir(os.path.dirname(caminho), DATA_CACHE_MAX_MB, DATA_CACHE_MAX_AGE_DAYS)
+
+def _parse_data(file_obj):
+    """
+    Lê a aba 'Por jogo' e aplica a limpeza do load_data.
+    """
+    df = read_excel(file_obj, sheet_name='Por jogo', usecols=lambda c: c in DATA_COLUMNS)
+    
+    # Parse Data
+    if 'Data' in df.columns:
+        # Tenta inferir formato, assumindo dia primeiro (DD/MM/AAAA)
+        df['Data_dt'] = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce')
+    else:
+        raise ValueError("Coluna 'Data' não encontrada.")
         
-        # Parse Data
-        if 'Data' in df.columns:
-            # Tenta inferir formato, assumindo dia primeiro (DD/MM/AAAA)
-            df['Data_dt'] = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce')
-        else:
-            raise ValueError("Coluna 'Data' não encontrada.")
+    if 'Nome2' in df.columns:
+        target_col = 'Nome2'
+    elif 'Jogador' in df.columns:
+        target_col = 'Jogador'
+    else:
+        raise ValueError("Coluna de nome do jogador (Nome2 ou Jogador) não encontrada.")
+
+    df['Jogador_Norm'] = normalize_series(df[target_col])
+    df['Jogador_Original'] = df[target_col]
+    
+    if 'Time' in df.columns:
+        # As vezes o time vem como ID ou Nome. Inspect mostrou 'Time'.
+        df['Time_Norm'] = normalize_series(df['Time'])
+    
+    if 'PosReal' in df.columns:
+         df['Posicao_Norm'] = normalize_series(df['PosReal'])
+
+    # Converter colunas numéricas
+    numeric_cols = ['Pts', 'Básica', 'G', 'A', 'DE', 'SG', 'FS', 'FF', 'FD', 'DS', 'CA', 'CV', 'GS', 'PP', 'PC', 'FC', 'I', 'PI']
+    for col in numeric_cols:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
             
-        if 'Nome2' in df.columns:
-            target_col = 'Nome2'
-        elif 'Jogador' in df.columns:
-            target_col = 'Jogador'
-        else:
-            raise ValueError("Coluna de nome do jogador (Nome2 ou Jogador) não encontrada.")
+    return df
 
-        df['Jogador_Norm'] = df[target_col].apply(normalize_name)
-        df['Jogador_Original'] = df[target_col]
-        
-        if 'Time' in df.columns:
-            # As vezes o time vem como ID ou Nome. Inspect mostrou 'Time'.
-            df['Time_Norm'] = df['Time'].apply(normalize_name)
-        
-        if 'PosReal' in df.columns:
-             df['Posicao_Norm'] = df['PosReal'].apply(normalize_name)
-
-        # Converter colunas numéricas
-        numeric_cols = ['Pts', 'Básica', 'G', 'A', 'DE', 'SG', 'FS', 'FF', 'FD', 'DS', 'CA', 'CV', 'GS', 'PP', 'PC', 'FC', 'I', 'PI']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                
+def load_data(file_path, use_cache=True):
+    """
+    Carrega os dados da planilha Excel do usuário (Aba 'Por jogo').
+    Realiza a limpeza inicial e garante os tipos de dados corretos.
+    O DataFrame limpo fica em cache no disco, indexado pelo hash do conteúdo,
+    então reabrir a mesma planilha não refaz o parse do XLSX.
+    """
+    try:
+        conteudo = _read_file_bytes(file_path)
+        chave = file_hash(conteudo)
+
+        if use_cache and feather is not None:
+            df = _read_data_cache(chave)
+            if df is not None:
+                return df
+
+        df = _parse_data(io.BytesIO(conteudo))
+
+        if use_cache and feather is not None:
+            _write_data_cache(chave, df)
         return df
     except Exception as e:
         raise ValueError(f"Erro ao carregar arquivo de dados: {e}")
 
 
+def _frame_com_cabecalho(raw, header_idx):
+    """
+    Usa a linha `header_idx` de um DataFrame lido com header=None como cabeçalho,
+    com a mesma nomeação do pandas (Unnamed: N, duplicadas com sufixo .N).
+    """
+    if header_idx >= len(raw):
+        return pd.DataFrame()
+    nomes = []
+    vistos = {}
+    for i, valor in enumerate(raw.iloc[header_idx].tolist()):
+        nome = f"Unnamed: {i}" if pd.isna(valor) else valor
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        nomes.append(nome)
+    df = raw.iloc[header_idx + 1:].reset_index(drop=True)
+    df.columns = nomes
+    return df
+
+def _detectar_cabecalho(raw):
+    """
+    Encontra, em memória, a linha de cabeçalho da planilha de classificação.
+    """
+    valores = raw.astype(str).apply(lambda col: col.str.upper())
+    tem_jogador = (valores == 'JOGADOR').any(axis=1)
+    tem_class = valores.isin(['CLASSIFICACAO', 'CLASSIFICAÇÃO']).any(axis=1)
+    candidatas = np.flatnonzero((tem_jogador & tem_class).to_numpy())
+    if len(candidatas):
+        return int(candidatas[0])
+
+    # Fallback para header=1 (comum em planilhas formatadas)
+    if len(raw) > 1:
+        cols_h1 = [str(c).upper() for c in _frame_com_cabecalho(raw, 1).columns]
+        if '1º VOLANTE' in cols_h1 or 'MEIA' in cols_h1:
+            return 1
+    return 0
+
+def _mapping_classificacao(df):
+    """
+    Monta o mapa jogador -> VOLANTE/MEIA (ou classificação explícita) com operações de coluna.
+    """
+    # Normalizar Colunas
+    df.columns = [str(c).strip().upper() for c in df.columns]
+
+    col_jogador = next((c for c in df.columns if 'JOGADOR' in c), None)
+    col_class = next((c for c in df.columns if 'CLASSIFICA' in c), None)
+    if not col_jogador or df.empty:
+        return {}
+
+    # Célula vazia não vira jogador 'NAN'
+    jogadores = df[col_jogador].dropna()
+    nomes = normalize_series(jogadores.astype(str)).reindex(df.index, fill_value='')
+    vazio = pd.Series(False, index=df.index)
+
+    # Prioridade: coluna Classificacao > formato Wide (1º/2º VOLANTE) > MEIA
+    valores = pd.Series(np.nan, index=df.index, dtype=object)
+    tem_class = df[col_class].notna() if col_class else vazio
+    if col_class:
+        valores[tem_class] = normalize_series(df.loc[tem_class, col_class].astype(str))
+
+    is_volante = vazio.copy()
+    for col in ['1º VOLANTE', '2º VOLANTE']:
+        if col in df.columns:
+            is_volante |= df[col].notna()
+    is_meia = df['MEIA'].notna() if 'MEIA' in df.columns else vazio
+
+    valores[~tem_class & is_volante] = 'VOLANTE'
+    valores[~tem_class & ~is_volante & is_meia] = 'MEIA'
+
+    validos = (nomes != '') & valores.notna()
+    # Linhas posteriores sobrescrevem as anteriores, como no loop original
+    return dict(zip(nomes[validos], valores[validos]))
+
+@cache_namespaces.cached(cache_namespaces.NS_ARQUIVOS, show_spinner=False)
+def _load_classificacao_cached(chave, _conteudo, is_excel):
+    """
+    Parse único do arquivo de classificação, em cache pelo hash do conteúdo (`chave`).
+    """
+    if is_excel:
+        raw = read_excel(io.BytesIO(_conteudo), header=None)
+        df = _frame_com_cabecalho(raw, _detectar_cabecalho(raw))
+    else:
+        df = pd.read_csv(io.BytesIO(_conteudo), sep=None, engine='python')
+    return _mapping_classificacao(df)
+
 def load_classificacao(file_path):
     """
     Carrega o arquivo de classificação de Meias/Volantes (CSV ou Excel).
+    A planilha é lida uma única vez e o resultado fica em cache pelo hash do arquivo.
     """
     try:
-        if file_path.endswith('.xlsx'):
-            # Ler Excel, buscando cabeçalho correto
-            # O arquivo parece ter cabeçalho na linha 0 ou 1
-            df = pd.read_excel(file_path, header=None)
-            
-            # Encontrar linha de cabeçalho
-            header_idx = -1
-            for i, row in df.iterrows():
-                row_vals = [str(x).upper() for x in row.values]
-                if 'JOGADOR' in row_vals and ('CLASSIFICACAO' in row_vals or 'CLASSIFICAÇÃO' in row_vals):
-                    header_idx = i
-                    break
-            
-            if header_idx != -1:
-                df = pd.read_excel(file_path, header=header_idx)
-            else:
-                # Tenta fallback para header=1 (comum em planilhas formatadas)
-                try:
-                    df_h1 = pd.read_excel(file_path, header=1)
-                    cols_h1 = [str(c).upper() for c in df_h1.columns]
-                    if '1º VOLANTE' in cols_h1 or 'MEIA' in cols_h1:
-                        df = df_h1
-                    else:
-                         df = pd.read_excel(file_path)
-                except:
-                     df = pd.read_excel(file_path)
-
-        else:
-            df = pd.read_csv(file_path, sep=None, engine='python')
-            
-        # Normalizar Colunas
-        df.columns = [str(c).strip().upper() for c in df.columns]
-        
-        # LOGICA 1: Coluna 'CLASSIFICACAO' explícita
-        col_jogador = next((c for c in df.columns if 'JOGADOR' in c), None)
-        col_class = next((c for c in df.columns if 'CLASSIFICA' in c), None)
-        
-        mapping = {}
-        
-        if col_jogador:
-            # Iterar rows para preencher mapping
-            for _, row in df.iterrows():
-                nome = normalize_name(str(row[col_jogador]))
-                if not nome: continue
-                
-                # Check 1: Coluna Classificacao
-                if col_class and pd.notna(row[col_class]):
-                    mapping[nome] = normalize_name(str(row[col_class]))
-                    continue
-                
-                # Check 2: Formato Wide (1º VOLANTE, 2º VOLANTE, MEIA)
-                # Verifica marcadores nas colunas específicas
-                is_volante = False
-                if '1º VOLANTE' in df.columns and pd.notna(row['1º VOLANTE']): is_volante = True
-                if '2º VOLANTE' in df.columns and pd.notna(row['2º VOLANTE']): is_volante = True
-                
-                if is_volante:
-                    mapping[nome] = 'VOLANTE'
-                    continue
-                    
-                if 'MEIA' in df.columns and pd.notna(row['MEIA']):
-                    mapping[nome] = 'MEIA'
-                    continue
-        
-        return mapping
-            
+        nome = file_path if isinstance(file_path, str) else getattr(file_path, 'name', '')
+        conteudo = _read_file_bytes(file_path)
+        return dict(_load_classificacao_cached(file_hash(conteudo), conteudo, nome.endswith('.xlsx')))
     except Exception as e:
         print(f"Aviso: Classificação externa não carregada: {e}")
         return {}
 
-def parse_rodadas(file_path):
+class Calendario(dict):
     """
-    Lê o arquivo RODADAS_BRASILEIRAO_2026.txt e estrutura os dados.
+    Calendário no formato {time: [{rodada, oponente, mando}, ...]} com índices
+    para consulta O(1) por (time, rodada).
+    Os índices são montados na criação; após alterar o dicionário, chamar reindexar().
     """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reindexar()
+
+    def reindexar(self):
+        # reversed: em caso de duplicidade vale o primeiro jogo da lista, como na busca linear
+        self.indice = {(time, j['rodada']): j for time, jogos in self.items() for j in reversed(jogos)}
+        self.ordenados = {time: sorted(jogos, key=lambda j: j['rodada']) for time, jogos in self.items()}
+        self.por_mando = {}
+        for time, jogos in self.ordenados.items():
+            for j in jogos:
+                self.por_mando.setdefault((time, j['mando']), []).append(j['rodada'])
+
+    def jogo(self, time, rodada):
+        """Jogo do time na rodada, ou None."""
+        return self.indice.get((normalize_name(time), rodada))
+
+    def proximos_jogos(self, time, rodada, k=1):
+        """Até `k` jogos do time a partir da rodada informada (inclusive)."""
+        jogos = self.ordenados.get(normalize_name(time), [])
+        inicio = bisect.bisect_left([j['rodada'] for j in jogos], rodada)
+        return jogos[inicio:inicio + k]
+
+    def rodadas_por_mando(self, time, mando):
+        """Rodadas em que o time joga com o mando informado ('CASA' ou 'FORA')."""
+        return list(self.por_mando.get((normalize_name(time), mando), []))
+
+def _parse_rodadas_texto(texto):
     rodadas_data = {}
     current_rodada = None
-    
+
+    for line in texto.splitlines():
+        line = line.strip()
+        if not line: continue
+
+        if "RODADA" in line.upper():
+            parts = line.split()
+            for p in parts:
+                if p.isdigit():
+                    current_rodada = int(p)
+                    break
+            continue
+
+        if " x " in line:
+            times = line.split(" x ")
+            if len(times) == 2:
+                time_casa = normalize_name(times[0])
+                time_fora = normalize_name(times[1])
+
+                if current_rodada is not None:
+                    if time_casa not in rodadas_data: rodadas_data[time_casa] = []
+                    if time_fora not in rodadas_data: rodadas_data[time_fora] = []
+
+                    rodadas_data[time_casa].append({'rodada': current_rodada, 'oponente': time_fora, 'mando': 'CASA'})
+                    rodadas_data[time_fora].append({'rodada': current_rodada, 'oponente': time_casa, 'mando': 'FORA'})
+
+    return Calendario(rodadas_data)
+
+@cache_namespaces.cached(cache_namespaces.NS_ARQUIVOS, show_spinner=False)
+def _parse_rodadas_cached(chave, _fonte):
+    """
+    Parse em cache. `chave` identifica o conteúdo: (caminho, mtime, tamanho)
+    para arquivos em disco ou o hash do conteúdo para uploads.
+    """
+    if isinstance(_fonte, bytes):
+        texto = _fonte.decode('utf-8')
+    else:
+        with open(_fonte, 'r', encoding='utf-8') as f:
+            texto = f.read()
+    return _parse_rodadas_texto(texto)
+
+def parse_rodadas(file_path):
+    """
+    Lê o arquivo RODADAS_BRASILEIRAO_2026.txt e estrutura os dados.
+    Retorna um Calendario (dict {time: [jogos]} indexado por time/rodada).
+    O parse fica em cache enquanto o arquivo não mudar.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        for line in lines:
-            line = line.strip()
-            if not line: continue
-            
-            if "RODADA" in line.upper():
-                parts = line.split()
-                for p in parts:
-                    if p.isdigit():
-                        current_rodada = int(p)
-                        break
-                continue
-            
-            if " x " in line:
-                times = line.split(" x ")
-                if len(times) == 2:
-                    time_casa = normalize_name(times[0])
-                    time_fora = normalize_name(times[1])
-                    
-                    if current_rodada is not None:
-                        if time_casa not in rodadas_data: rodadas_data[time_casa] = []
-                        if time_fora not in rodadas_data: rodadas_data[time_fora] = []
-                        
-                        rodadas_data[time_casa].append({'rodada': current_rodada, 'oponente': time_fora, 'mando': 'CASA'})
-                        rodadas_data[time_fora].append({'rodada': current_rodada, 'oponente': time_casa, 'mando': 'FORA'})
-                        
-        return rodadas_data
+        if isinstance(file_path, (str, os.PathLike)):
+            info = os.stat(file_path)
+            chave = (os.path.abspath(file_path), info.st_mtime_ns, info.st_size)
+            return _parse_rodadas_cached(chave, file_path)
+        conteudo = _read_file_bytes(file_path)
+        return _parse_rodadas_cached(file_hash(conteudo), conteudo)
     except Exception as e:
         print(f"Erro ao ler rodadas: {e}")
-        return {}
+        return Calendario()
 
 def map_pos_id_to_name(pos_id):
     """
@@ -453,7 +917,75 @@ def map_pos_id_to_name(pos_id):
     except:
         return 'OUTROS'
 
+def _club_name(club_id):
+    # IDs podem chegar como float quando há nulos na coluna (262.0 -> '262')
+    if isinstance(club_id, float) and not pd.isna(club_id) and club_id.is_integer():
+        club_id = int(club_id)
+    elif pd.isna(club_id):
+        club_id = None
+    return CLUB_MAP.get(str(club_id), 'Outros')
+
+def _to_float(valor, padrao=0.0):
+    try:
+        x = float(valor)
+    except (TypeError, ValueError):
+        return padrao
+    return padrao if x != x else x  # NaN -> padrão
+
+def build_mercado_df(atletas, mpv_map=None):
+    """
+    Monta o DataFrame do mercado direto do JSON da API, numa passada só pelos
+    atletas em listas Python (o mercado tem ~800 atletas: montar e juntar
+    DataFrames intermediários custa mais que o próprio trabalho).
+    Clube, posição e nome normalizado são calculados uma vez por valor
+    distinto e o MPV vem do mapa indexado por id numérico.
+    Colunas: id, Jogador_Original, Jogador_Norm, Time, Posicao, Preco, MinValorizar.
+    """
+    colunas = ['id', 'Jogador_Original', 'Jogador_Norm', 'Time', 'Posicao', 'Preco', 'MinValorizar']
+    if not atletas:
+        return pd.DataFrame(columns=colunas)
+
+    mpv_por_id = {}
+    for aid, mpv in (mpv_map or {}).items():
+        chave = _to_float(aid, None)
+        if chave is not None:
+            mpv_por_id.setdefault(chave, _to_float(mpv))
+    clubes, posicoes, nomes = {}, {}, {}
+
+    ids, originais, normalizados, times, posicoes_col, precos, mpvs = [], [], [], [], [], [], []
+    for atleta in atletas:
+        aid = atleta.get('atleta_id')
+        apelido, nome = atleta.get('apelido'), atleta.get('nome')
+        jogador = apelido if apelido is not None else (nome if nome is not None else 'N/A')
+        clube, posicao = atleta.get('clube_id'), atleta.get('posicao_id')
+        if clube not in clubes:
+            clubes[clube] = _club_name(np.nan if clube is None else clube)
+        if posicao not in posicoes:
+            posicoes[posicao] = map_pos_id_to_name(posicao)
+        if jogador not in nomes:
+            nomes[jogador] = normalize_name(jogador)
+
+        ids.append(np.nan if aid is None else aid)
+        originais.append(jogador)
+        normalizados.append(nomes[jogador])
+        times.append(clubes[clube])
+        posicoes_col.append(posicoes[posicao])
+        precos.append(_to_float(atleta.get('preco_num')))
+        mpvs.append(mpv_por_id.get(_to_float(aid, None), 0.0))
+
+    return pd.DataFrame({
+        'id': ids,
+        'Jogador_Original': originais,
+        'Jogador_Norm': normalizados,
+        'Time': times,
+        'Posicao': posicoes_col,
+        'Preco': np.array(precos, dtype=float),
+        'MinValorizar': np.array(mpvs, dtype=float),
+    }, columns=colunas)
+
 def get_next_match_info(team_name, rodadas_data, target_round):
+    if isinstance(rodadas_data, Calendario):
+        return rodadas_data.jogo(team_name, target_round)
     team_clean = normalize_name(team_name)
     if team_clean in rodadas_data:
         for match in rodadas_data[team_clean]:
@@ -461,156 +993,172 @@ def get_next_match_info(team_name, rodadas_data, target_round):
                 return match
     return None
 
+# Scouts somados no ranking (mesma ordem usada pelo loop original)
+RANKING_SCOUTS = ['G', 'A', 'SG', 'DE', 'FS', 'FF', 'FD', 'DS', 'CA', 'CV', 'GS', 'PP', 'PC', 'FC', 'I', 'PI']
+
+MANDO_CASA = ['C', 'CASA', 'M', 'MANDANTE']
+MANDO_FORA = ['F', 'FORA', 'V', 'VISITANTE']
+
+def _select_ranking_rows(df, n_jogos, filter_type, target_round, rodadas_data, pos_map=None):
+    """
+    Seleciona, de forma vetorizada, as linhas dos últimos N jogos de cada time
+    e resolve a posição de cada linha.
+    Retorna as linhas na mesma ordem em que o loop original as visitava
+    (time por ordem de aparição, data decrescente).
+    """
+    base = df.assign(_ordem_time=pd.factorize(df['Time_Norm'])[0], _ordem_linha=np.arange(len(df)))
+
+    if filter_type == "Todas":
+        candidatas = base
+    elif filter_type == "Por Mando":
+        # Uma consulta de calendário por time (não por linha)
+        mando_por_time = {}
+        for time in base['Time_Norm'].unique():
+            next_match = get_next_match_info(time, rodadas_data, target_round)
+            if next_match:
+                mando_por_time[time] = next_match['mando']
+        alvo = base['Time_Norm'].map(mando_por_time)
+        mand_norm = base['Mand'].astype(str).str.upper().str.strip()
+        candidatas = base[
+            ((alvo == 'CASA') & mand_norm.isin(MANDO_CASA)) |
+            ((alvo == 'FORA') & mand_norm.isin(MANDO_FORA))
+        ]
+    else:
+        candidatas = base.iloc[0:0]
+
+    # Ranking denso das datas por time: as N datas mais recentes entram
+    rank_data = candidatas.groupby('Time_Norm')['Data_dt'].rank(method='dense', ascending=False)
+    elegiveis = candidatas.loc[rank_data <= n_jogos, ['Time_Norm', 'Data_dt']].drop_duplicates()
+
+    chave = pd.MultiIndex.from_frame(base[['Time_Norm', 'Data_dt']])
+    sel = base[chave.isin(pd.MultiIndex.from_frame(elegiveis))]
+    sel = sel.sort_values(['_ordem_time', 'Data_dt', '_ordem_linha'], ascending=[True, False, True])
+
+    # Detecção de Posição: mapa externo (Meia/Volante) com fallback para o ID da planilha
+    target_pos_col = 'PosReal' if 'PosReal' in sel.columns else 'PosID'
+    if target_pos_col in sel.columns:
+        pos_planilha = _map_unique(sel[target_pos_col], map_pos_id_to_name)
+    else:
+        pos_planilha = pd.Series(map_pos_id_to_name(0), index=sel.index, dtype=object)
+
+    if pos_map:
+        pos_externa = sel['Jogador_Norm'].map(pos_map)
+        usa_externa = pos_externa.fillna('').astype(str) != ''
+        pos_real = pos_externa.where(usa_externa, pos_planilha)
+    else:
+        pos_real = pos_planilha
+
+    return sel.assign(Pos_Resolvida=pos_real, Pos_Filtro=normalize_series(pos_real))
+
+def _build_ranking(sel, n_jogos, top_n_players):
+    """
+    Monta a estrutura de ranking (Nome, Time, Posicao, Jogos, totais, médias e Scouts)
+    a partir das linhas já selecionadas, com o corte de N jogos por jogador.
+    """
+    if sel.empty:
+        return []
+
+    # Primeira linha de cada jogador define Nome/Time/Posição (como no loop original)
+    if 'Jogador_Original' in sel.columns:
+        nome_col = 'Jogador_Original'
+    elif 'Nome2' in sel.columns:
+        nome_col = 'Nome2'
+    else:
+        nome_col = None
+    primeiras = sel.groupby('Jogador_Norm', sort=False).head(1)
+
+    # Corte dos últimos N jogos por jogador (data decrescente, estável)
+    jogos = sel.sort_values('Data_dt', ascending=False, kind='stable')
+    jogos = jogos[jogos.groupby('Jogador_Norm', sort=False).cumcount() < n_jogos]
+
+    zeros = pd.Series(0, index=jogos.index)
+    pts = jogos['Pts'] if 'Pts' in jogos.columns else zeros
+    basica = jogos['Básica'] if 'Básica' in jogos.columns else zeros
+    adversario = jogos['Adversário'] if 'Adversário' in jogos.columns else pd.Series('??', index=jogos.index)
+    casa = jogos['Mand'].astype(str).str.upper().isin(['C', 'CASA', 'M'])
+
+    scout_cols = [c for c in RANKING_SCOUTS if c in jogos.columns]
+    scouts = jogos[scout_cols]
+    scouts_pos = scouts.where(scouts > 0, 0).apply(np.trunc).astype(int)
+
+    scouts_totais = scouts_pos.groupby(jogos['Jogador_Norm'], sort=False).sum()
+
+    # Lista de jogos por jogador (única passagem pelas linhas selecionadas)
+    jogos_por_jogador = {}
+    matriz = scouts.to_numpy()
+    for nome_norm, data, adv, is_casa, p, b, linha in zip(
+        jogos['Jogador_Norm'], jogos['Data_dt'], adversario, casa, pts, basica, matriz
+    ):
+        jogos_por_jogador.setdefault(nome_norm, []).append({
+            'Data': data,
+            'Adversario': adv,
+            'Casa': bool(is_casa),
+            'Pontos': p,
+            'Basica': b,
+            'Scouts': {c: int(v) for c, v in zip(scout_cols, linha) if v > 0}
+        })
+
+    divisor = n_jogos if n_jogos > 0 else 1
+    ranking = []
+    for nome_norm, nome, time, pos in zip(
+        primeiras['Jogador_Norm'],
+        primeiras[nome_col] if nome_col else ['Unknown'] * len(primeiras),
+        primeiras['Time'],
+        primeiras['Pos_Resolvida']
+    ):
+        # Soma sequencial na ordem dos jogos: mesmo arredondamento de ponto flutuante do loop original
+        lista_jogos = jogos_por_jogador[nome_norm]
+        total_pontos = sum(j['Pontos'] for j in lista_jogos)
+        total_basica = sum(j['Basica'] for j in lista_jogos)
+        scouts_jogador = {c: int(v) for c, v in scouts_totais.loc[nome_norm].items() if v > 0}
+        ranking.append({
+            'Nome': nome,
+            'Time': time,
+            'Posicao': pos,
+            'Jogos': lista_jogos,
+            'Total_Pontos': total_pontos,
+            'Total_Media_Basica': total_basica,
+            'Scouts': scouts_jogador,
+            'Media_Pontos': total_pontos / divisor,
+            'Media_Basica': total_basica / divisor
+        })
+
+    ranking.sort(key=lambda x: x['Total_Pontos'], reverse=True)
+    return ranking[:top_n_players]
+
 def process_ranking(df, n_jogos, filter_type, target_round, rodadas_data, top_n_players, posicao_filter=None, pos_map=None):
     """
     Processa o ranking baseado nos filtros.
+    Versão vetorizada (groupby/rank/cumcount); a saída é conferida contra o
+    loop original em tests/test_ranking.py.
     """
-    player_data = {}
-    times = df['Time_Norm'].unique()
-    
-    # Mapeamento do filtro de posição para nomes normalizados possíveis
     target_positions = []
     if posicao_filter:
         if isinstance(posicao_filter, str):
             target_positions = [normalize_name(posicao_filter)]
         else:
-             target_positions = [normalize_name(p) for p in posicao_filter]
+            target_positions = [normalize_name(p) for p in posicao_filter]
 
-    for time in times:
-        df_time = df[df['Time_Norm'] == time].copy()
-        
-        # REGRA DE OURO: Ordenação por DATA decrescente
-        df_time = df_time.sort_values(by='Data_dt', ascending=False)
-        
-        # Identificar Jogos do Time que entram
-        eligible_dates = []
-        
-        if filter_type == "Todas":
-            # Pega datas únicas dos últimos N jogos
-            unique_dates = df_time['Data_dt'].unique()
-            # unique já retorna sorted se veio do df sorted? 
-            # NÃO, unique devolve appearance order. Como df tá sorted clean, deve funfar.
-            # Melhor garantir:
-            unique_dates_sorted = sorted(unique_dates, reverse=True)
-            eligible_dates = unique_dates_sorted[:n_jogos]
-            
-        elif filter_type == "Por Mando":
-            next_match = get_next_match_info(time, rodadas_data, target_round)
-            if next_match:
-                target_mando = next_match['mando']
-                # Filtrar coluna 'Mand'
-                # 'C' ou 'Casa' ou 'M'
-                # Vamos normalizar a coluna Mand para garantir
-                df_time['Mand_Norm'] = df_time['Mand'].apply(lambda x: str(x).upper().strip())
-                
-                if target_mando == 'CASA':
-                    df_mando = df_time[df_time['Mand_Norm'].isin(['C', 'CASA', 'M', 'MANDANTE'])]
-                else:
-                    df_mando = df_time[df_time['Mand_Norm'].isin(['F', 'FORA', 'V', 'VISITANTE'])]
-                
-                unique_dates_sorted = sorted(df_mando['Data_dt'].unique(), reverse=True)
-                eligible_dates = unique_dates_sorted[:n_jogos]
-            else:
-                eligible_dates = []
-
-        # Pegar linhas desses jogos
-        df_selected = df_time[df_time['Data_dt'].isin(eligible_dates)]
-        
-        for _, row in df_selected.iterrows():
-            nome_norm = row['Jogador_Norm']
-            
-            # Detecção de Posição
-            # 1. Tenta pegar do mapa externo (Meia/Volante)
-            pos_real = None
-            if pos_map and nome_norm in pos_map:
-                pos_real = pos_map[nome_norm]
-            
-            # 2. Se não achou ou não é Meia/Volante, usa o ID da planilha convertido
-            if not pos_real:
-                # Usa 'PosReal' ou 'Posicao' ou 'PosID'
-                target_pos_col = 'PosReal' if 'PosReal' in row else 'PosID'
-                val_pos = row.get(target_pos_col, 0)
-                pos_real = map_pos_id_to_name(val_pos)
-            
-            # Filtro Posição
-            if target_positions:
-                if normalize_name(pos_real) not in target_positions:
-                    continue
-            
-            if nome_norm not in player_data:
-                player_data[nome_norm] = {
-                    'Nome': row.get('Jogador_Original', row.get('Nome2', 'Unknown')),
-                    'Time': row['Time'],
-                    'Posicao': pos_real,
-                    'Jogos': [],
-                    'Total_Pontos': 0.0,
-                    'Total_Media_Basica': 0.0,
-                    'Scouts': {}
-                }
-            
-            p = player_data[nome_norm]
-            
-            # Info do Jogo
-            mando_str = str(row['Mand']).upper()
-            is_casa = mando_str in ['C', 'CASA', 'M']
-            
-            game_scouts = {}
-            for col in ['G', 'A', 'SG', 'DE', 'FS', 'FF', 'FD', 'DS', 'CA', 'CV', 'GS', 'PP', 'PC', 'FC', 'I', 'PI']:
-                val = row.get(col, 0)
-                if val > 0:
-                    game_scouts[col] = int(val)
-                    p['Scouts'][col] = p['Scouts'].get(col, 0) + int(val)
-            
-            p['Jogos'].append({
-                'Data': row['Data_dt'],
-                'Adversario': row.get('Adversário', '??'),
-                'Casa': is_casa,
-                'Pontos': row.get('Pts', 0),
-                'Basica': row.get('Básica', 0),
-                'Scouts': game_scouts
-            })
-            
-            # Totais temporários (serão recalculados após o corte)
-            p['Total_Pontos'] += row.get('Pts', 0)
-            p['Total_Media_Basica'] += row.get('Básica', 0)
-            
-    # Finalizar Lista e Aplicar "Safety Net"
-    ranking = []
-    for nome, data in player_data.items():
-        # 1. Garantir ordem cronológica
-        data['Jogos'].sort(key=lambda x: x['Data'], reverse=True)
-        
-        # 2. Cortar excedentes (Safety Net)
-        if len(data['Jogos']) > n_jogos:
-            data['Jogos'] = data['Jogos'][:n_jogos]
-            
-            # 3. Recalcular Totais Baseado no Corte
-            data['Total_Pontos'] = sum(j['Pontos'] for j in data['Jogos'])
-            data['Total_Media_Basica'] = sum(j['Basica'] for j in data['Jogos'])
-            
-            # 4. Recalcular Scouts Totais
-            data['Scouts'] = {}
-            for j in data['Jogos']:
-                for s_key, s_val in j['Scouts'].items():
-                    data['Scouts'][s_key] = data['Scouts'].get(s_key, 0) + s_val
-
-        # Calcular Médias Finais
-        # Divisão sempre pelo n_jogos TEÓRICO ou REAL?
-        # Regra user: "Média" = Total / N
-        # Se o jogador jogou MENOS que N, divide por N ou pelo real?
-        # Geralmente em ranking "Média" é pelo N jogos disputados ou N do filtro?
-        # Código anterior usava `n_jogos` (filtro). Manterei para consistência.
-        # Mas se ele jogou 2 e filtro é 3?
-        # User disse "O número pequeno 'Média' será... Total / N".
-        # Vamos manter divisão por `n_jogos` se > 0 else 1.
-        
-        divisor = n_jogos if n_jogos > 0 else 1
-        data['Media_Pontos'] = data['Total_Pontos'] / divisor
-        data['Media_Basica'] = data['Total_Media_Basica'] / divisor
-        
-        ranking.append(data)
-        
-    # Validar ordenação final do ranking
-    ranking.sort(key=lambda x: x['Total_Pontos'], reverse=True)
-    
-    return ranking[:top_n_players]
+    sel = _select_ranking_rows(df, n_jogos, filter_type, target_round, rodadas_data, pos_map)
+    if target_positions:
+        sel = sel[sel['Pos_Filtro'].isin(target_positions)]
+
+    return _build_ranking(sel, n_jogos, top_n_players)
+
+def process_rankings(df, n_jogos, filter_type, target_round, rodadas_data, top_n_players, posicoes, pos_map=None):
+    """
+    Calcula os rankings de várias posições em uma única passada pelo DataFrame.
+    A seleção dos jogos e a detecção de posição são feitas uma só vez.
+    Retorna um dicionário {posição: ranking}, com as chaves como recebidas em `posicoes`.
+    """
+    sel = _select_ranking_rows(df, n_jogos, filter_type, target_round, rodadas_data, pos_map)
+    grupos = sel.groupby('Pos_Filtro', sort=False).indices
+
+    rankings = {}
+    for posicao in posicoes:
+        linhas = grupos.get(normalize_name(posicao))
+        if linhas is None:
+            rankings[posicao] = []
+        else:
+            rankings[posicao] = _build_ranking(sel.iloc[linhas], n_jogos, top_n_players)
+    return rankings